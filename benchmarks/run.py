@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+"""Measures import time of the package and conversion time, generation
+throughput, filter rejection rate and peak memory usage for synthetic schemas.
+
+Run benchmarks and save results::
+
+    $ python benchmarks/run.py run -o before.json
+    $ git checkout my-branch
+    $ python benchmarks/run.py run -o after.json
+
+Compare results of two runs::
+
+    $ python benchmarks/run.py compare before.json after.json
+"""
+from __future__ import print_function
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lollipop_hypothesis import new_registry, new_sampler_registry
+from schemas import benchmark_schemas, SCHEMAS
+from timeit import default_timer
+import argparse
+import gc
+import hypothesis
+import json
+import lollipop
+import platform
+import subprocess
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+BACKENDS = {
+    'strategy': (new_registry, 200),
+    'sampler': (new_sampler_registry, 5000),
+}
+
+# Metric -> True if bigger values are better
+METRICS = {
+    'import_time': False,
+    'convert_time': False,
+    'examples_per_second': True,
+    'rejection_rate': False,
+    'peak_memory': False,
+}
+
+
+def _median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+IMPORT_SCRIPT = '''
+from timeit import default_timer
+start = default_timer()
+import lollipop_hypothesis
+print(default_timer() - start)
+'''
+
+
+def measure_import_time(repeat):
+    # Each import runs in a fresh process; lollipop itself is imported
+    # before measuring, since schema modules import it anyway
+    times = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, '-c', 'import lollipop.types' + IMPORT_SCRIPT],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+        times.append(float(output.decode('ascii')))
+    return _median(times)
+
+
+def measure_convert_time(make_registry, make_schema, repeat):
+    times = []
+    for _ in range(repeat):
+        registry, schema = make_registry(), make_schema()
+        start = default_timer()
+        registry.convert(schema)
+        times.append(default_timer() - start)
+    return _median(times)
+
+
+def measure_throughput(make_registry, make_schema, count, repeat):
+    registry = make_registry()
+    strategy = registry.convert(make_schema())
+    rates = []
+    for _ in range(repeat):
+        start = default_timer()
+        examples = registry.examples(strategy, count)
+        rates.append(len(examples) / (default_timer() - start))
+    return _median(rates)
+
+
+def measure_rejection_rate(make_registry, make_schema, count):
+    registry = make_registry()
+    registry.enable_instrumentation()
+    registry.examples(registry.convert(make_schema()), count)
+
+    checks, rejections = 0, 0
+    for node in registry.instrumentation_report().values():
+        checks += sum(node['checks'].values())
+        rejections += sum(node['rejections'].values())
+    return float(rejections) / checks if checks else 0.0
+
+
+def measure_peak_memory(make_registry, make_schema, count):
+    if tracemalloc is None:
+        return None
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        registry = make_registry()
+        registry.examples(registry.convert(make_schema()), count)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(make_schema, backend, repeat):
+    make_registry, count = BACKENDS[backend]
+    return {
+        'convert_time': measure_convert_time(make_registry, make_schema, repeat),
+        'examples_per_second': measure_throughput(make_registry, make_schema,
+                                                  count, repeat),
+        'rejection_rate': measure_rejection_rate(make_registry, make_schema,
+                                                 count),
+        'peak_memory': measure_peak_memory(make_registry, make_schema, count),
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    backends = args.backend or sorted(BACKENDS)
+    results = {'import': {'import_time': measure_import_time(args.repeat)}}
+    for name, make_schema in benchmark_schemas(args.schema):
+        for backend in backends:
+            key = '%s/%s' % (name, backend)
+            sys.stderr.write('%s...\n' % key)
+            results[key] = run_benchmark(make_schema, backend, args.repeat)
+
+    report = {
+        'meta': {
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'hypothesis': hypothesis.__version__,
+            'lollipop': lollipop.__version__,
+        },
+        'results': results,
+    }
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        json.dump(report, output, indent=2, sort_keys=True)
+        output.write('\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(args):
+    old, new = _load(args.old)['results'], _load(args.new)['results']
+    regressions = 0
+
+    print('%-36s %-20s %12s %12s %8s' %
+          ('benchmark', 'metric', 'old', 'new', 'change'))
+    for key in sorted(set(old) & set(new)):
+        for metric, bigger_is_better in sorted(METRICS.items()):
+            old_value, new_value = old[key].get(metric), new[key].get(metric)
+            if not old_value or new_value is None:
+                continue
+
+            change = float(new_value) / old_value - 1
+            worse = change < -args.threshold if bigger_is_better \
+                else change > args.threshold
+            regressions += worse
+            print('%-36s %-20s %12.6g %12.6g %+7.1f%%%s' % (
+                key, metric, old_value, new_value, change * 100,
+                ' !' if worse else '',
+            ))
+
+    for key in sorted(set(old) ^ set(new)):
+        print('%-36s only in %s' % (key, args.old if key in old else args.new))
+
+    return 1 if regressions and args.strict else 0
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    run_parser = commands.add_parser('run', help='Run benchmarks')
+    run_parser.add_argument(
+        '-s', '--schema', action='append', choices=sorted(SCHEMAS),
+        help='Schema shape to benchmark (default: all)',
+    )
+    run_parser.add_argument(
+        '-b', '--backend', action='append', choices=sorted(BACKENDS),
+        help='Backend to benchmark (default: all)',
+    )
+    run_parser.add_argument(
+        '-r', '--repeat', type=int, default=5,
+        help='Number of repetitions, median is reported (default: 5)',
+    )
+    run_parser.add_argument(
+        '-o', '--output', help='Output file (default: standard output)',
+    )
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser(
+        'compare', help='Compare results of two runs',
+    )
+    compare_parser.add_argument('old', help='Baseline results file')
+    compare_parser.add_argument('new', help='New results file')
+    compare_parser.add_argument(
+        '-t', '--threshold', type=float, default=0.1,
+        help='Relative change to report as regression (default: 0.1)',
+    )
+    compare_parser.add_argument(
+        '--strict', action='store_true',
+        help='Exit with non-zero status if there are regressions',
+    )
+    compare_parser.set_defaults(func=compare)
+
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
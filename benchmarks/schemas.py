@@ -0,0 +1,87 @@
+"""Synthetic schemas of different shapes used by benchmarks.
+
+Each builder takes a size parameter and returns a new schema type, so that
+every benchmark run converts schema from scratch.
+"""
+import lollipop.types as lt
+import lollipop.validators as lv
+
+
+def wide_object(size):
+    """Object with given number of scalar fields."""
+    scalars = [lt.String, lt.Integer, lt.Float, lt.Boolean, lt.Date]
+    return lt.Object({
+        'field%d' % i: scalars[i % len(scalars)]()
+        for i in range(size)
+    })
+
+
+def deep_object(size):
+    """Objects nested given number of levels deep, with a list and an
+    optional field on each level."""
+    schema = lt.Object({'value': lt.Integer()})
+    for _ in range(size):
+        schema = lt.Object({
+            'value': lt.Integer(),
+            'tags': lt.List(lt.String(), validate=lv.Length(max=3)),
+            'child': lt.Optional(schema),
+        })
+    return schema
+
+
+def big_one_of(size):
+    """OneOf of given number of different objects."""
+    return lt.OneOf([
+        lt.Object({
+            'kind': lt.Constant('kind%d' % i),
+            'value%d' % i: lt.Integer(),
+        })
+        for i in range(size)
+    ])
+
+
+def _not_divisible_by(divisor):
+    return lambda x, context=None: x % divisor != 0
+
+
+def heavy_validators(size):
+    """List of values with given number of validators that can not be
+    expressed as strategy parameters and are applied as filters."""
+    return lt.List(lt.Integer(validate=[
+        lv.Predicate(_not_divisible_by(i + 2))
+        for i in range(size)
+    ] + [lv.Range(min=0, max=10000)]), validate=lv.Length(max=10))
+
+
+def regex_strings(size):
+    """Object with given number of strings matching regular expressions."""
+    patterns = [
+        r'^[a-z]{3,10}@[a-z]{2,8}\.(com|org|net)$',
+        r'^\+?[0-9]{1,3}-[0-9]{3}-[0-9]{4}$',
+        r'^[A-Z][a-z]+( [A-Z][a-z]+)*$',
+        r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}$',
+    ]
+    return lt.Object({
+        'field%d' % i: lt.String(validate=lv.Regexp(patterns[i % len(patterns)]))
+        for i in range(size)
+    })
+
+
+# Name -> (builder, sizes)
+SCHEMAS = {
+    'wide_object': (wide_object, [10, 100]),
+    'deep_object': (deep_object, [5, 20]),
+    'big_one_of': (big_one_of, [10, 100]),
+    'heavy_validators': (heavy_validators, [1, 5]),
+    'regex_strings': (regex_strings, [4, 20]),
+}
+
+
+def benchmark_schemas(names=None):
+    """Yields (benchmark name, schema builder) pairs."""
+    for name, (builder, sizes) in sorted(SCHEMAS.items()):
+        if names and name not in names:
+            continue
+        for size in sizes:
+            yield '%s[%d]' % (name, size), (lambda builder=builder, size=size:
+                                            builder(size))
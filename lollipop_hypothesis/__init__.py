@@ -1 +1,21 @@
-from .strategy import type_strategy, register, new_registry
+from .strategy import type_strategy, register, new_registry, \
+    register_dumped, new_dumped_registry, fingerprint
+from .sampler import type_sampler, register_sampler, new_sampler_registry
+from .analysis import analyze
+from .unique import CorpusUnique, Corpus
+from .columnar import columns, column_batches
+from .profiles import learn_profile, profiled_registry, Profile
+from .pool import materialize_pool, pool_strategy
+from .lazy import lazy_function
+import sys
+
+# Modules importing Hypothesis, asyncio or multiprocessing are imported
+# on first use
+schema_database = lazy_function('lollipop_hypothesis.database',
+                                'schema_database')
+check_schema = lazy_function('lollipop_hypothesis.selfcheck', 'check_schema')
+check_module = lazy_function('lollipop_hypothesis.selfcheck', 'check_module')
+
+if sys.version_info >= (3, 5):
+    # Module uses async/await syntax
+    aiter_examples = lazy_function('lollipop_hypothesis.aio', 'aiter_examples')
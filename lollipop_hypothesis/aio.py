@@ -0,0 +1,155 @@
+from lollipop_hypothesis.sampler import DEFAULT_SAMPLER_REGISTRY
+from collections import deque
+import asyncio
+import concurrent.futures
+import threading
+
+
+# Maximum number of examples passed from generating thread at once
+BATCH_SIZE = 100
+
+# How often blocked generating thread checks whether iteration was stopped
+POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+
+class _Failure(object):
+    def __init__(self, error):
+        self.error = error
+
+
+class AsyncExamples(object):
+    """Asynchronous iterator over values generated by sampler in a background
+    thread. At most ``prefetch`` values are generated ahead of consumer.
+
+    Can be used as asynchronous context manager to stop generation when
+    iteration is finished early.
+    """
+    def __init__(self, sampler, count=None, seed=None, prefetch=1000,
+                 transform=None):
+        if prefetch < 1:
+            raise ValueError('Prefetch should be positive')
+
+        self._sampler = sampler
+        self._count = count
+        self._seed = seed
+        self._transform = transform
+        # Values ahead of consumer are in a batch being consumed, batches in
+        # the queue and a batch waiting to be put to the queue
+        self._batch_size = max(1, min(BATCH_SIZE, prefetch // 3))
+        self._max_batches = max(1, prefetch // self._batch_size - 2)
+        self._buffer = deque()
+        self._queue = None
+        self._loop = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._pending = None
+        self._finished = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._thread is None:
+            self._start()
+
+        while not self._buffer:
+            if self._finished:
+                raise StopAsyncIteration
+
+            item = await self._queue.get()
+            if item is _DONE:
+                self._finished = True
+                raise StopAsyncIteration
+            if isinstance(item, _Failure):
+                self._finished = True
+                raise item.error
+            self._buffer.extend(item)
+
+        return self._buffer.popleft()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Stops generating values."""
+        self._stopped.set()
+        self._finished = True
+        self._buffer.clear()
+        pending = self._pending
+        if pending is not None:
+            pending.cancel()
+
+    def __del__(self):
+        self._stopped.set()
+
+    def _start(self):
+        self._loop = asyncio.get_event_loop()
+        self._queue = asyncio.Queue(maxsize=self._max_batches)
+        self._thread = threading.Thread(target=self._produce)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _produce(self):
+        transform = self._transform
+        batch = []
+        try:
+            for value in self._sampler.examples(self._count, seed=self._seed):
+                batch.append(transform(value) if transform else value)
+                if len(batch) >= self._batch_size:
+                    if not self._put(batch):
+                        return
+                    batch = []
+
+            if batch and not self._put(batch):
+                return
+            self._put(_DONE)
+        except Exception as e:
+            self._put(_Failure(e))
+
+    def _put(self, item):
+        # Blocks until consumer takes enough values out of the queue
+        if self._stopped.is_set():
+            return False
+
+        future = self._pending = asyncio.run_coroutine_threadsafe(
+            self._queue.put(item), self._loop,
+        )
+        while True:
+            try:
+                future.result(timeout=POLL_INTERVAL)
+                return True
+            except concurrent.futures.CancelledError:
+                return False
+            except concurrent.futures.TimeoutError:
+                if self._stopped.is_set() or self._loop.is_closed():
+                    future.cancel()
+                    return False
+
+
+def aiter_examples(schema, registry=None, context=None, count=None, seed=None,
+                   prefetch=1000, dump=False):
+    """Returns asynchronous iterator over examples of schema, generated in
+    a background thread so that event loop is not blocked::
+
+        async with aiter_examples(USER, seed=1, dump=True) as payloads:
+            async for payload in payloads:
+                await session.post(url, json=payload)
+
+    :param schema: Schema type.
+    :param registry: Sampler registry, default sampler registry by default.
+    :param context: Context passed to validators and converters.
+    :param int count: Number of examples (infinite if None).
+    :param seed: Random seed. Same seed always produces the same values.
+    :param int prefetch: Maximum number of values generated ahead.
+    :param bool dump: If True, values are dumped with schema.
+    """
+    registry = registry or DEFAULT_SAMPLER_REGISTRY
+    sampler = registry.convert(schema, context=context)
+    transform = (lambda value: schema.dump(value, context)) if dump else None
+    return AsyncExamples(sampler, count=count, seed=seed, prefetch=prefetch,
+                         transform=transform)
@@ -0,0 +1,131 @@
+from lollipop_hypothesis.strategy import DEFAULT_REGISTRY
+import copy
+
+
+ERROR = 'error'
+WARNING = 'warning'
+INFO = 'info'
+
+# Number of examples generated to estimate filter acceptance rates
+DEFAULT_SAMPLES = 100
+
+# Filters accepting smaller share of values are reported as warnings
+MIN_ACCEPTANCE = 0.1
+
+
+def _issue(path, type_name, severity, code, message, **extra):
+    issue = {
+        'path': path,
+        'type': type_name,
+        'severity': severity,
+        'code': code,
+        'message': message,
+    }
+    issue.update(extra)
+    return issue
+
+
+class Analysis(object):
+    """Collects problems found while converting schema."""
+    def __init__(self):
+        self.issues = []
+
+    def record_error(self, path, type, error):
+        self.issues.append(_issue(
+            path, type.__class__.__name__, ERROR,
+            getattr(error, 'code', 'error'), str(error),
+        ))
+
+    def record_empty(self, path, type):
+        self.issues.append(_issue(
+            path, type.__class__.__name__, ERROR, 'unsatisfiable',
+            '%s does not generate any values' % type.__class__.__name__,
+        ))
+
+
+# Characters that start parts of type paths: fields, list and tuple items,
+# OneOf alternatives, Optional and modifier inner types, dict keys
+PATH_SEPARATORS = '.[|?<{'
+
+
+def _is_descendant(path, parent_path):
+    return len(path) > len(parent_path) and \
+        path.startswith(parent_path) and \
+        path[len(parent_path)] in PATH_SEPARATORS
+
+
+def _root_causes(issues):
+    # Values of all parents of unsatisfiable type are unsatisfiable too,
+    # so only the innermost problems are reported
+    return [
+        issue for issue in issues
+        if issue['code'] != 'unsatisfiable'
+        or not any(_is_descendant(other['path'], issue['path'])
+                   for other in issues)
+    ]
+
+
+def _filter_issues(report, min_acceptance):
+    issues = []
+    for path, node in sorted(report.items()):
+        for validator, checks in sorted(node['checks'].items()):
+            rejections = node['rejections'].get(validator, 0)
+            acceptance = float(checks - rejections) / checks if checks else None
+            severity = WARNING \
+                if acceptance is not None and acceptance < min_acceptance \
+                else INFO
+            issues.append(_issue(
+                path, node['type'], severity, 'filter',
+                'Values are filtered with %s' % validator,
+                validator=validator, checks=checks, acceptance=acceptance,
+            ))
+
+    return issues
+
+
+def analyze(schema, registry=None, context=None, samples=DEFAULT_SAMPLES,
+            min_acceptance=MIN_ACCEPTANCE):
+    """Checks whether schema can be converted and how efficiently values
+    can be generated.
+
+    Schema is converted with a copy of given registry (default registry
+    by default) and given number of examples is generated to estimate
+    acceptance rates of validators that are applied as filters.
+
+    :param schema: Schema type to analyze.
+    :param registry: Registry to convert schema with.
+    :param context: Context to convert schema with.
+    :param int samples: Number of examples to generate.
+    :param float min_acceptance: Filters with lower acceptance rate are
+        reported as warnings.
+    :returns: JSON-serializable dict with keys "ok" (False if there are
+        errors), "issues" (list of dicts with "path", "type", "severity",
+        "code" and "message" keys) and "nodes" (instrumentation report
+        for generated examples).
+    """
+    registry = copy.copy(registry or DEFAULT_REGISTRY)
+    registry.enable_instrumentation()
+    analysis = Analysis()
+    registry.set_analysis(analysis)
+
+    strategy = registry.convert(schema, context=context)
+    issues = _root_causes(analysis.issues)
+
+    if samples and not issues:
+        try:
+            registry.examples(strategy, samples)
+        except Exception as e:
+            issues.append(_issue(
+                schema.name or schema.__class__.__name__,
+                schema.__class__.__name__, ERROR, 'generation-failed',
+                'Could not generate examples: %s' % (str(e) or repr(e)),
+            ))
+
+    report = registry.instrumentation_report()
+    issues.extend(_filter_issues(report, min_acceptance))
+
+    return {
+        'ok': not any(issue['severity'] == ERROR for issue in issues),
+        'issues': issues,
+        'nodes': report,
+    }
@@ -0,0 +1,361 @@
+from lollipop_hypothesis.sampler import DEFAULT_SAMPLER_REGISTRY
+from lollipop_hypothesis.analysis import analyze, DEFAULT_SAMPLES, \
+    MIN_ACCEPTANCE, WARNING
+from lollipop_hypothesis.selfcheck import check_module, DEFAULT_COUNT
+from lollipop_hypothesis.profiles import learn_profile, Profile, MAX_BINS
+from lollipop_hypothesis.pool import materialize_pool
+from lollipop_hypothesis.unique import Corpus
+from lollipop_hypothesis import plugins
+from collections import deque
+import argparse
+import errno
+import json
+import multiprocessing
+import os
+import random
+import six
+import sys
+
+
+# Number of examples generated with the same seed in one task. Changing it
+# changes generated data for a given seed.
+CHUNK_SIZE = 10000
+
+DEFAULT_POOL_SIZE = 10000
+DEFAULT_POOL_DIRECTORY = '.pools'
+
+
+def load_object(spec):
+    """Imports object by "module:attribute" specification."""
+    module_name, _, attribute = spec.partition(':')
+    if not module_name or not attribute:
+        raise ValueError('Invalid object reference "%s", '
+                         'expected "module:attribute"' % spec)
+
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    return plugins.load_object(spec)
+
+
+def chunk_seed(seed, index):
+    return '%s-%d' % (seed, index)
+
+
+_worker = {}
+
+
+def load_profile(path):
+    with open(path) as f:
+        return Profile.from_dict(json.load(f))
+
+
+def _init_worker(schema_spec, registry_spec, profile_path=None):
+    _worker['schema'] = schema = load_object(schema_spec)
+    registry = load_object(registry_spec) \
+        if registry_spec else DEFAULT_SAMPLER_REGISTRY
+    if profile_path:
+        registry = registry.child()
+        registry.set_profile(load_profile(profile_path))
+    _worker['sampler'] = registry.convert(schema)
+
+
+def _generate_chunk(task):
+    seed, index, count, corpus = task
+    schema, sampler = _worker['schema'], _worker['sampler']
+    return ''.join(
+        json.dumps(schema.dump(value), sort_keys=True,
+                   separators=(',', ':')) + '\n'
+        for value in sampler.examples(count, seed=chunk_seed(seed, index),
+                                      corpus=corpus, start=index * CHUNK_SIZE)
+    )
+
+
+def _tasks(seed, count, jobs):
+    # Chunks are parts of one corpus, so that CorpusUnique values are unique
+    # across chunks. Values tracked with filters can be kept unique only if
+    # all chunks are generated in this process.
+    corpus = Corpus(seed, count, local=jobs <= 1)
+    for index, start in enumerate(six.moves.range(0, count, CHUNK_SIZE)):
+        yield seed, index, min(CHUNK_SIZE, count - start), corpus
+
+
+def _ordered_results(pool, tasks, window):
+    # Keep only a bounded number of chunks in flight to bound memory usage
+    pending = deque()
+    for task in tasks:
+        pending.append(pool.apply_async(_generate_chunk, (task,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+
+    while pending:
+        yield pending.popleft().get()
+
+
+def generate(schema_spec, count, output, seed=None, jobs=1, registry_spec=None,
+             profile_path=None):
+    """Writes given number of examples of schema to output as JSON lines.
+
+    Examples are generated in chunks, each with its own seed derived from
+    given seed, so the output does not depend on number of jobs. Values with
+    :class:`~lollipop_hypothesis.unique.CorpusUnique` validators that are
+    tracked rather than derived from indexes can be kept unique in one job
+    only; generating them in several jobs fails.
+    """
+    tasks = _tasks(seed, count, jobs)
+    if jobs <= 1:
+        _init_worker(schema_spec, registry_spec, profile_path)
+        for task in tasks:
+            output.write(_generate_chunk(task))
+        return
+
+    pool = multiprocessing.Pool(jobs, initializer=_init_worker,
+                                initargs=(schema_spec, registry_spec,
+                                          profile_path))
+    try:
+        for chunk in _ordered_results(pool, tasks, window=jobs * 2):
+            output.write(chunk)
+    finally:
+        pool.terminate()
+
+
+def _generate_command(args):
+    seed = args.seed
+    if seed is None:
+        seed = random.randint(0, 2 ** 32 - 1)
+        sys.stderr.write('Using seed %d\n' % seed)
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        generate(args.schema, args.count, output, seed=seed, jobs=args.jobs,
+                 registry_spec=args.registry, profile_path=args.profile)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def _analyze_command(args):
+    registry = load_object(args.registry) if args.registry else None
+    result = analyze(load_object(args.schema), registry=registry,
+                     samples=args.samples, min_acceptance=args.min_acceptance)
+    json.dump(result, sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write('\n')
+
+    if not result['ok']:
+        return 1
+    if args.strict and any(issue['severity'] == WARNING
+                           for issue in result['issues']):
+        return 1
+    return 0
+
+
+def _selfcheck_command(args):
+    module_name, _, names = args.module.partition(':')
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    result = check_module(
+        module_name, names=names.split(',') if names else None,
+        count=args.count, jobs=args.jobs, seed=args.seed,
+        registry=args.registry,
+    )
+    json.dump(result, sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write('\n')
+
+    return 0 if result['ok'] else 1
+
+
+def _profile_command(args):
+    schema = load_object(args.schema)
+    sample = sys.stdin if args.sample == '-' else open(args.sample)
+    try:
+        profile = learn_profile(schema, sample, max_bins=args.bins)
+    finally:
+        if sample is not sys.stdin:
+            sample.close()
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        json.dump(profile.to_dict(), output, indent=2, sort_keys=True)
+        output.write('\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if profile.rejected:
+        sys.stderr.write('Skipped %d values that failed to load\n' %
+                         profile.rejected)
+
+
+def _pool_command(args):
+    registry = load_object(args.registry) if args.registry else None
+    path = materialize_pool(load_object(args.schema), args.count,
+                            args.directory, registry=registry, seed=args.seed)
+    sys.stdout.write(path + '\n')
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog='lollipop-hypothesis',
+        description='Generate test data based on Lollipop schemas',
+    )
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    generate_parser = commands.add_parser(
+        'generate', help='Generate examples of schema as JSON lines',
+    )
+    generate_parser.add_argument(
+        'schema', help='Schema to generate examples for, e.g. "mymodule:USER"',
+    )
+    generate_parser.add_argument(
+        '-n', '--count', type=int, default=100,
+        help='Number of examples to generate (default: 100)',
+    )
+    generate_parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='Number of worker processes (default: 1)',
+    )
+    generate_parser.add_argument(
+        '-s', '--seed', type=int,
+        help='Random seed. Same seed always produces the same output',
+    )
+    generate_parser.add_argument(
+        '-r', '--registry',
+        help='Sampler registry to use, e.g. "mymodule:SAMPLERS"',
+    )
+    generate_parser.add_argument(
+        '-p', '--profile',
+        help='Profile of sample data to generate values like, created with '
+             '"profile" command',
+    )
+    generate_parser.add_argument(
+        '-o', '--output', help='Output file (default: standard output)',
+    )
+    generate_parser.set_defaults(func=_generate_command)
+
+    profile_parser = commands.add_parser(
+        'profile', help='Learn distributions of values from sample data '
+                        'as JSON profile for "generate" command',
+    )
+    profile_parser.add_argument(
+        'schema', help='Schema of sample data, e.g. "mymodule:USER"',
+    )
+    profile_parser.add_argument(
+        'sample', help='JSON lines file with dumped values of schema, '
+                       'or "-" for standard input',
+    )
+    profile_parser.add_argument(
+        '-b', '--bins', type=int, default=MAX_BINS,
+        help='Maximum number of bins of each distribution '
+             '(default: %d)' % MAX_BINS,
+    )
+    profile_parser.add_argument(
+        '-o', '--output', help='Output file (default: standard output)',
+    )
+    profile_parser.set_defaults(func=_profile_command)
+
+    pool_parser = commands.add_parser(
+        'pool', help='Generate examples of schema into a pool file for '
+                     'pool strategies, unless pool already has enough of '
+                     'them. Prints pool file path',
+    )
+    pool_parser.add_argument(
+        'schema', help='Schema to generate examples for, e.g. "mymodule:USER"',
+    )
+    pool_parser.add_argument(
+        '-n', '--count', type=int, default=DEFAULT_POOL_SIZE,
+        help='Number of examples (default: %d)' % DEFAULT_POOL_SIZE,
+    )
+    pool_parser.add_argument(
+        '-d', '--directory', default=DEFAULT_POOL_DIRECTORY,
+        help='Directory with pool files (default: %s)' %
+             DEFAULT_POOL_DIRECTORY,
+    )
+    pool_parser.add_argument(
+        '-s', '--seed', type=int,
+        help='Random seed. Same seed always produces the same examples',
+    )
+    pool_parser.add_argument(
+        '-r', '--registry',
+        help='Sampler registry to use, e.g. "mymodule:SAMPLERS"',
+    )
+    pool_parser.set_defaults(func=_pool_command)
+
+    analyze_parser = commands.add_parser(
+        'analyze', help='Report problems of schema as JSON. Exits with '
+                        'non-zero status if schema has errors',
+    )
+    analyze_parser.add_argument(
+        'schema', help='Schema to analyze, e.g. "mymodule:USER"',
+    )
+    analyze_parser.add_argument(
+        '-n', '--samples', type=int, default=DEFAULT_SAMPLES,
+        help='Number of examples to generate to estimate filter acceptance '
+             'rates (default: %d)' % DEFAULT_SAMPLES,
+    )
+    analyze_parser.add_argument(
+        '--min-acceptance', type=float, default=MIN_ACCEPTANCE,
+        help='Report filters with lower acceptance rate as warnings '
+             '(default: %s)' % MIN_ACCEPTANCE,
+    )
+    analyze_parser.add_argument(
+        '--strict', action='store_true',
+        help='Exit with non-zero status on warnings too',
+    )
+    analyze_parser.add_argument(
+        '-r', '--registry',
+        help='Registry to use, e.g. "mymodule:REGISTRY"',
+    )
+    analyze_parser.set_defaults(func=_analyze_command)
+
+    selfcheck_parser = commands.add_parser(
+        'selfcheck', help='Check that generated examples can be dumped and '
+                          'loaded back by schema. Reports failures by field '
+                          'as JSON and exits with non-zero status if any',
+    )
+    selfcheck_parser.add_argument(
+        'module', help='Module with schemas to check, e.g. "mymodule", or '
+                       'comma separated schemas, e.g. "mymodule:USER,GROUP"',
+    )
+    selfcheck_parser.add_argument(
+        '-n', '--count', type=int, default=DEFAULT_COUNT,
+        help='Number of examples of each schema to check '
+             '(default: %d)' % DEFAULT_COUNT,
+    )
+    selfcheck_parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='Number of worker processes (default: 1)',
+    )
+    selfcheck_parser.add_argument(
+        '-s', '--seed', type=int,
+        help='Random seed for sampler registries',
+    )
+    selfcheck_parser.add_argument(
+        '-r', '--registry',
+        help='Registry to use, e.g. "mymodule:REGISTRY" or '
+             '"lollipop_hypothesis.sampler:DEFAULT_SAMPLER_REGISTRY" '
+             '(default: Hypothesis strategies registry)',
+    )
+    selfcheck_parser.set_defaults(func=_selfcheck_command)
+
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    try:
+        return args.func(args) or 0
+    except IOError as e:
+        # Output was closed early, e.g. piped to "head"
+        if e.errno != errno.EPIPE:
+            raise
+    except ValueError as e:
+        sys.stderr.write('Error: %s\n' % e)
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,313 @@
+import lollipop.types as lt
+import lollipop.validators as lv
+from lollipop_hypothesis.strategy import find_validators, \
+    remaining_validators, allowed_choices, length_bounds, excluded_values, \
+    SchemaError
+from lollipop_hypothesis.sampler import DEFAULT_SAMPLER_REGISTRY, \
+    integer_sampler, float_sampler, boolean_sampler, string_sampler, \
+    datetime_sampler, date_sampler, object_sampler, value_range, size_range, \
+    text, TEXT_ALPHABET, DEFAULT_INTEGER_RANGE, DEFAULT_FLOAT_RANGE, \
+    DEFAULT_DATETIME_RANGE, DEFAULT_DATE_RANGE
+from array import array
+from collections import OrderedDict
+import datetime
+import random as _random
+import six
+
+
+# Number of rows generated at once
+BATCH_SIZE = 10000
+
+# Array type codes of columns; other columns are lists
+try:
+    INTEGER_TYPECODE = array('q').typecode
+except ValueError:
+    # Python 2 has no long long arrays
+    INTEGER_TYPECODE = 'l'
+FLOAT_TYPECODE = 'd'
+BOOLEAN_TYPECODE = 'B'
+
+_INTEGER_BITS = array(INTEGER_TYPECODE).itemsize * 8
+INTEGER_RANGE = (-2 ** (_INTEGER_BITS - 1), 2 ** (_INTEGER_BITS - 1) - 1)
+
+
+def _sample(random, values, count):
+    if hasattr(random, 'choices'):
+        return random.choices(values, k=count)
+    return [random.choice(values) for _ in six.moves.range(count)]
+
+
+def integer_column(type, context=None):
+    min_value, max_value = value_range(type.validators, DEFAULT_INTEGER_RANGE)
+    span = max_value - min_value + 1
+    if span <= 2 ** 32:
+        # Scaling random floats is much faster than randint() and exact for
+        # spans this small
+        def generate(random, count):
+            r = random.random
+            return [min_value + int(r() * span)
+                    for _ in six.moves.range(count)]
+    else:
+        def generate(random, count):
+            randint = random.randint
+            return [randint(min_value, max_value)
+                    for _ in six.moves.range(count)]
+
+    return generate, _integer_typecode([min_value, max_value])
+
+
+def _integer_typecode(values):
+    if all(INTEGER_RANGE[0] <= value <= INTEGER_RANGE[1] for value in values):
+        return INTEGER_TYPECODE
+    return None
+
+
+def float_column(type, context=None):
+    min_value, max_value = value_range(type.validators, DEFAULT_FLOAT_RANGE)
+    span = max_value - min_value
+
+    def generate(random, count):
+        r = random.random
+        return [min_value + span * r() for _ in six.moves.range(count)]
+
+    return generate, FLOAT_TYPECODE
+
+
+def boolean_column(type, context=None):
+    excluded = excluded_values(type.validators)
+    values = [x for x in [False, True] if x not in excluded]
+    if not values:
+        raise SchemaError('Type %s does not match any value' % type,
+                          'no-choices')
+
+    if len(values) == 1:
+        value = values[0]
+        return (lambda random, count: [value] * count), BOOLEAN_TYPECODE
+
+    def generate(random, count):
+        r = random.random
+        return [r() < 0.5 for _ in six.moves.range(count)]
+
+    return generate, BOOLEAN_TYPECODE
+
+
+def string_column(type, context=None):
+    draw = text(TEXT_ALPHABET,
+                *size_range(*length_bounds(type.validators))).draw
+    return (lambda random, count: [draw(random)
+                                   for _ in six.moves.range(count)]), None
+
+
+def datetime_column(type, context=None):
+    min_value, max_value = value_range(type.validators, DEFAULT_DATETIME_RANGE)
+    span = int((max_value - min_value).total_seconds()) + 1
+    timedelta = datetime.timedelta
+
+    def generate(random, count):
+        r = random.random
+        return [min_value + timedelta(seconds=int(r() * span))
+                for _ in six.moves.range(count)]
+
+    return generate, None
+
+
+def date_column(type, context=None):
+    min_value, max_value = value_range(type.validators, DEFAULT_DATE_RANGE)
+    min_ordinal = min_value.toordinal()
+    span = max_value.toordinal() - min_ordinal + 1
+    fromordinal = datetime.date.fromordinal
+
+    def generate(random, count):
+        r = random.random
+        return [fromordinal(min_ordinal + int(r() * span))
+                for _ in six.moves.range(count)]
+
+    return generate, None
+
+
+def choices_column(type, context=None):
+    choices = allowed_choices(type, context=context)
+    if not choices:
+        raise SchemaError('Type %s does not match any value' % type,
+                          'no-choices')
+
+    if isinstance(type, lt.Integer):
+        typecode = _integer_typecode(choices)
+    else:
+        typecode = {lt.Float: FLOAT_TYPECODE,
+                    lt.Boolean: BOOLEAN_TYPECODE}.get(type.__class__)
+    return (lambda random, count: _sample(random, choices, count)), typecode
+
+
+# Type class -> (default sampler, column generator factory, validators it
+# handles). Columns are generated by a factory only if type is converted
+# with the default sampler and has no other validators.
+COLUMNS = OrderedDict([
+    (lt.Integer, (integer_sampler, integer_column, lv.Range)),
+    (lt.Float, (float_sampler, float_column, lv.Range)),
+    (lt.Boolean, (boolean_sampler, boolean_column, lv.NoneOf)),
+    (lt.String, (string_sampler, string_column, lv.Length)),
+    (lt.DateTime, (datetime_sampler, datetime_column, lv.Range)),
+    (lt.Date, (date_sampler, date_column, lv.Range)),
+])
+
+
+def _sampler_column(registry, type, context):
+    draw = registry.convert(type, context=context).draw
+    return (lambda random, count: [draw(random)
+                                   for _ in six.moves.range(count)]), None
+
+
+def _column_factory(registry, type):
+    # Returns column generator factory of type, or None if values of type
+    # should be generated by registry one by one
+    column = COLUMNS.get(type.__class__)
+    if column is None or registry._instance_converter(type) is not None:
+        return None
+
+    sampler, factory, handled = column
+    if registry.find_converter(type.__class__) is not sampler:
+        return None
+    if find_validators(type.validators, lv.AnyOf):
+        # Choices are checked against other validators upfront
+        return choices_column
+    if not remaining_validators(type.validators, handled):
+        return factory
+    return None
+
+
+def column_generator(registry, type, context=None):
+    """Returns (generate, typecode) tuple for a column of values of given
+    type, where ``generate(random, count)`` returns list of generated values
+    and typecode is a type code of :class:`array.array` to store them or None.
+
+    Types without column generators (or with custom samplers or validators
+    that columns do not handle) are generated with the registry value by
+    value.
+    """
+    registry = registry._active_registry()
+    factory = _column_factory(registry, type)
+    if factory is None:
+        return _sampler_column(registry, type, context)
+    return factory(type, context)
+
+
+def _object_type(schema):
+    if isinstance(schema, lt.List):
+        schema = schema.item_type
+    if not isinstance(schema, lt.Object):
+        raise ValueError('Schema should be Object or List of Objects')
+    return schema
+
+
+def _generates_rows(registry, type):
+    # Columns generated separately would skip validators and constructors
+    # of whole objects, as well as profiles, coverage and instrumentation,
+    # which are keyed by paths of fields inside objects
+    return bool(
+        type.validators or type.constructor or
+        registry.profile is not None or
+        registry._coverage is not None or
+        registry._instrumentation is not None or
+        registry._instance_converter(type) is not None or
+        registry.find_converter(type.__class__) is not object_sampler
+    )
+
+
+def _row_columns(registry, type, fields, context):
+    draw = registry.convert(type, context=context).draw
+
+    def generate(random, count):
+        rows = [draw(random) for _ in six.moves.range(count)]
+        return [[field.get_value(name, row, context) for row in rows]
+                for name, field in fields]
+
+    # Values are generated by registry, but have the same types as values of
+    # column generators
+    typecodes = []
+    for _, field in fields:
+        factory = _column_factory(registry, field.field_type)
+        typecodes.append(
+            factory(field.field_type, context)[1] if factory else None
+        )
+    return typecodes, generate
+
+
+def _generators(schema, registry, context):
+    """Returns list of (field name, typecode) tuples and function that takes
+    random generator and number of rows and returns list of columns of
+    these fields."""
+    object_type = _object_type(schema)
+    registry = (registry or DEFAULT_SAMPLER_REGISTRY)._active_registry()
+    # Dump-only fields are never loaded, as in object samplers
+    fields = [(name, field)
+              for name, field in six.iteritems(object_type.fields)
+              if not isinstance(field.field_type, lt.DumpOnly)]
+    names = [name for name, _ in fields]
+
+    if _generates_rows(registry, object_type):
+        typecodes, generate = _row_columns(registry, object_type, fields,
+                                           context)
+        return list(zip(names, typecodes)), generate
+
+    generators = [column_generator(registry, field.field_type,
+                                   context=context)
+                  for _, field in fields]
+
+    def generate(random, count):
+        return [generate_column(random, count)
+                for generate_column, _ in generators]
+
+    return list(zip(names, [typecode for _, typecode in generators])), \
+        generate
+
+
+def _column(typecode, values):
+    return array(typecode, values) if typecode else values
+
+
+def column_batches(schema, count, registry=None, context=None, seed=None,
+                   batch_size=BATCH_SIZE):
+    """Generates rows of an object schema column by column. Yields dicts
+    mapping field names to columns of at most ``batch_size`` values each.
+    Columns of integers, floats and booleans are :class:`array.array`
+    instances, other columns are lists.
+
+    Range, Length, NoneOf and AnyOf validators of integer, float, boolean,
+    string, date and datetime fields are applied to whole columns. Values of
+    other fields are generated one by one with sampler registry. Objects
+    with validators, constructors or custom samplers, as well as objects of
+    registries with profiles, coverage or instrumentation enabled, are
+    generated whole by registry and pivoted into columns.
+
+    :param schema: Object type or List of Object type.
+    :param int count: Number of rows.
+    :param registry: Sampler registry, default sampler registry by default.
+    :param context: Context passed to validators and converters.
+    :param seed: Random seed. Same seed always produces the same values.
+    :param int batch_size: Maximum number of rows in one batch.
+    """
+    fields, generate = _generators(schema, registry, context)
+    random = _random.Random(seed)
+    for start in six.moves.range(0, count, batch_size):
+        size = min(batch_size, count - start)
+        yield OrderedDict(
+            (name, _column(typecode, values))
+            for (name, typecode), values in zip(fields,
+                                                generate(random, size))
+        )
+
+
+def columns(schema, count, registry=None, context=None, seed=None,
+            batch_size=BATCH_SIZE):
+    """Returns dict mapping field names of an object schema to columns of
+    ``count`` generated values. See :func:`column_batches`."""
+    fields, _ = _generators(schema, registry, context)
+    result = OrderedDict((name, _column(typecode, []))
+                         for name, typecode in fields)
+    for batch in column_batches(schema, count, registry=registry,
+                                context=context, seed=seed,
+                                batch_size=batch_size):
+        for name, column in six.iteritems(batch):
+            result[name].extend(column)
+    return result
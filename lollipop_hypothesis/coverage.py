@@ -0,0 +1,69 @@
+from collections import OrderedDict
+import threading
+
+
+class BranchNode(object):
+    """Counts values generated by each branch of a schema type, e.g. each
+    alternative of OneOf, each AnyOf choice or Optional being None or not."""
+    def __init__(self, path, type_name):
+        self.path = path
+        self.type_name = type_name
+        self.counts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add_branches(self, labels):
+        with self._lock:
+            for label in labels:
+                self.counts.setdefault(label, 0)
+
+    def record(self, label):
+        with self._lock:
+            self.counts[label] += 1
+
+    def uncovered(self, labels):
+        """Returns those of given branches that did not generate any values."""
+        return [label for label in labels if not self.counts[label]]
+
+    def to_dict(self):
+        with self._lock:
+            counts = dict(self.counts)
+        return {
+            'type': self.type_name,
+            'branches': counts,
+            'covered': len([count for count in counts.values() if count]),
+            'total': len(counts),
+        }
+
+
+class Coverage(object):
+    """Collects branch coverage of schema types.
+
+    :param bool guided: If True, branches that did not generate any values
+        yet are chosen while there are any.
+    """
+    def __init__(self, guided=True):
+        self.guided = guided
+        self._nodes = {}
+        self._lock = threading.Lock()
+
+    def node(self, path, type_name, labels):
+        with self._lock:
+            if path not in self._nodes:
+                self._nodes[path] = BranchNode(path, type_name)
+            node = self._nodes[path]
+        node.add_branches(labels)
+        return node
+
+    def report(self):
+        with self._lock:
+            nodes = list(self._nodes.values())
+
+        branches = {node.path: node.to_dict() for node in nodes}
+        covered = sum(node['covered'] for node in branches.values())
+        total = sum(node['total'] for node in branches.values())
+        return {
+            'covered': covered,
+            'total': total,
+            'ratio': float(covered) / total if total else 1.0,
+            'nodes': branches,
+        }
@@ -0,0 +1,90 @@
+from lollipop_hypothesis.strategy import DEFAULT_REGISTRY
+from hypothesis import settings
+from hypothesis.database import ExampleDatabase
+
+
+# Hypothesis stores several kinds of examples under the same test key with
+# these suffixes; they are kept apart in shared keys too
+KEY_SUFFIXES = (b'.secondary', b'.coverage', b'.pareto')
+
+
+class SchemaExampleDatabase(ExampleDatabase):
+    """Example database that shares saved examples between all tests that
+    use the same schema, across runs and renames of tests.
+
+    Examples are saved both under test's own key and under a key derived from
+    schema fingerprint, so examples that failed one test are replayed in all
+    other tests of the same schema. An example deleted by one test, e.g.
+    because it does not fail anymore, is deleted under both keys. Examples
+    are kept only while the schema does not change, since changed schema
+    changes fingerprint.
+
+    :param database: Underlying :class:`hypothesis.database.ExampleDatabase`.
+    :param str fingerprint: Schema fingerprint, see
+        :meth:`Registry.fingerprint`.
+    """
+    def __init__(self, database, fingerprint):
+        self.database = database
+        self.fingerprint = fingerprint
+
+    def __repr__(self):
+        return '%s(%r, %r)' % (self.__class__.__name__,
+                               self.database, self.fingerprint)
+
+    def shared_key(self, key):
+        suffix = b''
+        for key_suffix in KEY_SUFFIXES:
+            if key.endswith(key_suffix):
+                suffix = key_suffix
+                break
+
+        return b'lollipop-hypothesis:' + \
+            self.fingerprint.encode('ascii') + suffix
+
+    def save(self, key, value):
+        self.database.save(key, value)
+        self.database.save(self.shared_key(key), value)
+
+    def delete(self, key, value):
+        # Otherwise examples fixed long ago would be replayed by every test
+        # of the schema forever
+        self.database.delete(key, value)
+        self.database.delete(self.shared_key(key), value)
+
+    def fetch(self, key):
+        seen = set()
+        for value in self.database.fetch(key):
+            seen.add(value)
+            yield value
+
+        for value in self.database.fetch(self.shared_key(key)):
+            if value not in seen:
+                seen.add(value)
+                yield value
+
+    def close(self):
+        self.database.close()
+
+
+def schema_database(schema, database=None, registry=None, context=None):
+    """Returns example database sharing examples between tests of schema.
+
+    Example::
+
+        @given(type_strategy(USER))
+        @settings(database=schema_database(USER))
+        def test_user(user):
+            ...
+
+    :param schema: Schema type.
+    :param database: Underlying example database. Defaults to database
+        from current Hypothesis settings.
+    :param registry: Registry used to generate examples.
+    :param context: Context passed to validators and converters.
+    """
+    if database is None:
+        database = settings.default.database
+    registry = registry or DEFAULT_REGISTRY
+    return SchemaExampleDatabase(
+        database, registry.fingerprint(schema, context=context),
+    )
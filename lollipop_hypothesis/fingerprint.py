@@ -0,0 +1,176 @@
+import lollipop.types as lt
+import hashlib
+import inspect
+import json
+import re
+import six
+import types
+
+
+# Memory addresses in default object representations change between runs
+ADDRESS_REGEX = re.compile(r' at 0x[0-9a-fA-F]+')
+
+
+def _qualified_name(obj):
+    return '%s.%s' % (
+        getattr(obj, '__module__', None),
+        getattr(obj, '__qualname__', None) or getattr(obj, '__name__', None),
+    )
+
+
+def _describe_function(func, seen):
+    code = six.get_function_code(func)
+    closure = six.get_function_closure(func) or ()
+    return {
+        'function': _qualified_name(func),
+        'code': _describe_code(code, seen),
+        'closure': [describe(cell.cell_contents, seen) for cell in closure],
+    }
+
+
+def _describe_code(code, seen):
+    return {
+        'bytecode': hashlib.sha1(code.co_code).hexdigest(),
+        'names': list(code.co_names),
+        'consts': [_describe_code(const, seen)
+                   if isinstance(const, types.CodeType)
+                   else describe(const, seen)
+                   for const in code.co_consts],
+    }
+
+
+def describe(value, seen=None):
+    """Returns JSON-serializable description of value that does not change
+    between runs. Nested schema types are described only by their class."""
+    if value is None or isinstance(value, (bool, float) + six.integer_types):
+        return value
+    if isinstance(value, six.text_type):
+        return value
+    if isinstance(value, six.binary_type):
+        return value.decode('latin-1')
+    if isinstance(value, lt.Type):
+        return {'type': _qualified_name(value.__class__)}
+    if inspect.isclass(value):
+        return {'class': _qualified_name(value)}
+
+    seen = seen or set()
+    if id(value) in seen:
+        return '<cycle>'
+    seen = seen | set([id(value)])
+
+    if isinstance(value, (list, tuple)):
+        return [describe(item, seen) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted([describe(item, seen) for item in value],
+                      key=_canonical)
+    if isinstance(value, dict):
+        return sorted([[describe(k, seen), describe(v, seen)]
+                       for k, v in six.iteritems(value)], key=_canonical)
+    if isinstance(value, types.FunctionType):
+        return _describe_function(value, seen)
+    if isinstance(value, types.MethodType):
+        return {'method': _describe_function(six.get_method_function(value),
+                                             seen),
+                'self': describe(six.get_method_self(value), seen)}
+    if hasattr(value, 'pattern') and hasattr(value, 'flags'):
+        # Compiled regular expression
+        return {'regex': describe(value.pattern), 'flags': value.flags}
+    if hasattr(value, '__dict__'):
+        return {'class': _qualified_name(value.__class__),
+                'attrs': describe(vars(value), seen)}
+
+    return {'class': _qualified_name(value.__class__),
+            'repr': ADDRESS_REGEX.sub('', repr(value))}
+
+
+def _canonical(description):
+    return json.dumps(description, sort_keys=True)
+
+
+def digest(*values):
+    """Returns hex digest of given values' descriptions."""
+    return hashlib.sha1(
+        _canonical(describe(list(values))).encode('utf-8')
+    ).hexdigest()
+
+
+_IDENTITY_TYPES = (types.BuiltinFunctionType,) + six.class_types
+
+_SCALAR_TYPES = frozenset(
+    (type(None), bool, float, six.text_type, six.binary_type) +
+    six.integer_types
+)
+
+
+def structural_key(value, type_key):
+    """Returns hashable key of value which is equal for structurally equal
+    values within one process, e.g. two ``lv.Length(max=255)`` instances.
+    Nested schema types are keyed with given ``type_key`` function.
+    Classes and objects with true ``compare_by_identity`` attribute are
+    compared by identity, functions by code and closure.
+
+    :raises TypeError: If value contains objects that can not be compared,
+        e.g. reference cycles.
+    """
+    return _structural_key(value, type_key, set())
+
+
+def _structural_key(value, type_key, seen):
+    # Class is part of the key since e.g. 1 == 1.0 == True
+    cls = value.__class__
+    if cls in _SCALAR_TYPES:
+        return (cls, value)
+    if isinstance(value, lt.Type):
+        return type_key(value)
+    if isinstance(value, _IDENTITY_TYPES):
+        return value
+
+    if id(value) in seen:
+        raise TypeError('Reference cycle')
+    seen.add(id(value))
+    try:
+        return _container_key(value, type_key, seen)
+    finally:
+        seen.discard(id(value))
+
+
+def _container_key(value, type_key, seen):
+    cls = value.__class__
+    if isinstance(value, dict):
+        return (cls, tuple([(_structural_key(k, type_key, seen),
+                             _structural_key(v, type_key, seen))
+                            for k, v in six.iteritems(value)]))
+    if isinstance(value, (list, tuple)):
+        return (cls, tuple([_structural_key(item, type_key, seen)
+                            for item in value]))
+    if isinstance(value, (set, frozenset)):
+        return (cls, frozenset([_structural_key(item, type_key, seen)
+                                for item in value]))
+    if isinstance(value, types.FunctionType):
+        # Closures created by the same code (e.g. wrappers lollipop creates
+        # for every type instance) are equal if their free variables are
+        try:
+            closure = [cell.cell_contents
+                       for cell in six.get_function_closure(value) or ()]
+        except ValueError:
+            raise TypeError('Empty closure cell')
+        return (cls, six.get_function_code(value),
+                _structural_key(closure, type_key, seen),
+                _structural_key(six.get_function_defaults(value),
+                                type_key, seen),
+                _structural_key(vars(value), type_key, seen))
+    if isinstance(value, types.MethodType):
+        return (cls,
+                _structural_key(six.get_method_function(value),
+                                type_key, seen),
+                _structural_key(six.get_method_self(value), type_key, seen))
+    if hasattr(value, '__dict__'):
+        if getattr(value, 'compare_by_identity', False):
+            # Objects keeping state, e.g. values generated so far
+            return value
+        # Validators, fields and other objects configuring schema types
+        return (cls, _structural_key(vars(value), type_key, seen))
+
+    # E.g. compiled regular expressions
+    hash(value)
+    return (cls, value)
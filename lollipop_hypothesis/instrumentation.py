@@ -0,0 +1,95 @@
+from lollipop_hypothesis.lazy import LazyModule
+from timeit import default_timer
+import threading
+
+hs = LazyModule('hypothesis.strategies')
+
+
+class NodeStats(object):
+    def __init__(self, path, type_name):
+        self.path = path
+        self.type_name = type_name
+        self.draws = 0
+        self.checks = {}
+        self.rejections = {}
+        self.time = 0.0
+        self._lock = threading.Lock()
+
+    def record_draw(self, elapsed):
+        with self._lock:
+            self.draws += 1
+            self.time += elapsed
+
+    def record_filter(self, validator_name):
+        with self._lock:
+            self.checks.setdefault(validator_name, 0)
+
+    def record_check(self, validator_name, passed):
+        with self._lock:
+            self.checks[validator_name] = \
+                self.checks.get(validator_name, 0) + 1
+            if not passed:
+                self.rejections[validator_name] = \
+                    self.rejections.get(validator_name, 0) + 1
+
+    def to_dict(self):
+        return {
+            'type': self.type_name,
+            'draws': self.draws,
+            'checks': dict(self.checks),
+            'rejections': dict(self.rejections),
+            'time': self.time,
+        }
+
+
+class Instrumentation(object):
+    def __init__(self):
+        self._nodes = {}
+        self._lock = threading.Lock()
+
+    def node(self, path, type_name):
+        with self._lock:
+            if path not in self._nodes:
+                self._nodes[path] = NodeStats(path, type_name)
+            return self._nodes[path]
+
+    def report(self):
+        with self._lock:
+            nodes = list(self._nodes.values())
+        return {node.path: node.to_dict() for node in nodes}
+
+
+# Node that is being converted by instrumented registry in current thread
+_active = threading.local()
+
+
+def active_node():
+    return getattr(_active, 'node', None)
+
+
+def set_active_node(node):
+    _active.node = node
+
+
+def instrumented_predicate(predicate, validator, node):
+    name = repr(validator)
+    node.record_filter(name)
+
+    def check(x):
+        passed = predicate(x)
+        node.record_check(name, passed)
+        return passed
+
+    return check
+
+
+def instrumented_strategy(strategy, node):
+    @hs.composite
+    def instrumented(draw):
+        start = default_timer()
+        try:
+            return draw(strategy)
+        finally:
+            node.record_draw(default_timer() - start)
+
+    return instrumented()
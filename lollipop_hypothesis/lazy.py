@@ -0,0 +1,72 @@
+import importlib
+import threading
+
+
+class LazyModule(object):
+    """Proxy of a module that is imported on first attribute access.
+
+    Accessed attributes are cached, so later accesses are as fast as
+    accessing module attributes directly.
+    """
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        value = getattr(importlib.import_module(self._name), name)
+        self.__dict__[name] = value
+        return value
+
+    def __repr__(self):
+        return '<lazy module %r>' % self._name
+
+
+def lazy_function(module_name, name):
+    """Returns function that imports given function on first call and
+    delegates to it."""
+    def function(*args, **kwargs):
+        module = importlib.import_module(module_name)
+        return getattr(module, name)(*args, **kwargs)
+
+    function.__name__ = name
+    function.__doc__ = 'See :func:`%s.%s`.' % (module_name, name)
+    return function
+
+
+class LazyObject(object):
+    """Proxy of an object that is created with given factory on first use.
+    Creation is thread-safe.
+    """
+    def __init__(self, factory):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_wrapped', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _get_wrapped(self):
+        wrapped = self._wrapped
+        if wrapped is None:
+            with self._lock:
+                if self._wrapped is None:
+                    object.__setattr__(self, '_wrapped', self._factory())
+                wrapped = self._wrapped
+        return wrapped
+
+    @property
+    def __class__(self):
+        return self._get_wrapped().__class__
+
+    def __getattr__(self, name):
+        return getattr(self._get_wrapped(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get_wrapped(), name, value)
+
+    def __copy__(self):
+        return self._get_wrapped().__copy__()
+
+    def __repr__(self):
+        if self._wrapped is None:
+            return '<lazy object>'
+        return repr(self._wrapped)
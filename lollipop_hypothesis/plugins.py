@@ -0,0 +1,94 @@
+import importlib
+import threading
+
+
+# Entry point groups of converters for each default registry. Entry point
+# name is a (preferably fully qualified) name of type class and value is
+# a converter reference, e.g.:
+#
+#     entry_points={
+#         'lollipop_hypothesis.converters': [
+#             'mypackage.types.Email = mypackage.testing:email_strategy',
+#         ],
+#     }
+CONVERTERS_GROUP = 'lollipop_hypothesis.converters'
+DUMPED_CONVERTERS_GROUP = 'lollipop_hypothesis.dumped_converters'
+SAMPLERS_GROUP = 'lollipop_hypothesis.samplers'
+
+_entry_points = {}
+_load_lock = threading.Lock()
+
+
+def _scan_entry_points(group):
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            entry_points = None
+
+    if entry_points is None:
+        import pkg_resources
+        return [(ep.name, '%s:%s' % (ep.module_name, '.'.join(ep.attrs)))
+                for ep in pkg_resources.iter_entry_points(group)]
+
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        eps = eps.select(group=group)
+    else:
+        eps = eps.get(group, [])
+    return [(ep.name, ep.value) for ep in eps]
+
+
+def entry_points(group):
+    """Returns list of (type class name, converter reference) tuples
+    declared in given entry point group by installed packages. Packages are
+    scanned once per process."""
+    if group not in _entry_points:
+        _entry_points[group] = _scan_entry_points(group)
+    return _entry_points[group]
+
+
+def load_object(reference):
+    """Imports object by "module:attribute" reference. Attribute can be
+    a dotted path, e.g. "mypackage.testing:Converters.email"."""
+    module_name, _, attribute = reference.partition(':')
+    obj = importlib.import_module(module_name.strip())
+    for name in attribute.strip().split('.'):
+        obj = getattr(obj, name)
+    return obj
+
+
+def class_name(klass):
+    """Returns name a converter for given class can be declared with. Names
+    are fully qualified, so that classes with the same name from different
+    modules do not get each other's converters."""
+    return '%s.%s' % (klass.__module__, klass.__name__)
+
+
+class PluginConverter(object):
+    """Converter that imports actual converter on first use.
+
+    :param str reference: Converter reference, e.g. "mypackage.testing:email".
+    """
+    def __init__(self, reference):
+        self.reference = reference
+        self._converter = None
+
+    def load(self):
+        if self._converter is None:
+            with _load_lock:
+                if self._converter is None:
+                    self._converter = load_object(self.reference)
+        return self._converter
+
+    @property
+    def handles_validators(self):
+        return getattr(self.load(), 'handles_validators', False)
+
+    def __call__(self, registry, type, context=None):
+        return self.load()(registry, type, context=context)
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, self.reference)
@@ -0,0 +1,252 @@
+import lollipop.utils as lu
+from lollipop_hypothesis.strategy import DEFAULT_REGISTRY, hs
+from lollipop_hypothesis.sampler import DEFAULT_SAMPLER_REGISTRY
+from six.moves import copyreg
+import mmap
+import os
+import pickle
+import six
+import struct
+import tempfile
+import threading
+
+
+# Pool file layout: header, pickled values, then table of offsets of values
+# (one more than number of values, so that value i is between offsets i and
+# i + 1)
+MAGIC = b'LHPOOL1\n'
+HEADER = struct.Struct('<8sQQ')  # magic, number of values, offset of table
+OFFSET = struct.Struct('<Q')
+
+PICKLE_PROTOCOL = 2
+
+# Default share of values drawn from live strategy instead of pool
+DEFAULT_LIVE_RATIO = 0.1
+
+# Share of live values is rounded to this precision
+LIVE_RATIO_PRECISION = 1000
+
+# Path -> opened pool, so that all strategies of a process share one mapping
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _reduce_open_struct(value):
+    return lu.OpenStruct, (dict(value._data),)
+
+
+class _PoolPickler(pickle.Pickler):
+    # Objects are generated as OpenStruct by default, which can not be
+    # unpickled as is: its attribute lookup fails before its state is
+    # restored. Reducer is registered for pools only, so that pickling
+    # OpenStruct elsewhere does not change.
+    if six.PY2:
+        def _save_open_struct(self, value):
+            self.save_reduce(obj=value, *_reduce_open_struct(value))
+
+        dispatch = pickle.Pickler.dispatch.copy()
+        dispatch[lu.OpenStruct] = _save_open_struct
+    else:
+        dispatch_table = copyreg.dispatch_table.copy()
+        dispatch_table[lu.OpenStruct] = _reduce_open_struct
+
+
+class ExamplePool(object):
+    """Read-only sequence of values stored in pool file. File is memory
+    mapped and values are unpickled on access, so opening a pool is cheap
+    regardless of its size, and processes using the same pool share its
+    pages.
+
+    :param str path: Pool file path, see :func:`write_pool`.
+    """
+    closed = False
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._data) < HEADER.size:
+            raise ValueError('Invalid example pool file: %s' % path)
+        magic, self._count, self._table = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError('Invalid example pool file: %s' % path)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('Example pool index out of range')
+
+        position = self._table + index * OFFSET.size
+        start, = OFFSET.unpack_from(self._data, position)
+        end, = OFFSET.unpack_from(self._data, position + OFFSET.size)
+        return pickle.loads(self._data[start:end])
+
+    def close(self):
+        self._data.close()
+        self.closed = True
+
+
+def _replace(source, destination):
+    # Python 2 has no os.replace, but there os.rename replaces existing files
+    # atomically too, except on Windows
+    replace = getattr(os, 'replace', None)
+    if replace is None:
+        if os.name == 'nt' and os.path.exists(destination):
+            os.unlink(destination)
+        replace = os.rename
+    replace(source, destination)
+
+
+def _umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def write_pool(path, values):
+    """Writes values to pool file. File is replaced atomically, so pools
+    being read by other processes stay intact.
+
+    :param str path: Pool file path.
+    :param values: Iterable of picklable values. Objects with constructors
+        that are not importable (e.g. lambdas or record classes, see
+        :meth:`~lollipop_hypothesis.strategy.Registry.set_object_records`)
+        can not be stored.
+    :returns: Number of written values.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    f = tempfile.NamedTemporaryFile(dir=directory, prefix='.pool-',
+                                    delete=False)
+    try:
+        f.write(HEADER.pack(MAGIC, 0, 0))
+        offsets = [HEADER.size]
+        pickler = _PoolPickler(f, PICKLE_PROTOCOL)
+        for value in values:
+            pickler.dump(value)
+            # Values are unpickled one by one, so they can not refer to
+            # objects pickled before
+            pickler.clear_memo()
+            offsets.append(f.tell())
+
+        f.write(b''.join(OFFSET.pack(offset) for offset in offsets))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(offsets) - 1, offsets[-1]))
+        f.close()
+        # Temporary files are readable by owner only, but pools are shared
+        # with other users like any other file
+        os.chmod(f.name, 0o666 & ~_umask())
+        _replace(f.name, path)
+    except BaseException:
+        f.close()
+        os.unlink(f.name)
+        raise
+
+    return len(offsets) - 1
+
+
+def pool_path(directory, fingerprint):
+    return os.path.join(directory, fingerprint + '.pool')
+
+
+def open_pool(path):
+    """Returns :class:`ExamplePool` of given file, opening it once per
+    process, or None if there is no such file."""
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None and os.path.exists(path):
+            pool = _pools[path] = ExamplePool(path)
+    return pool
+
+
+def materialize_pool(schema, count, directory, registry=None, context=None,
+                     seed=None):
+    """Generates values of schema once and stores them in a pool file in
+    given directory, to be drawn from by :func:`pool_strategy`. Pool files
+    are named after schema fingerprint, so values are generated again when
+    schema or its converters change.
+
+    :param schema: Schema type.
+    :param int count: Number of values. Existing pool is kept if it has at
+        least that many values.
+    :param str directory: Directory with pool files.
+    :param registry: Sampler registry to generate values with, default
+        sampler registry by default.
+    :param context: Context passed to validators and converters.
+    :param seed: Random seed.
+    :returns: Pool file path.
+
+    Pool that is too small is closed before it is generated again, so
+    strategies drawing from it should be created after pools are
+    materialized.
+    """
+    registry = registry or DEFAULT_SAMPLER_REGISTRY
+    path = pool_path(directory, registry.fingerprint(schema, context=context))
+    pool = open_pool(path)
+    if pool is not None and len(pool) >= count:
+        return path
+
+    if pool is not None:
+        # Mapped file can not be replaced on Windows, so the pool is closed
+        # first; strategies created later use the new pool
+        with _pools_lock:
+            _pools.pop(path, None)
+        pool.close()
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    sampler = registry.convert(schema, context=context)
+    write_pool(path, sampler.examples(count, seed=seed))
+    return path
+
+
+def pool_strategy(schema, directory, registry=None, sampler_registry=None,
+                  context=None, live=DEFAULT_LIVE_RATIO):
+    """Returns strategy drawing values of schema from pool file created with
+    :func:`materialize_pool`, mixed with values of schema strategy to keep
+    exploring new values. Shrinking goes towards the first values of the
+    pool. If there is no pool for schema, returns schema strategy.
+
+    Example::
+
+        # conftest.py
+        materialize_pool(USER, 100000, '.pools')
+
+        @given(pool_strategy(USER, '.pools'))
+        def test_user(user):
+            ...
+
+    :param schema: Schema type.
+    :param str directory: Directory with pool files.
+    :param registry: Registry of live strategy.
+    :param sampler_registry: Sampler registry pool was generated with.
+    :param context: Context passed to validators and converters.
+    :param float live: Share of values drawn from live strategy.
+    """
+    if not 0 <= live <= 1:
+        raise ValueError('Share of live values should be between 0 and 1')
+
+    registry = registry or DEFAULT_REGISTRY
+    sampler_registry = sampler_registry or DEFAULT_SAMPLER_REGISTRY
+    live_strategy = registry.convert(schema, context=context)
+
+    pool = open_pool(pool_path(
+        directory, sampler_registry.fingerprint(schema, context=context),
+    ))
+    if pool is None or not len(pool) or live == 1:
+        return live_strategy
+
+    pooled = hs.integers(min_value=0, max_value=len(pool) - 1)\
+        .map(pool.__getitem__)
+    live_weight = int(round(live * LIVE_RATIO_PRECISION))
+    if not live_weight or registry.is_empty(live_strategy):
+        return pooled
+
+    return registry.weighted_one_of(
+        [pooled, live_strategy],
+        [LIVE_RATIO_PRECISION - live_weight, live_weight],
+    )
@@ -0,0 +1,290 @@
+import lollipop.types as lt
+import lollipop.validators as lv
+from lollipop.errors import ValidationError
+from lollipop.type_registry import TypeRef
+from lollipop_hypothesis.strategy import length_bounds, range_bounds, \
+    DEFAULT_REGISTRY
+from collections import Counter
+import json
+import six
+
+
+# Maximum number of bins of a learned distribution. Distributions with fewer
+# distinct values are kept exactly.
+MAX_BINS = 32
+
+# Histogram kinds: distribution of lengths of strings and lists or of values
+# of numbers
+LENGTH = 'length'
+RANGE = 'range'
+
+# Histogram kind -> (validator class, bounds function, types it applies to)
+KINDS = {
+    LENGTH: (lv.Length, length_bounds, (lt.String, lt.List)),
+    RANGE: (lv.Range, range_bounds, (lt.Integer, lt.Float)),
+}
+
+
+class Histogram(object):
+    """Distribution of lengths or values as list of ``(min, max, count)``
+    bins, where count is the number of sample values between min and max
+    (inclusive). Values are generated uniformly within a bin.
+
+    :param str kind: "length" or "range".
+    :param list bins: List of (min, max, count) tuples ordered by values.
+    """
+    def __init__(self, kind, bins):
+        if kind not in KINDS:
+            raise ValueError('Unknown histogram kind: %s' % kind)
+        self.kind = kind
+        self.bins = [tuple(b) for b in bins]
+
+    @classmethod
+    def from_counts(cls, kind, counts, max_bins=MAX_BINS):
+        """Builds histogram of at most ``max_bins`` bins holding about the
+        same number of values each, out of dict mapping values to numbers of
+        their occurrences."""
+        values = sorted(counts)
+        if len(values) <= max_bins:
+            return cls(kind, [(value, value, counts[value])
+                              for value in values])
+
+        total = sum(six.itervalues(counts))
+        bins, low, count, seen = [], None, 0, 0
+        for value in values:
+            if low is None:
+                low = value
+            count += counts[value]
+            seen += counts[value]
+            if seen * max_bins >= total * (len(bins) + 1):
+                bins.append((low, value, count))
+                low, count = None, 0
+
+        return cls(kind, bins)
+
+    def constraints(self, type):
+        """Returns list of (validator, count) tuples restricting values of
+        given type to each bin, skipping bins that type's own validators do
+        not allow. Returns empty list if histogram does not apply to type."""
+        validator_class, bounds, types = KINDS[self.kind]
+        if not isinstance(type, types):
+            return []
+
+        min_value, max_value = bounds(type.validators)
+        constraints = []
+        for low, high, count in self.bins:
+            if min_value is not None:
+                low = max([low, min_value])
+            if max_value is not None:
+                high = min([high, max_value])
+            if low <= high and count:
+                constraints.append((validator_class(min=low, max=high), count))
+        return constraints
+
+    def to_dict(self):
+        return {'kind': self.kind, 'bins': [list(b) for b in self.bins]}
+
+
+class Profile(object):
+    """Distributions of values learned from sample data, see
+    :func:`learn_profile`. Distributions are keyed by paths of types inside
+    schema, e.g. "User.tags[]", as reported by
+    :meth:`~lollipop_hypothesis.strategy.Registry.current_path`.
+
+    :param dict histograms: Type path -> :class:`Histogram` of lengths of
+        strings and lists or values of numbers.
+    :param dict branches: Type path -> dict mapping branch labels of OneOf
+        (alternative names or indexes) and Optional ("None" or "value") types
+        to numbers of sample values of that branch.
+    :param int examples: Number of sample values learned from.
+    :param int rejected: Number of sample values that failed to load.
+    """
+    def __init__(self, histograms=None, branches=None, examples=0,
+                 rejected=0):
+        self.histograms = histograms or {}
+        self.branches = branches or {}
+        self.examples = examples
+        self.rejected = rejected
+
+    def constraints(self, path, type):
+        """Returns list of (validator, count) tuples for bins of histogram of
+        type at given path, see :meth:`Histogram.constraints`."""
+        histogram = self.histograms.get(path)
+        if histogram is None:
+            return []
+        return histogram.constraints(type)
+
+    def branch_weights(self, path, labels):
+        """Returns list of numbers of sample values of given branches of type
+        at given path or None if none of them were seen."""
+        counts = self.branches.get(path)
+        if not counts:
+            return None
+
+        weights = [counts.get(label, 0) for label in labels]
+        return weights if any(weights) else None
+
+    def to_dict(self):
+        return {
+            'examples': self.examples,
+            'rejected': self.rejected,
+            'histograms': {path: histogram.to_dict()
+                           for path, histogram in
+                           six.iteritems(self.histograms)},
+            'branches': {path: dict(counts)
+                         for path, counts in six.iteritems(self.branches)},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            histograms={
+                path: Histogram(histogram['kind'], histogram['bins'])
+                for path, histogram in six.iteritems(data['histograms'])
+            },
+            branches={path: dict(counts)
+                      for path, counts in six.iteritems(data['branches'])},
+            examples=data.get('examples', 0),
+            rejected=data.get('rejected', 0),
+        )
+
+
+class ProfileLearner(object):
+    """Collects distributions of values of dumped data of a schema.
+
+    Paths of types follow the ones registries use when converting the
+    schema, so that collected distributions can be found by path during
+    conversion.
+    """
+    def __init__(self, schema, context=None):
+        self.schema = schema
+        self.context = context
+        self.values = {}
+        self.branches = {}
+        self.examples = 0
+        self.rejected = 0
+
+    def add(self, data):
+        """Adds dumped value of schema to the sample. Values schema fails to
+        load are counted, but not learned from."""
+        try:
+            self.schema.load(data, context=self.context)
+        except ValidationError:
+            self.rejected += 1
+            return
+
+        self.examples += 1
+        self._learn(self.schema, data,
+                    self.schema.name or self.schema.__class__.__name__)
+
+    def profile(self, max_bins=MAX_BINS):
+        return Profile(
+            histograms={
+                path: Histogram.from_counts(kind, counts, max_bins=max_bins)
+                for path, (kind, counts) in six.iteritems(self.values)
+            },
+            branches={path: dict(counts)
+                      for path, counts in six.iteritems(self.branches)},
+            examples=self.examples,
+            rejected=self.rejected,
+        )
+
+    def _record_value(self, path, kind, value):
+        if path not in self.values:
+            self.values[path] = (kind, Counter())
+        self.values[path][1][value] += 1
+
+    def _record_branch(self, path, label):
+        self.branches.setdefault(path, Counter())[label] += 1
+
+    def _learn(self, type, data, path):
+        if isinstance(type, lt.DumpOnly):
+            return
+
+        if isinstance(type, lt.Optional):
+            if data is None or data is lt.MISSING:
+                self._record_branch(path, 'None')
+            else:
+                self._record_branch(path, 'value')
+                self._learn(type.inner_type, data, path + '?')
+        elif isinstance(type, lt.OneOf):
+            label = self._one_of_branch(type, data)
+            if label is not None:
+                self._record_branch(path, six.text_type(label))
+                self._learn(type.types[label], data, '%s|%s' % (path, label))
+        elif isinstance(type, lt.List):
+            self._record_value(path, LENGTH, len(data))
+            for item in data:
+                self._learn(type.item_type, item, path + '[]')
+        elif isinstance(type, lt.Tuple):
+            for idx, (item_type, item) in enumerate(zip(type.item_types,
+                                                        data)):
+                self._learn(item_type, item, '%s[%d]' % (path, idx))
+        elif isinstance(type, lt.Dict):
+            value_type = getattr(type.value_types, 'default', None)
+            if value_type is not None:
+                for k, v in six.iteritems(data):
+                    self._learn(type.key_type, k, path + '{}')
+                    self._learn(value_type, v, path + '[]')
+            else:
+                for k, value_type in six.iteritems(type.value_types):
+                    if k in data:
+                        self._learn(value_type, data[k], '%s[%r]' % (path, k))
+        elif isinstance(type, lt.Object):
+            for name, field in six.iteritems(type.fields):
+                self._learn(field.field_type, data.get(name),
+                            '%s.%s' % (path, name))
+        elif isinstance(type, lt.String):
+            self._record_value(path, LENGTH, len(data))
+        elif isinstance(type, (lt.Integer, lt.Float)):
+            self._record_value(path, RANGE, data)
+        elif isinstance(type, (lt.Modifier, TypeRef)):
+            # E.g. Transform and LoadOnly: registries convert inner types
+            # without naming them
+            inner_type = type.inner_type
+            self._learn(inner_type, data,
+                        '%s<%s>' % (path, inner_type.__class__.__name__))
+
+    def _one_of_branch(self, type, data):
+        if hasattr(type.types, 'items') and type.load_hint:
+            label = type.load_hint(data)
+            return label if label in type.types else None
+
+        labels = list(type.types.keys()) if hasattr(type.types, 'items') \
+            else range(len(type.types))
+        for label in labels:
+            try:
+                type.types[label].load(data, context=self.context)
+            except ValidationError:
+                continue
+            return label
+        return None
+
+
+def learn_profile(schema, lines, context=None, max_bins=MAX_BINS):
+    """Learns distributions of lengths of strings and lists, values of
+    numbers, OneOf alternatives and Optional values being None out of
+    sample of dumped values of schema (e.g. production payloads).
+
+    :param schema: Schema type of sample values.
+    :param lines: Iterable of JSON encoded sample values, e.g. JSON Lines
+        file. Values that schema fails to load are skipped.
+    :param context: Context passed to schema when loading values.
+    :param int max_bins: Maximum number of bins of each histogram.
+    :returns: :class:`Profile`.
+    """
+    learner = ProfileLearner(schema, context=context)
+    for line in lines:
+        line = line.strip()
+        if line:
+            learner.add(json.loads(line))
+    return learner.profile(max_bins=max_bins)
+
+
+def profiled_registry(profile, registry=None):
+    """Returns child of given registry (Hypothesis strategies registry by
+    default) that generates values with distributions of given profile,
+    see :meth:`~lollipop_hypothesis.strategy.Registry.set_profile`."""
+    registry = (registry or DEFAULT_REGISTRY).child()
+    registry.set_profile(profile)
+    return registry
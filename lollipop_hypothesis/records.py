@@ -0,0 +1,84 @@
+import lollipop.types as lt
+from collections import namedtuple
+import keyword
+import re
+import weakref
+
+
+SLOTS = 'slots'
+TUPLE = 'tuple'
+RECORD_KINDS = (SLOTS, TUPLE)
+
+IDENTIFIER_REGEX = re.compile(r'^[A-Za-z][A-Za-z0-9_]*$')
+
+
+class Record(object):
+    """Base class of generated slotted record classes."""
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError('Unknown fields: %s' % ', '.join(sorted(kwargs)))
+
+    def __eq__(self, other):
+        return self.__class__ is other.__class__ and \
+            all(getattr(self, name) == getattr(other, name)
+                for name in self.__slots__)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '%s(%s)' % (
+            self.__class__.__name__,
+            ', '.join('%s=%r' % (name, getattr(self, name))
+                      for name in self.__slots__),
+        )
+
+
+def loaded_field_names(type):
+    """Returns names of object type fields that are passed to constructor."""
+    return [name for name, field in type.fields.items()
+            if not isinstance(field.field_type, lt.DumpOnly)]
+
+
+def _is_valid_name(name):
+    return bool(IDENTIFIER_REGEX.match(name)) and not keyword.iskeyword(name)
+
+
+def _slotted_class(name, field_names):
+    return type(name, (Record,), {'__slots__': tuple(field_names)})
+
+
+# Classes are created once per object type and kind
+_record_classes = weakref.WeakKeyDictionary()
+
+
+def record_class(type, kind=SLOTS):
+    """Returns class with compact instances to construct values of object
+    type with, or None if field names can not be used as attribute names.
+
+    :param type: :class:`~lollipop.types.Object` type.
+    :param str kind: "slots" for a class with ``__slots__`` or "tuple" for
+        a :func:`~collections.namedtuple`.
+    """
+    if kind not in RECORD_KINDS:
+        raise ValueError('Unknown record kind: %s' % kind)
+
+    classes = _record_classes.setdefault(type, {})
+    if kind not in classes:
+        names = loaded_field_names(type)
+        class_name = type.name \
+            if type.name and _is_valid_name(type.name) else 'Record'
+        if not all(_is_valid_name(name) for name in names):
+            classes[kind] = None
+        elif kind == SLOTS:
+            classes[kind] = _slotted_class(class_name, names)
+        else:
+            classes[kind] = namedtuple(class_name, names)
+
+    return classes[kind]
@@ -0,0 +1,408 @@
+import re
+import string
+import six
+
+try:
+    # Python 3.11+
+    import re._parser as sre_parse
+    import re._constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+
+# Characters used for "." and negated character classes
+PRINTABLE = string.ascii_letters + string.digits + string.punctuation + ' \t'
+
+CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: string.digits,
+    sre_constants.CATEGORY_WORD: string.ascii_letters + string.digits + '_',
+    sre_constants.CATEGORY_SPACE: ' \t\n\r\f\v',
+}
+
+NEGATED_CATEGORIES = {
+    sre_constants.CATEGORY_NOT_DIGIT: sre_constants.CATEGORY_DIGIT,
+    sre_constants.CATEGORY_NOT_WORD: sre_constants.CATEGORY_WORD,
+    sre_constants.CATEGORY_NOT_SPACE: sre_constants.CATEGORY_SPACE,
+}
+
+# Number of extra repetitions generated for unbounded repeats like "*" or "+"
+MAX_UNBOUNDED_REPEAT = 8
+
+
+class UnsupportedRegex(ValueError):
+    """Raised when regular expression uses constructs that strings can not
+    be generated for, e.g. lookarounds or backreferences."""
+
+
+def _category_chars(category):
+    if category in NEGATED_CATEGORIES:
+        excluded = CATEGORIES[NEGATED_CATEGORIES[category]]
+        return ''.join(c for c in PRINTABLE if c not in excluded)
+
+    if category not in CATEGORIES:
+        raise UnsupportedRegex(
+            'Unsupported regular expression category: %s' % category
+        )
+
+    return CATEGORIES[category]
+
+
+def _class_chars(items):
+    chars = []
+    negate = False
+    for op, value in items:
+        if op == sre_constants.NEGATE:
+            negate = True
+        elif op == sre_constants.LITERAL:
+            chars.append(six.unichr(value))
+        elif op == sre_constants.RANGE:
+            chars.extend(six.unichr(c)
+                         for c in six.moves.range(value[0], value[1] + 1))
+        elif op == sre_constants.CATEGORY:
+            chars.extend(_category_chars(value))
+        else:
+            raise UnsupportedRegex('Unsupported regular expression: %s' % op)
+
+    if negate:
+        excluded = set(chars)
+        return ''.join(c for c in PRINTABLE if c not in excluded)
+
+    return ''.join(sorted(set(chars)))
+
+
+def _chars_generator(chars):
+    if not chars:
+        raise ValueError('Regular expression does not match any value')
+
+    return lambda random: random.choice(chars)
+
+
+def _compile_sequence(items, flags):
+    generators = []
+    literal = []
+    for op, value in items:
+        if op == sre_constants.LITERAL:
+            literal.append(six.unichr(value))
+            continue
+
+        if literal:
+            generators.append(_constant(''.join(literal)))
+            literal = []
+
+        generators.append(_compile_item(op, value, flags))
+
+    if literal:
+        generators.append(_constant(''.join(literal)))
+
+    if len(generators) == 1:
+        return generators[0]
+
+    return lambda random: ''.join([generator(random) for generator in generators])
+
+
+def _constant(value):
+    return lambda random: value
+
+
+def _compile_item(op, value, flags):
+    if op == sre_constants.NOT_LITERAL:
+        return _chars_generator(
+            ''.join(c for c in PRINTABLE if c != six.unichr(value))
+        )
+    elif op == sre_constants.ANY:
+        return _chars_generator(
+            PRINTABLE + '\n' if flags & re.DOTALL else PRINTABLE
+        )
+    elif op == sre_constants.IN:
+        return _chars_generator(_class_chars(value))
+    elif op == sre_constants.SUBPATTERN:
+        # Subpattern layout differs between Python versions,
+        # but pattern is always the last element
+        return _compile_sequence(value[-1], flags)
+    elif op == sre_constants.BRANCH:
+        branches = [_compile_sequence(branch, flags) for branch in value[1]]
+        return lambda random: random.choice(branches)(random)
+    elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+        min_repeat, max_repeat, items = value
+        if max_repeat == sre_constants.MAXREPEAT:
+            max_repeat = min_repeat + MAX_UNBOUNDED_REPEAT
+        item = _compile_sequence(items, flags)
+        return lambda random: ''.join([
+            item(random)
+            for _ in six.moves.range(random.randint(min_repeat, max_repeat))
+        ])
+
+    if op == sre_constants.AT:
+        raise UnsupportedRegex('Unsupported regular expression anchor: %s' %
+                               value)
+    raise UnsupportedRegex('Unsupported regular expression: %s' % op)
+
+
+def _bits(mask):
+    """Returns positions of set bits of length mask, i.e. lengths in it."""
+    lengths = []
+    length = 0
+    while mask:
+        if mask & 1:
+            lengths.append(length)
+        mask >>= 1
+        length += 1
+    return lengths
+
+
+def _concat_masks(mask1, mask2, limit):
+    # Lengths of concatenations of strings with lengths from both masks
+    result = 0
+    for length in _bits(mask2):
+        result |= mask1 << length
+    return result & limit
+
+
+class _Sized(object):
+    """Generator of strings of exact given length.
+
+    :param int mask: Bit mask of lengths that can be generated.
+    :param draw: Function taking random and length and returning string.
+    """
+    def __init__(self, mask, draw):
+        self.mask = mask
+        self.draw = draw
+
+
+def _sized_chars(chars):
+    if not chars:
+        raise ValueError('Regular expression does not match any value')
+
+    return _Sized(1 << 1, lambda random, length: random.choice(chars))
+
+
+def _sized_constant(value):
+    return _Sized(1 << len(value), lambda random, length: value)
+
+
+def _choose_split(random, mask, length, rest_mask):
+    # Length of the next part such that the rest can still be generated
+    return random.choice([l for l in _bits(mask)
+                          if l <= length and rest_mask >> (length - l) & 1])
+
+
+def _sized_sequence(items, flags, limit):
+    parts = []
+    literal = []
+    for op, value in items:
+        if op == sre_constants.LITERAL:
+            literal.append(six.unichr(value))
+            continue
+
+        if literal:
+            parts.append(_sized_constant(''.join(literal)))
+            literal = []
+
+        parts.append(_sized_item(op, value, flags, limit))
+
+    if literal:
+        parts.append(_sized_constant(''.join(literal)))
+
+    return _sized_concat(parts, limit)
+
+
+def _sized_concat(parts, limit):
+    if len(parts) == 1:
+        return parts[0]
+
+    # Masks of lengths of sequence suffixes
+    suffix_masks = [1]
+    for part in reversed(parts):
+        suffix_masks.insert(0, _concat_masks(suffix_masks[0], part.mask, limit))
+
+    def draw(random, length):
+        result = []
+        for part, rest_mask in zip(parts, suffix_masks[1:]):
+            part_length = _choose_split(random, part.mask, length, rest_mask)
+            result.append(part.draw(random, part_length))
+            length -= part_length
+        return ''.join(result)
+
+    return _Sized(suffix_masks[0], draw)
+
+
+def _sized_item(op, value, flags, limit):
+    if op == sre_constants.NOT_LITERAL:
+        return _sized_chars(
+            ''.join(c for c in PRINTABLE if c != six.unichr(value))
+        )
+    elif op == sre_constants.ANY:
+        return _sized_chars(
+            PRINTABLE + '\n' if flags & re.DOTALL else PRINTABLE
+        )
+    elif op == sre_constants.IN:
+        return _sized_chars(_class_chars(value))
+    elif op == sre_constants.SUBPATTERN:
+        return _sized_sequence(value[-1], flags, limit)
+    elif op == sre_constants.BRANCH:
+        branches = [_sized_sequence(branch, flags, limit) for branch in value[1]]
+        mask = 0
+        for branch in branches:
+            mask |= branch.mask
+
+        def draw_branch(random, length):
+            return random.choice([branch for branch in branches
+                                  if branch.mask >> length & 1])\
+                .draw(random, length)
+
+        return _Sized(mask, draw_branch)
+    elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+        return _sized_repeat(value, flags, limit)
+
+    if op == sre_constants.AT:
+        raise UnsupportedRegex('Unsupported regular expression anchor: %s' %
+                               value)
+    raise UnsupportedRegex('Unsupported regular expression: %s' % op)
+
+
+def _sized_suffix(limit):
+    # Any characters of any length
+    return _Sized(limit, lambda random, length: ''.join([
+        random.choice(PRINTABLE) for _ in six.moves.range(length)
+    ]))
+
+
+def _sized_repeat(value, flags, limit):
+    min_repeat, max_repeat, items = value
+    item = _sized_sequence(items, flags, limit)
+
+    # counts_masks[n] is a mask of lengths of n repetitions. Unbounded
+    # repeats are limited by maximum length, unless items can be empty
+    counts_masks = [1]
+    max_count = max_repeat
+    if max_repeat == sre_constants.MAXREPEAT:
+        max_count = max(min_repeat, limit.bit_length())
+    while len(counts_masks) <= max_count:
+        next_mask = _concat_masks(counts_masks[-1], item.mask, limit)
+        if not next_mask:
+            break
+        counts_masks.append(next_mask)
+
+    mask = 0
+    for count_mask in counts_masks[min_repeat:]:
+        mask |= count_mask
+
+    def draw(random, length):
+        count = random.choice([
+            count for count in six.moves.range(min_repeat, len(counts_masks))
+            if counts_masks[count] >> length & 1
+        ])
+        result = []
+        for rest in six.moves.range(count - 1, -1, -1):
+            item_length = _choose_split(random, item.mask, length,
+                                        counts_masks[rest])
+            result.append(item.draw(random, item_length))
+            length -= item_length
+        return ''.join(result)
+
+    return _Sized(mask, draw)
+
+
+def _free_max_length(items):
+    # Maximum length of strings generated without length bounds
+    total = 0
+    for op, value in items:
+        if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL,
+                  sre_constants.ANY, sre_constants.IN):
+            total += 1
+        elif op == sre_constants.SUBPATTERN:
+            total += _free_max_length(value[-1])
+        elif op == sre_constants.BRANCH:
+            total += max(_free_max_length(branch) for branch in value[1])
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            min_repeat, max_repeat, repeat_items = value
+            if max_repeat == sre_constants.MAXREPEAT:
+                max_repeat = min_repeat + MAX_UNBOUNDED_REPEAT
+            total += max_repeat * _free_max_length(repeat_items)
+    return total
+
+
+BEGINNING_ANCHORS = (sre_constants.AT_BEGINNING,
+                     sre_constants.AT_BEGINNING_STRING)
+END_ANCHORS = (sre_constants.AT_END, sre_constants.AT_END_STRING)
+
+
+def _strip_anchors(items):
+    """Returns items of expression without leading "^" and trailing "$"
+    anchors and whether expression is anchored at the end. Anchors anywhere
+    else are not supported."""
+    items = list(items)
+    if items and items[0][0] == sre_constants.AT and \
+            items[0][1] in BEGINNING_ANCHORS:
+        items = items[1:]
+
+    anchored = bool(items) and items[-1][0] == sre_constants.AT and \
+        items[-1][1] in END_ANCHORS
+    if anchored:
+        items = items[:-1]
+    return items, anchored
+
+
+_parsed = {}
+_compiled = {}
+
+
+def _parse(pattern, flags):
+    key = (pattern, flags)
+    if key not in _parsed:
+        _parsed[key] = sre_parse.parse(pattern, flags)
+    return _parsed[key]
+
+
+def _compile(pattern, flags, min_length, max_length):
+    items, anchored = _strip_anchors(_parse(pattern, flags))
+    if min_length is None and max_length is None:
+        return _compile_sequence(items, flags)
+
+    min_length = min_length or 0
+    if max_length is None:
+        max_length = max(_free_max_length(items),
+                         min_length + MAX_UNBOUNDED_REPEAT)
+
+    limit = (1 << (max_length + 1)) - 1
+    allowed = limit & ~((1 << min_length) - 1)
+    sized = _sized_sequence(items, flags, limit)
+    if not sized.mask & allowed and not anchored:
+        # Regexp validators match beginning of strings, so strings that are
+        # too short can be padded with any characters
+        sized = _sized_concat([sized, _sized_suffix(limit)], limit)
+
+    lengths = _bits(sized.mask & allowed)
+    if not lengths:
+        raise ValueError('Regular expression does not match any value '
+                         'of allowed length')
+
+    return lambda random: sized.draw(random, random.choice(lengths))
+
+
+def compile_regex(regexp, flags=0, min_length=None, max_length=None):
+    """Returns a function that takes :class:`random.Random` instance and
+    generates a string matching given regular expression with
+    :func:`re.match`, i.e. starting with a match unless expression ends with
+    "$".
+
+    Only ``choice()`` and ``randint()`` methods of random are used.
+    Generators are cached, so each expression is parsed only once.
+
+    :param int min_length: Minimum length of generated strings.
+    :param int max_length: Maximum length of generated strings.
+    :raises UnsupportedRegex: If expression uses unsupported constructs.
+    :raises ValueError: If expression does not match any string of
+        allowed length.
+    """
+    if isinstance(regexp, six.string_types):
+        regexp = re.compile(regexp, flags)
+    elif flags:
+        regexp = re.compile(regexp.pattern, regexp.flags | flags)
+
+    key = (regexp.pattern, regexp.flags, min_length, max_length)
+    if key not in _compiled:
+        _compiled[key] = _compile(regexp.pattern, regexp.flags,
+                                  min_length, max_length)
+    return _compiled[key]
@@ -0,0 +1,627 @@
+import lollipop.types as lt
+import lollipop.validators as lv
+from lollipop.type_registry import TypeRef
+from lollipop.utils import identity
+from lollipop_hypothesis.strategy import Registry, find_validators, \
+    remaining_validators, apply_validators, handles_validators, \
+    length_bounds, range_bounds, excluded_values, optional_allows_none, \
+    regex_generator, cumulative_weights, SchemaError
+from lollipop_hypothesis.lazy import LazyObject
+from lollipop_hypothesis.unique import CorpusUnique, Corpus, CorpusRandom, \
+    unique_index, unique_integers, unique_strings
+from lollipop_hypothesis.plugins import SAMPLERS_GROUP
+from timeit import default_timer
+import bisect
+import datetime
+import random
+import string
+import six
+import weakref
+
+
+# Maximum number of attempts to draw a value that passes a filter
+MAX_FILTER_TRIES = 1000
+
+# Maximum size of strings and collections that have no Length validators
+DEFAULT_MAX_SIZE = 10
+
+TEXT_ALPHABET = string.ascii_letters + string.digits + string.punctuation + ' '
+
+DEFAULT_INTEGER_RANGE = (-2 ** 31, 2 ** 31 - 1)
+DEFAULT_FLOAT_RANGE = (-1e9, 1e9)
+DEFAULT_DATETIME_RANGE = (datetime.datetime(1970, 1, 1),
+                          datetime.datetime(2100, 1, 1))
+DEFAULT_DATE_RANGE = (datetime.date(1970, 1, 1), datetime.date(2100, 1, 1))
+DEFAULT_TIME_RANGE = (datetime.time.min, datetime.time.max)
+
+
+class Sampler(object):
+    """Generates values from given :class:`random.Random` instance.
+    Unlike Hypothesis strategies, samplers do not support shrinking, but are
+    much cheaper to draw from.
+
+    :param callable draw: Function that takes :class:`random.Random` instance
+        and returns generated value.
+    :param bool empty: True if sampler can not generate any value.
+    """
+    def __init__(self, draw, empty=False):
+        self.draw = draw
+        self.empty = empty
+
+    def map(self, func):
+        if self.empty:
+            return self
+
+        draw = self.draw
+        return Sampler(lambda random: func(draw(random)))
+
+    def filter(self, predicate):
+        if self.empty:
+            return self
+
+        draw = self.draw
+
+        def filtered(random):
+            for _ in six.moves.range(MAX_FILTER_TRIES):
+                value = draw(random)
+                if predicate(value):
+                    return value
+
+            raise ValueError('Could not generate value satisfying validators '
+                             'in %d tries' % MAX_FILTER_TRIES)
+
+        return Sampler(filtered)
+
+    def example(self, random=None):
+        return self.draw(random or _random)
+
+    def examples(self, count=None, seed=None, corpus=None, start=0):
+        """Generates given number of values (or infinite amount if count is
+        None). Same seed always results in the same values.
+
+        :param corpus: :class:`~lollipop_hypothesis.unique.Corpus` values are
+            a part of, to keep values with
+            :class:`~lollipop_hypothesis.unique.CorpusUnique` validators
+            unique across parts generated separately. By default, given
+            number of values is a corpus of its own.
+        :param int start: Index of the first value in corpus.
+        """
+        rnd = CorpusRandom(seed)
+        draw = self.draw
+        if count is None:
+            while True:
+                yield draw(rnd)
+
+        rnd.corpus = corpus or Corpus(seed, count)
+        for index in six.moves.range(count):
+            rnd.start_record(start + index)
+            yield draw(rnd)
+
+
+_random = random.Random()
+
+
+def just(value):
+    return Sampler(lambda random: value)
+
+
+def sampled_from(values):
+    values = list(values)
+    if len(values) == 1:
+        return just(values[0])
+
+    return Sampler(lambda random: random.choice(values))
+
+
+def one_of(samplers):
+    samplers = [sampler for sampler in samplers if not sampler.empty]
+    if not samplers:
+        return nothing()
+
+    draws = [sampler.draw for sampler in samplers]
+    if len(draws) == 1:
+        return samplers[0]
+
+    return Sampler(lambda random: random.choice(draws)(random))
+
+
+def nothing():
+    def draw(random):
+        raise ValueError('Type does not match any value')
+
+    return Sampler(draw, empty=True)
+
+
+def size_range(min_length, max_length):
+    min_size = min_length or 0
+    if max_length is None:
+        max_length = min_size + DEFAULT_MAX_SIZE
+    return min_size, max_length
+
+
+def value_range(validators, default_range):
+    min_value, max_value = range_bounds(validators)
+    if min_value is None and max_value is None:
+        return default_range
+
+    span = default_range[1] - default_range[0]
+    try:
+        if min_value is None:
+            min_value = max_value - span
+        if max_value is None:
+            max_value = min_value + span
+    except OverflowError:
+        # Near limits of dates range
+        min_value = max_value if min_value is None else min_value
+        max_value = min_value if max_value is None else max_value
+
+    return min_value, max_value
+
+
+def text(alphabet, min_size, max_size):
+    if hasattr(random.Random, 'choices'):
+        return Sampler(lambda random: ''.join(
+            random.choices(alphabet, k=random.randint(min_size, max_size))
+        ))
+
+    return Sampler(lambda random: ''.join([
+        random.choice(alphabet)
+        for _ in six.moves.range(random.randint(min_size, max_size))
+    ]))
+
+
+def any_sampler(registry, type, context=None):
+    return text(TEXT_ALPHABET, *size_range(None, None))
+
+
+@handles_validators
+def string_sampler(registry, type, context=None):
+    regex = regex_generator(type.validators)
+    if regex is not None:
+        generator, validators = regex
+        return apply_validators(Sampler(generator), validators, context=context)
+
+    min_length, max_length = length_bounds(type.validators)
+    return apply_validators(
+        text(TEXT_ALPHABET, *size_range(min_length, max_length)),
+        remaining_validators(type.validators, lv.Length),
+        context=context,
+    )
+
+
+@handles_validators
+def integer_sampler(registry, type, context=None):
+    min_value, max_value = value_range(type.validators, DEFAULT_INTEGER_RANGE)
+    return apply_validators(
+        Sampler(lambda random: random.randint(min_value, max_value)),
+        remaining_validators(type.validators, lv.Range),
+        context=context,
+    )
+
+
+@handles_validators
+def float_sampler(registry, type, context=None):
+    min_value, max_value = value_range(type.validators, DEFAULT_FLOAT_RANGE)
+    return apply_validators(
+        Sampler(lambda random: random.uniform(min_value, max_value)),
+        remaining_validators(type.validators, lv.Range),
+        context=context,
+    )
+
+
+@handles_validators
+def boolean_sampler(registry, type, context=None):
+    excluded = excluded_values(type.validators)
+    values = [x for x in [False, True] if x not in excluded]
+    if not values:
+        raise SchemaError('Type %s does not match any value' % type,
+                          'no-choices')
+
+    return apply_validators(
+        sampled_from(values) if excluded
+        else Sampler(lambda random: random.random() < 0.5),
+        remaining_validators(type.validators, lv.NoneOf),
+        context=context,
+    )
+
+
+@handles_validators
+def datetime_sampler(registry, type, context=None):
+    min_value, max_value = value_range(type.validators, DEFAULT_DATETIME_RANGE)
+    span = int((max_value - min_value).total_seconds())
+    return apply_validators(
+        Sampler(lambda random: min_value + datetime.timedelta(
+            seconds=random.randint(0, span)
+        )),
+        remaining_validators(type.validators, lv.Range),
+        context=context,
+    )
+
+
+@handles_validators
+def date_sampler(registry, type, context=None):
+    min_value, max_value = value_range(type.validators, DEFAULT_DATE_RANGE)
+    min_ordinal, max_ordinal = min_value.toordinal(), max_value.toordinal()
+    return apply_validators(
+        Sampler(lambda random: datetime.date.fromordinal(
+            random.randint(min_ordinal, max_ordinal)
+        )),
+        remaining_validators(type.validators, lv.Range),
+        context=context,
+    )
+
+
+def _seconds(time):
+    return time.hour * 3600 + time.minute * 60 + time.second + \
+        (1 if time.microsecond else 0)
+
+
+@handles_validators
+def time_sampler(registry, type, context=None):
+    min_value, max_value = range_bounds(type.validators)
+    if min_value is None:
+        min_value = DEFAULT_TIME_RANGE[0]
+    if max_value is None:
+        max_value = DEFAULT_TIME_RANGE[1]
+    min_seconds = _seconds(min_value)
+    max_seconds = _seconds(max_value.replace(microsecond=0))
+
+    if min_seconds <= max_seconds:
+        def draw(random):
+            seconds = random.randint(min_seconds, max_seconds)
+            return datetime.time(seconds // 3600, seconds // 60 % 60,
+                                 seconds % 60)
+    else:
+        # Both bounds are within the same second, so there are no whole
+        # seconds between them
+        min_microsecond, max_microsecond = \
+            min_value.microsecond, max_value.microsecond
+
+        def draw(random):
+            return min_value.replace(microsecond=random.randint(
+                min_microsecond, max_microsecond,
+            ))
+
+    return apply_validators(
+        Sampler(draw),
+        remaining_validators(type.validators, lv.Range),
+        context=context,
+    )
+
+
+def lists(item, min_size, max_size, unique_by=None):
+    if item.empty:
+        return nothing() if min_size > 0 else Sampler(lambda random: [])
+
+    draw_item = item.draw
+    if unique_by is None:
+        return Sampler(lambda random: [
+            draw_item(random)
+            for _ in six.moves.range(random.randint(min_size, max_size))
+        ])
+
+    def draw(random):
+        size = random.randint(min_size, max_size)
+        items, seen = [], set()
+        for _ in six.moves.range(size * MAX_FILTER_TRIES):
+            if len(items) == size:
+                break
+
+            value = draw_item(random)
+            key = unique_by(value)
+            if key not in seen:
+                seen.add(key)
+                items.append(value)
+
+        if len(items) < min_size:
+            raise ValueError('Could not generate enough unique items')
+
+        return items
+
+    return Sampler(draw)
+
+
+@handles_validators
+def list_sampler(registry, type, context=None):
+    min_length, max_length = registry.size_bounds(type.validators)
+
+    unique_validators = find_validators(type.validators, lv.Unique)
+    unique_key = unique_validators[0].key if unique_validators else None
+
+    item_validators = [validator
+                       for each in find_validators(type.validators, lv.Each)
+                       for validator in each.validators]
+    min_size, max_size = size_range(min_length, max_length)
+    with registry.children(max_size):
+        item_sampler = registry.convert_validated(
+            type.item_type, item_validators, context=context, name='[]',
+        )
+    min_size, max_size = registry.limit_branching(min_size, max_size)
+
+    return apply_validators(
+        lists(item_sampler, min_size, max_size, unique_by=unique_key),
+        [validator for validator in type.validators
+         if not isinstance(validator, (lv.Length, lv.Each))
+         and validator not in unique_validators[:1]],
+        context=context,
+    )
+
+
+def tuple_sampler(registry, type, context=None):
+    with registry.children(len(type.item_types)):
+        samplers = [registry.convert(item_type, context=context,
+                                     name='[%d]' % idx)
+                    for idx, item_type in enumerate(type.item_types)]
+    if any(sampler.empty for sampler in samplers):
+        return nothing()
+
+    draws = [sampler.draw for sampler in samplers]
+    return Sampler(lambda random: tuple([draw(random) for draw in draws]))
+
+
+@handles_validators
+def dict_sampler(registry, type, context=None):
+    if getattr(type.value_types, 'default', None):
+        min_size, max_size = size_range(*registry.size_bounds(type.validators))
+        with registry.children(max_size):
+            key_sampler = registry.convert(type.key_type, context=context,
+                                           name='{}')
+            value_sampler = registry.convert(type.value_types.default,
+                                             context=context, name='[]')
+        min_size, max_size = registry.limit_branching(min_size, max_size)
+
+        if value_sampler.empty:
+            key_sampler = value_sampler
+        draw_keys = lists(key_sampler, min_size, max_size,
+                          unique_by=lambda x: x).draw
+        draw_value = value_sampler.draw
+        sampler = Sampler(lambda random: {
+            k: draw_value(random) for k in draw_keys(random)
+        })
+    else:
+        min_length, max_length = length_bounds(type.validators)
+        size = len(type.value_types)
+        if (min_length is not None and size < min_length) or \
+                (max_length is not None and size > max_length):
+            raise SchemaError('Invalid settings for length validators',
+                              'length-conflict')
+
+        with registry.children(size):
+            samplers = [
+                (k, registry.convert(v, context=context, name='[%r]' % (k,)))
+                for k, v in six.iteritems(type.value_types)
+            ]
+        if any(sampler.empty for _, sampler in samplers):
+            return nothing()
+
+        draws = [(k, sampler.draw) for k, sampler in samplers]
+        sampler = Sampler(lambda random: {k: draw(random) for k, draw in draws})
+
+    return apply_validators(
+        sampler,
+        remaining_validators(type.validators, lv.Length),
+        context=context,
+    )
+
+
+def object_sampler(registry, type, context=None):
+    constructor = registry.object_constructor(type)
+    # Dump-only fields are never loaded, so they are not passed to constructor
+    with registry.children(len(type.fields)):
+        samplers = [
+            (k, registry.convert(v.field_type, context=context, name='.' + k))
+            for k, v in six.iteritems(type.fields)
+            if not isinstance(v.field_type, lt.DumpOnly)
+        ]
+    if any(sampler.empty for _, sampler in samplers):
+        return nothing()
+
+    draws = [(k, sampler.draw) for k, sampler in samplers]
+    return Sampler(lambda random: constructor(**{
+        k: draw(random) for k, draw in draws
+    }))
+
+
+def constant_sampler(registry, type, context=None):
+    return just(type.value)
+
+
+def one_of_sampler(registry, type, context=None):
+    types = type.types
+    if hasattr(types, 'items'):
+        types = list(types.items())
+    else:
+        types = list(enumerate(types))
+
+    return registry.branches([
+        (k, registry.convert(t, context=context, name='|%s' % k))
+        for k, t in types
+    ])
+
+
+def optional_sampler(registry, type, context=None):
+    inner_sampler = registry.convert(type.inner_type, context=context, name='?')
+    if not optional_allows_none(type, context):
+        return inner_sampler
+    return registry.branches([('None', just(None)), ('value', inner_sampler)])
+
+
+def dump_only_sampler(registry, type, context=None):
+    return nothing()
+
+
+def inner_type_sampler(registry, type, context=None):
+    return registry.convert(type.inner_type, context=context)
+
+
+def transform_sampler(registry, type, context=None):
+    return registry.convert(type.inner_type, context=context)\
+        .map(lambda x: type.post_load(x, context))
+
+
+class SamplerRegistry(Registry):
+    """Registry of converters from schema types to samplers."""
+    def sampled_from(self, values):
+        return sampled_from(values)
+
+    def one_of(self, samplers):
+        return one_of(samplers)
+
+    def weighted_one_of(self, samplers, weights):
+        if len(samplers) == 1:
+            return samplers[0]
+
+        draws = [sampler.draw for sampler in samplers]
+        totals = cumulative_weights(weights)
+        total = totals[-1]
+        return Sampler(lambda random: draws[
+            bisect.bisect_right(totals, random.random() * total)
+        ](random))
+
+    def covered_one_of(self, node, labeled):
+        labels = [label for label, _ in labeled]
+        draws = {label: sampler.draw for label, sampler in labeled}
+        guided = self._coverage.guided
+
+        def draw(random):
+            candidates = guided and node.uncovered(labels) or labels
+            label = random.choice(candidates)
+            value = draws[label](random)
+            node.record(label)
+            return value
+
+        return Sampler(draw)
+
+    def corpus_unique(self, sampler, validator, type):
+        if sampler.empty:
+            return sampler
+
+        if validator.path is None:
+            validator.path = self.current_path()
+        filtered = self._filtered_unique(sampler, validator)
+        encode = self._unique_encoder(type, validator)
+        if encode is None:
+            return filtered
+
+        def unique(random):
+            index = unique_index(random, validator)
+            if index is None:
+                # Not a part of a corpus, e.g. an infinite run
+                return filtered.draw(random)
+            return encode(index, '%s:%s' % (random.corpus.key,
+                                            validator.path))
+
+        return Sampler(unique)
+
+    def _filtered_unique(self, sampler, validator):
+        draw, key = sampler.draw, validator.key
+        # Filter of the current corpus, to not look it up on every draw
+        last_run = [(lambda: None, None)]
+
+        def unique(random):
+            corpus = getattr(random, 'corpus', None) or random
+            run = last_run[0]
+            if run[0]() is not corpus:
+                if not getattr(corpus, 'local', True):
+                    raise ValueError(
+                        'Values of %s can not be kept unique across corpus '
+                        'parts generated in other processes' % validator.path
+                    )
+                run = last_run[0] = (weakref.ref(corpus),
+                                     validator.seen(corpus))
+            seen = run[1]
+
+            for _ in six.moves.range(MAX_FILTER_TRIES):
+                value = draw(random)
+                if seen.add(key(value)):
+                    return value
+
+            raise ValueError('Could not generate value unique in corpus '
+                             'in %d tries' % MAX_FILTER_TRIES)
+
+        return Sampler(unique)
+
+    def _unique_encoder(self, type, validator):
+        # Returns function deriving values of type from their indexes in
+        # corpus, if type has no validators such values could fail
+        if validator.key is not identity or \
+                self._instance_converter(type) is not None:
+            return None
+
+        converter = self.find_converter(type.__class__)
+        if converter is integer_sampler and not remaining_validators(
+                type.validators, (lv.Range, CorpusUnique)):
+            return unique_integers(*value_range(type.validators,
+                                                DEFAULT_INTEGER_RANGE))
+        if converter is string_sampler and not remaining_validators(
+                type.validators, (lv.Length, CorpusUnique)):
+            return unique_strings(TEXT_ALPHABET,
+                                  *size_range(*length_bounds(type.validators)))
+        return None
+
+    def nothing(self):
+        return nothing()
+
+    def is_empty(self, sampler):
+        return sampler.empty
+
+    def examples(self, sampler, count):
+        return list(sampler.examples(count, seed=0))
+
+    def instrumented(self, sampler, node):
+        if sampler.empty:
+            return sampler
+
+        draw = sampler.draw
+
+        def instrumented(random):
+            start = default_timer()
+            try:
+                return draw(random)
+            finally:
+                node.record_draw(default_timer() - start)
+
+        return Sampler(instrumented)
+
+
+def new_sampler_registry():
+    registry = SamplerRegistry()
+    for k, v in [
+        (lt.Any, any_sampler),
+        (lt.String, string_sampler),
+        (lt.Integer, integer_sampler),
+        (lt.Float, float_sampler),
+        (lt.Boolean, boolean_sampler),
+        (lt.DateTime, datetime_sampler),
+        (lt.Date, date_sampler),
+        (lt.Time, time_sampler),
+        (lt.List, list_sampler),
+        (lt.Tuple, tuple_sampler),
+        (lt.Dict, dict_sampler),
+        (lt.Object, object_sampler),
+        (lt.Constant, constant_sampler),
+        (lt.OneOf, one_of_sampler),
+        (lt.Optional, optional_sampler),
+        (lt.DumpOnly, dump_only_sampler),
+        (lt.LoadOnly, inner_type_sampler),
+        (lt.Transform, transform_sampler),
+        (TypeRef, inner_type_sampler),
+    ]:
+        registry.register(k, v)
+
+    registry.load_plugins(SAMPLERS_GROUP)
+    return registry
+
+
+DEFAULT_SAMPLER_REGISTRY = LazyObject(new_sampler_registry)
+
+
+def register_sampler(type_or_class, converter):
+    """Registers converter in default sampler registry, see
+    :meth:`Registry.register`."""
+    DEFAULT_SAMPLER_REGISTRY.register(type_or_class, converter)
+
+
+def type_sampler(type, context=None):
+    """Returns sampler generating values of given type."""
+    return DEFAULT_SAMPLER_REGISTRY.convert(type, context=context)
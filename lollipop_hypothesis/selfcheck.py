@@ -0,0 +1,262 @@
+from lollipop_hypothesis.strategy import DEFAULT_REGISTRY
+from lollipop_hypothesis.sampler import Sampler
+from lollipop_hypothesis.plugins import load_object
+from lollipop.errors import ValidationError, SCHEMA
+from collections import Counter
+from timeit import default_timer
+import importlib
+import json
+import lollipop.types as lt
+import multiprocessing
+import six
+
+
+# Number of examples of each schema checked by default
+DEFAULT_COUNT = 100
+
+# Number of examples checked in one task when checking in parallel.
+# Changing it changes generated data for a given seed.
+CHUNK_SIZE = 1000
+
+# Number of failed examples kept in results of each schema
+MAX_SAMPLES = 3
+
+GENERATE = 'generate'
+DUMP = 'dump'
+SERIALIZE = 'serialize'
+LOAD = 'load'
+STAGES = (GENERATE, DUMP, SERIALIZE, LOAD)
+
+
+def schemas_in_module(module):
+    """Returns list of (name, schema) tuples for all public schema types
+    defined at module level, sorted by name."""
+    return sorted(
+        (name, value) for name, value in six.iteritems(vars(module))
+        if not name.startswith('_') and isinstance(value, lt.Type)
+    )
+
+
+def _error_paths(messages, path):
+    # Lollipop reports errors of nested values as dicts keyed by field name
+    # or item index; item indices are merged so that errors of all items
+    # of a list are counted together
+    if not isinstance(messages, dict):
+        yield path
+        return
+
+    for key, value in six.iteritems(messages):
+        if key == SCHEMA:
+            child_path = path
+        elif isinstance(key, six.integer_types):
+            child_path = path + '[]'
+        else:
+            child_path = '%s.%s' % (path, key)
+
+        for error_path in _error_paths(value, child_path):
+            yield error_path
+
+
+class CheckResult(object):
+    """Counts of checked examples and their failures for a schema."""
+    def __init__(self, name):
+        self.name = name
+        self.examples = 0
+        self.failures = 0
+        self.stages = Counter()
+        self.fields = Counter()
+        self.samples = []
+        self.generate_time = 0.0
+        self.check_time = 0.0
+
+    def record_failure(self, stage, messages, data=None):
+        self.failures += 1
+        self.stages[stage] += 1
+        # The same field may fail for several items of a list
+        self.fields.update(set(_error_paths(messages, self.name)))
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append({'stage': stage, 'data': data,
+                                 'errors': messages})
+
+    def merge(self, other):
+        self.examples += other.examples
+        self.failures += other.failures
+        self.stages.update(other.stages)
+        self.fields.update(other.fields)
+        self.samples.extend(
+            other.samples[:MAX_SAMPLES - len(self.samples)]
+        )
+        self.generate_time += other.generate_time
+        self.check_time += other.check_time
+
+    def report(self):
+        total_time = self.generate_time + self.check_time
+        return {
+            'examples': self.examples,
+            'failures': self.failures,
+            'failure_rate': float(self.failures) / self.examples
+                            if self.examples else None,
+            'stages': dict(self.stages),
+            'fields': dict(self.fields),
+            'samples': self.samples,
+            'generate_time': self.generate_time,
+            'check_time': self.check_time,
+            'examples_per_second': self.examples / total_time
+                                   if total_time else None,
+        }
+
+
+def _generate(registry, generator, count, seed):
+    if isinstance(generator, Sampler):
+        return list(generator.examples(count, seed=seed))
+    return registry.examples(generator, count)
+
+
+def _check_example(result, schema, value, context):
+    try:
+        dumped = schema.dump(value, context)
+    except ValidationError as e:
+        return result.record_failure(DUMP, e.messages)
+    except Exception as e:
+        return result.record_failure(DUMP, str(e) or repr(e))
+
+    # Round trip through JSON to load what would be sent over the wire
+    try:
+        data = json.loads(json.dumps(dumped))
+    except (TypeError, ValueError) as e:
+        return result.record_failure(SERIALIZE, str(e))
+
+    try:
+        schema.load(data, context)
+    except ValidationError as e:
+        return result.record_failure(LOAD, e.messages, data)
+    except Exception as e:
+        return result.record_failure(LOAD, str(e) or repr(e), data)
+
+
+def _check(name, schema, registry, count, seed=None, context=None):
+    result = CheckResult(name)
+
+    start = default_timer()
+    try:
+        # Registries cache converted schemas, so it is cheap for every chunk
+        generator = registry.convert(schema, context=context)
+        values = _generate(registry, generator, count, seed)
+    except Exception as e:
+        # Schema can not be converted or generator fails: report it as
+        # a single failure instead of aborting checks of other schemas
+        result.examples += 1
+        result.record_failure(GENERATE, str(e) or repr(e))
+        return result
+    result.generate_time = default_timer() - start
+
+    start = default_timer()
+    for value in values:
+        _check_example(result, schema, value, context)
+    result.examples += len(values)
+    result.check_time = default_timer() - start
+
+    return result
+
+
+def check_schema(schema, registry=None, context=None, count=DEFAULT_COUNT,
+                 seed=None):
+    """Generates examples of schema, dumps them, serializes them to JSON
+    and loads them back with schema to validate them.
+
+    :param schema: Schema type to check.
+    :param registry: Registry to generate examples with, default registry
+        by default. Sampler registries generate the same examples for
+        the same seed.
+    :param context: Context passed to converters and schema.
+    :param int count: Number of examples to check.
+    :param seed: Random seed for sampler registries.
+    :returns: JSON-serializable dict with keys "examples", "failures",
+        "failure_rate", "stages" (numbers of failures by stage: "generate",
+        "dump", "serialize" or "load"), "fields" (numbers of examples
+        failing validation by field path), "samples" (a few failed
+        examples with their errors), "generate_time", "check_time" and
+        "examples_per_second".
+    """
+    registry = registry or DEFAULT_REGISTRY
+    name = schema.name or schema.__class__.__name__
+    return _check(name, schema, registry, count, seed=seed,
+                  context=context).report()
+
+
+_worker = {}
+
+
+def _init_worker(module_name, registry_spec):
+    _worker['module'] = importlib.import_module(module_name)
+    _worker['registry'] = load_object(registry_spec) \
+        if registry_spec else DEFAULT_REGISTRY
+
+
+def _check_chunk(task):
+    name, seed, count = task
+    schema = getattr(_worker['module'], name)
+    registry = _worker['registry']
+    return _check(name, schema, registry, count, seed=seed)
+
+
+def _tasks(names, count, seed):
+    for name in names:
+        for index, start in enumerate(six.moves.range(0, count, CHUNK_SIZE)):
+            yield name, '%s-%s-%d' % (seed, name, index), \
+                min(CHUNK_SIZE, count - start)
+
+
+def check_module(module, names=None, count=DEFAULT_COUNT, jobs=1, seed=None,
+                 registry=None):
+    """Checks examples of all schemas in a module, optionally in several
+    processes. See :func:`check_schema`.
+
+    :param module: Module or module name.
+    :param list names: Names of schemas to check (default: all public
+        schemas of module).
+    :param int count: Number of examples of each schema to check.
+    :param int jobs: Number of worker processes.
+    :param seed: Random seed for sampler registries.
+    :param str registry: Registry reference, e.g. "mymodule:REGISTRY"
+        (default registry by default).
+    :returns: JSON-serializable dict with keys "ok" (False if any example
+        failed), "schemas" (results of :func:`check_schema` by schema name),
+        "examples", "failures", "time" and "examples_per_second".
+    """
+    module_name = module if isinstance(module, six.string_types) \
+        else module.__name__
+    if names is None:
+        names = [name for name, _ in
+                 schemas_in_module(importlib.import_module(module_name))]
+
+    results = dict((name, CheckResult(name)) for name in names)
+    tasks = _tasks(names, count, seed)
+
+    start = default_timer()
+    if jobs <= 1:
+        _init_worker(module_name, registry)
+        for task in tasks:
+            result = _check_chunk(task)
+            results[result.name].merge(result)
+    else:
+        pool = multiprocessing.Pool(jobs, initializer=_init_worker,
+                                    initargs=(module_name, registry))
+        try:
+            for result in pool.imap_unordered(_check_chunk, tasks):
+                results[result.name].merge(result)
+        finally:
+            pool.terminate()
+    elapsed = default_timer() - start
+
+    examples = sum(result.examples for result in results.values())
+    failures = sum(result.failures for result in results.values())
+    return {
+        'ok': failures == 0,
+        'schemas': dict((name, result.report())
+                        for name, result in six.iteritems(results)),
+        'examples': examples,
+        'failures': failures,
+        'time': elapsed,
+        'examples_per_second': examples / elapsed if elapsed else None,
+    }
@@ -1,23 +1,52 @@
 __all__ = [
     'register',
+    'register_dumped',
     'type_strategy',
+    'fingerprint',
+
+    'Budget',
 
     'new_registry',
+    'new_dumped_registry',
 ]
 
 
 import lollipop.types as lt
 import lollipop.validators as lv
 import lollipop.utils as lu
-import hypothesis.strategies as hs
-import hypothesis.extra.datetime as hsd
+from lollipop.type_registry import TypeRef
+from lollipop_hypothesis.lazy import LazyModule, LazyObject
+from lollipop_hypothesis.instrumentation import Instrumentation, \
+    active_node, set_active_node, instrumented_predicate, instrumented_strategy
+from lollipop_hypothesis.coverage import Coverage
+from lollipop_hypothesis.fingerprint import digest, structural_key
+from lollipop_hypothesis.plugins import PluginConverter, entry_points, \
+    class_name, CONVERTERS_GROUP, DUMPED_CONVERTERS_GROUP
+from lollipop_hypothesis.records import record_class, RECORD_KINDS
+from lollipop_hypothesis.regex import compile_regex, UnsupportedRegex
+from lollipop_hypothesis.unique import CorpusUnique
+from collections import namedtuple, OrderedDict
+from contextlib import contextmanager
+import bisect
 import inspect
 import six
+import threading
+import weakref
+
+# Hypothesis is imported only when strategies are actually created
+hypothesis = LazyModule('hypothesis')
+hs = LazyModule('hypothesis.strategies')
+
 
-try:
-    import hypothesis_regex
-except ImportError:
-    hypothesis_regex = None
+class SchemaError(ValueError):
+    """Raised when schema type can not be converted.
+
+    :param str message: Error message.
+    :param str code: Machine-readable error kind, e.g. "length-conflict".
+    """
+    def __init__(self, message, code='error'):
+        super(SchemaError, self).__init__(message)
+        self.code = code
 
 
 def find_validators(validators, validator_type):
@@ -26,6 +55,12 @@ def find_validators(validators, validator_type):
             if isinstance(validator, validator_type)]
 
 
+def remaining_validators(validators, handled_types):
+    return [validator
+            for validator in validators
+            if not isinstance(validator, handled_types)]
+
+
 def validate_with(v, x, context):
     try:
         v(x, context)
@@ -34,36 +69,386 @@ def validate_with(v, x, context):
         return False
 
 
+def validator_predicate(validator, context=None):
+    if isinstance(validator, lv.Predicate):
+        return lambda x: validator.predicate(x, context)
+
+    return lambda x: validate_with(validator, x, context)
+
+
 def apply_validators(strategy, validators, context=None):
+    node = active_node()
     for validator in validators:
-        if isinstance(validator, lv.Predicate):
-            strategy = strategy.filter(
-                lambda x: validator.predicate(x, context)
-            )
-        else:
-            strategy = strategy.filter(
-                lambda x: validate_with(validator, x, context)
-            )
+        if isinstance(validator, CorpusUnique):
+            # Enforced by registry for all types, see Registry.corpus_unique()
+            continue
+        predicate = validator_predicate(validator, context)
+        if node is not None:
+            predicate = instrumented_predicate(predicate, validator, node)
+        strategy = strategy.filter(predicate)
 
     return strategy
 
 
+def handles_validators(converter):
+    """Marks converter as producing values that satisfy all validators of
+    converted type, so that registry does not need to filter them."""
+    converter.handles_validators = True
+    return converter
+
+
+def with_validators(type, validators):
+    """Returns shallow copy of type with extra validators."""
+    new_type = object.__new__(type.__class__)
+    new_type.__dict__.update(type.__dict__)
+    new_type.validators = lt.ValidatorCollection(validators)
+    new_type.validators._validators[:0] = list(type.validators)
+    return new_type
+
+
+def length_bounds(validators):
+    min_length, max_length = None, None
+    for validator in find_validators(validators, lv.Length):
+        if validator.exact is not None:
+            min_value, max_value = validator.exact, validator.exact
+        else:
+            min_value, max_value = validator.min, validator.max
+
+        if min_value is not None:
+            min_length = min_value \
+                if min_length is None else max([min_length, min_value])
+        if max_value is not None:
+            max_length = max_value \
+                if max_length is None else min([max_length, max_value])
+
+    if min_length is not None and max_length is not None:
+        if min_length > max_length:
+            raise SchemaError('Invalid settings for length validators',
+                              'length-conflict')
+
+    return min_length, max_length
+
+
+def collection_item_types(type):
+    """Returns types making up one item of variadic collection type or None
+    if type is not a variadic collection."""
+    if isinstance(type, lt.List):
+        return [type.item_type]
+    if isinstance(type, lt.Dict) and \
+            getattr(type.value_types, 'default', None):
+        return [type.key_type, type.value_types.default]
+    return None
+
+
+def min_leaves(type, seen=frozenset()):
+    """Returns number of scalar values that has to be reserved for any value
+    of given type: the largest of smallest values of its alternatives."""
+    if type is None or id(type) in seen:
+        return 0
+    seen = seen | set([id(type)])
+
+    if isinstance(type, TypeRef):
+        return min_leaves(type.inner_type, seen)
+    if isinstance(type, lt.Optional):
+        return max([1, min_leaves(type.inner_type, seen)])
+    if isinstance(type, lt.Modifier):
+        return min_leaves(type.inner_type, seen)
+    if isinstance(type, lt.OneOf):
+        types = type.types
+        types = list(types.values()) if hasattr(types, 'values') else types
+        return max([0] + [min_leaves(t, seen) for t in types])
+    if isinstance(type, lt.Tuple):
+        return sum(min_leaves(t, seen) for t in type.item_types)
+    if isinstance(type, lt.Object):
+        return sum(min_leaves(field.field_type, seen)
+                   for field in type.fields.values())
+
+    item_types = collection_item_types(type)
+    if item_types is not None:
+        min_length = length_bounds(type.validators)[0]
+        if not min_length:
+            return 0
+        return min_length * sum(min_leaves(t, seen) for t in item_types)
+    if isinstance(type, lt.Dict):
+        return sum(min_leaves(t, seen)
+                   for _, t in six.iteritems(type.value_types))
+    return 1
+
+
+def range_bounds(validators):
+    min_value, max_value = None, None
+    for validator in find_validators(validators, lv.Range):
+        if validator.min is not None:
+            min_value = validator.min \
+                if min_value is None else max([min_value, validator.min])
+        if validator.max is not None:
+            max_value = validator.max \
+                if max_value is None else min([max_value, validator.max])
+
+    if min_value is not None and max_value is not None:
+        if min_value > max_value:
+            raise SchemaError('Invalid settings for range validators',
+                              'range-conflict')
+
+    return min_value, max_value
+
+
+def range_kwargs(validators):
+    min_value, max_value = range_bounds(validators)
+    kwargs = {}
+    if min_value is not None:
+        kwargs['min_value'] = min_value
+    if max_value is not None:
+        kwargs['max_value'] = max_value
+    return kwargs
+
+
+def excluded_values(validators):
+    return [value
+            for validator in find_validators(validators, lv.NoneOf)
+            for value in validator.values]
+
+
+def regex_generator(validators):
+    """Returns generator of strings matching the first Regexp validator and
+    Length validators along with validators that are left to be checked,
+    or None if there are no Regexp validators or regular expression is not
+    supported."""
+    regex_validators = find_validators(validators, lv.Regexp)
+    if not regex_validators:
+        return None
+
+    validator = regex_validators[0]
+    min_length, max_length = length_bounds(validators)
+    try:
+        generator = compile_regex(validator.regexp, min_length=min_length,
+                                  max_length=max_length)
+    except UnsupportedRegex:
+        return None
+    except ValueError as e:
+        raise SchemaError(str(e), 'regex-conflict')
+
+    return generator, [v for v in validators
+                       if v is not validator and not isinstance(v, lv.Length)]
+
+
+class DrawRandom(object):
+    """Adapts Hypothesis draw function to the part of :class:`random.Random`
+    interface used by regular expression generators, so that generated
+    strings can be shrunk."""
+    def __init__(self, draw):
+        self._draw = draw
+
+    def choice(self, values):
+        return values[self.randint(0, len(values) - 1)]
+
+    def randint(self, a, b):
+        return self._draw(hs.integers(min_value=a, max_value=b))
+
+
+def regex_strategy(generator):
+    @hs.composite
+    def strings(draw):
+        return generator(DrawRandom(draw))
+
+    return strings()
+
+
+def optional_allows_none(type, context=None):
+    return type.load_default(context) is None
+
+
+def allowed_choices(type, context=None):
+    any_of_validators = find_validators(type.validators, lv.AnyOf)
+    other_validators = remaining_validators(type.validators, lv.AnyOf)
+
+    choices = []
+    for choice in any_of_validators[0].choices:
+        if choice in choices:
+            continue
+        if not all(choice in validator.choices
+                   for validator in any_of_validators[1:]):
+            continue
+        if not all(validate_with(validator, choice, context)
+                   for validator in other_validators):
+            continue
+        choices.append(choice)
+
+    return choices
+
+
+def cumulative_weights(weights):
+    totals, total = [], 0
+    for weight in weights:
+        total += weight
+        totals.append(total)
+    return totals
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'size'])
+
+# Default maximum number of nested values of the same recursive type
+DEFAULT_RECURSION_DEPTH = 3
+
+
+class ConversionFrame(object):
+    """Type being converted along with recursive types it refers to,
+    converter used and digests of its converted children."""
+    def __init__(self, type, recursive=False):
+        self.type = type
+        self.recursive = recursive
+        self.refs = set()
+        self.converter = None
+        self.children = []
+
+
+class Budget(namedtuple('Budget', ['max_leaves', 'max_size', 'max_depth'])):
+    """Limits on size of generated values.
+
+    :param int max_leaves: Maximum number of scalar values in one generated
+        value, unless its type requires more of them. Leaves left after the
+        smallest value of a collection are split evenly between its items,
+        and variadic collections are shortened so that each item gets at
+        least as many leaves as its smallest value requires.
+    :param max_size: Maximum size of variadic collections. Either a number or
+        a list of numbers for each nesting depth (the last one is used for
+        deeper collections).
+    :param int max_depth: Maximum nesting depth of collections. Variadic
+        collections deeper than that are generated empty.
+    """
+    def __new__(cls, max_leaves=None, max_size=None, max_depth=None):
+        return super(Budget, cls).__new__(cls, max_leaves, max_size, max_depth)
+
+    def size_limit(self, depth, leaves):
+        limits = []
+        if self.max_depth is not None and depth >= self.max_depth:
+            limits.append(0)
+        if self.max_size is not None:
+            if isinstance(self.max_size, six.integer_types):
+                limits.append(self.max_size)
+            else:
+                limits.append(self.max_size[min(depth, len(self.max_size) - 1)])
+        if leaves is not None:
+            limits.append(leaves)
+
+        return min(limits) if limits else None
+
+
 class Registry(object):
     def __init__(self):
         self._converters = {}
-        self._type_converters = []
+        # Class (or plugin class name) -> (registration order, converter)
+        self._type_index = {}
+        self._plugin_index = {}
+        self._type_order = 0
+        self._dispatch_cache = {}
+        self._cache = {}
+        self._cache_refs = {}
+        # Type -> structural key (or None if type can not be shared)
+        self._type_keys = weakref.WeakKeyDictionary()
+        self._shapes = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._instrumentation = None
+        self._coverage = None
+        self._analysis = None
+        self._local = threading.local()
+        self._parent = None
+        # Number of changes of registered converters, so that children can
+        # tell when their caches become stale
+        self._version = 0
+        self._parent_versions = ()
+        self.budget = None
+        self.max_recursion_depth = DEFAULT_RECURSION_DEPTH
+        self.recursion_branching = None
+        self.object_records = None
+        self.profile = None
 
     def __copy__(self):
-        registry = self.__class__()
-
-        for k, v in six.iteritems(self._converters):
-            registry.register(k, v)
-
-        for k, v in self._type_converters:
-            registry.register(k, v)
+        registry = self._new_layer(self._parent)
+        # Copy collects its own reports, if any
+        registry._instrumentation = registry._coverage = None
+        registry._analysis = None
+        registry._converters = dict(self._converters)
+        registry._type_index = dict(self._type_index)
+        registry._plugin_index = dict(self._plugin_index)
+        registry._type_order = self._type_order
+        return registry
 
+    def _new_layer(self, parent):
+        registry = self.__class__()
+        registry._parent = parent
+        registry.budget = self.budget
+        registry.max_recursion_depth = self.max_recursion_depth
+        registry.recursion_branching = self.recursion_branching
+        registry.object_records = self.object_records
+        registry.profile = self.profile
+        # Schemas converted by children (e.g. overrides) are reported along
+        # with the ones converted by this registry
+        registry._instrumentation = self._instrumentation
+        registry._coverage = self._coverage
+        registry._analysis = self._analysis
         return registry
 
+    def child(self):
+        """Returns registry that falls through to this registry for all
+        converters not registered in it. Creating a child is cheap: nothing is
+        copied, only settings like budget are inherited. Instrumentation,
+        coverage and analysis enabled in this registry collect reports of
+        the child too.
+
+        Child registry has its own cache, which is cleared when converters
+        of any of its parents change.
+        """
+        return self._new_layer(self)
+
+    @contextmanager
+    def override(self, type_or_class, converter):
+        """Context manager that makes registry use given converter instead
+        of registered one, in current thread only. Yields child registry
+        the converter is registered in::
+
+            with DEFAULT_REGISTRY.override(Email, email_strategy):
+                strategy = type_strategy(USER)
+        """
+        overrides = self._overrides()
+        registry = (overrides[-1] if overrides else self).child()
+        registry.register(type_or_class, converter)
+        overrides.append(registry)
+        try:
+            yield registry
+        finally:
+            overrides.pop()
+
+    def _overrides(self):
+        if not hasattr(self._local, 'overrides'):
+            self._local.overrides = []
+        return self._local.overrides
+
+    def _active_registry(self):
+        overrides = getattr(self._local, 'overrides', None)
+        return overrides[-1] if overrides else self
+
+    def _check_parent_versions(self):
+        versions = []
+        parent = self._parent
+        while parent is not None:
+            versions.append(parent._version)
+            parent = parent._parent
+        versions = tuple(versions)
+
+        if versions != self._parent_versions:
+            self.clear_cache()
+            self._parent_versions = versions
+
+    def _instance_converter(self, type):
+        registry = self
+        while registry is not None:
+            if type in registry._converters:
+                return registry._converters[type]
+            registry = registry._parent
+        return None
+
     def register(self, type_or_class, converter):
         if not callable(converter):
             raise ValueError('Converter should be callable')
@@ -71,157 +456,835 @@ class Registry(object):
         if isinstance(type_or_class, lt.Type):
             self._converters[type_or_class] = converter
         elif inspect.isclass(type_or_class) and issubclass(type_or_class, lt.Type):
-            self._type_converters.insert(0, (type_or_class, converter))
+            self._type_order += 1
+            self._type_index[type_or_class] = (self._type_order, converter)
         else:
             raise ValueError('Type should be schema type or schema type class')
 
-    def convert(self, type, context=None):
-        if type in self._converters:
-            return self._converters[type](self, type, context=context)
-
-        any_of_validators = find_validators(type.validators, lv.AnyOf)
-        if any_of_validators:
-            allowed_values = set(any_of_validators[0].choices)
-            for validator in any_of_validators[1:]:
-                allowed_values = allowed_values.intersection(set(validator.choices))
+        self._version += 1
+        self.clear_cache()
+
+    def register_plugin(self, class_name, reference):
+        """Registers converter for type class with given name without
+        importing either of them. Converter is imported when a type of that
+        class (or its subclass) is converted for the first time.
+
+        :param str class_name: Fully qualified type class name,
+            e.g. "mypackage.types.Email".
+        :param str reference: Converter reference,
+            e.g. "mypackage.testing:email_strategy".
+        """
+        self._type_order += 1
+        self._plugin_index[class_name] = \
+            (self._type_order, PluginConverter(reference))
+        self._version += 1
+        self.clear_cache()
+
+    def load_plugins(self, group):
+        """Registers converters declared in given entry point group by
+        installed packages, see :meth:`register_plugin`."""
+        for class_name, reference in entry_points(group):
+            self.register_plugin(class_name, reference)
+
+    def cache_info(self):
+        return CacheInfo(self._cache_hits, self._cache_misses, len(self._cache))
+
+    def clear_cache(self):
+        self._cache.clear()
+        self._cache_refs.clear()
+        self._type_keys.clear()
+        self._shapes.clear()
+        self._dispatch_cache.clear()
+
+    def enable_instrumentation(self):
+        self._instrumentation = Instrumentation()
+        self.clear_cache()
+
+    def disable_instrumentation(self):
+        self._instrumentation = None
+        self.clear_cache()
+
+    def instrumentation_report(self):
+        if self._instrumentation is None:
+            return {}
+        return self._instrumentation.report()
+
+    def enable_coverage(self, guided=True):
+        """Starts tracking which branches of schema types generate values:
+        alternatives of OneOf types, AnyOf choices and Optional values being
+        None or not. See :meth:`coverage_report`.
+
+        :param bool guided: If True, samplers choose branches that did not
+            generate any values yet instead of random ones until all branches
+            are covered, so that all branches are covered with fewer
+            examples. Hypothesis strategies only count branches, since test
+            cases have to generate the same values when replayed.
+        """
+        self._coverage = Coverage(guided)
+        self.clear_cache()
+
+    def disable_coverage(self):
+        self._coverage = None
+        self.clear_cache()
+
+    def coverage_report(self):
+        """Returns dict with numbers of "covered" and "total" branches, their
+        "ratio" and "nodes" dict mapping type paths to numbers of values
+        generated by each branch of that type."""
+        if self._coverage is None:
+            return {}
+        return self._coverage.report()
+
+    def set_budget(self, budget):
+        """Limits size of generated values, see :class:`Budget`.
+        Pass None to remove limits."""
+        self.budget = budget
+        self.clear_cache()
+
+    def set_recursion_limit(self, max_depth, branching=None):
+        """Limits expansion of recursive (self-referencing) types.
+
+        :param int max_depth: Maximum number of nested values of the same type.
+            Deeper references generate no values, so they should be optional
+            (e.g. list items or :class:`~lollipop.types.Optional`).
+        :param int branching: Maximum size of collections containing
+            recursive values (unless Length validators require more).
+        """
+        self.max_recursion_depth = max_depth
+        self.recursion_branching = branching
+        self.clear_cache()
+
+    def set_object_records(self, kind):
+        """Makes objects without constructor to be generated as instances
+        of compact record classes instead of :class:`~lollipop.utils.OpenStruct`.
+        A class is created once for each object type, with attributes named
+        after its fields.
+
+        :param str kind: "slots" for classes with ``__slots__``, "tuple" for
+            named tuples or None for OpenStruct.
+        """
+        if kind is not None and kind not in RECORD_KINDS:
+            raise ValueError('Unknown record kind: %s' % kind)
+        self.object_records = kind
+        self.clear_cache()
+
+    def set_profile(self, profile):
+        """Makes registry generate values with distributions learned from
+        sample data (see :func:`~lollipop_hypothesis.profiles.learn_profile`)
+        instead of uniform ones: lengths of strings and lists, values of
+        numbers, OneOf alternatives and Optional values being None. Values
+        still satisfy validators of their types. Pass None to generate
+        uniform values again.
+
+        Distributions are applied to types with the same paths inside
+        converted schema as in the schema they were learned from, and only
+        to types whose converters handle validators themselves.
+        """
+        self.profile = profile
+        self.clear_cache()
+
+    def set_analysis(self, analysis):
+        """Makes registry record conversion errors and types that can not
+        generate any values into given
+        :class:`~lollipop_hypothesis.analysis.Analysis` instead of raising
+        on the first error, so that all problems of a schema are found.
+        Pass None to raise errors again.
+        """
+        self._analysis = analysis
+        self.clear_cache()
+
+    def object_constructor(self, type):
+        """Returns constructor for values of object type."""
+        if type.constructor:
+            return type.constructor
+
+        if self.object_records is not None:
+            constructor = record_class(type, self.object_records)
+            if constructor is not None:
+                return constructor
+
+        return lambda **kwargs: lu.OpenStruct(kwargs)
+
+    def _frames(self):
+        if not hasattr(self._local, 'frames'):
+            self._local.frames = []
+        return self._local.frames
+
+    def limit_branching(self, min_length, max_length):
+        """Returns collection size bounds limited by recursion branching if
+        collection items being converted refer to recursive types."""
+        frames = self._frames()
+        if self.recursion_branching is None or not frames or not frames[-1].refs:
+            return min_length, max_length
+
+        limit = max([min_length or 0, self.recursion_branching])
+        return min_length, limit if max_length is None \
+            else min([max_length, limit])
+
+    def _budget_state(self):
+        # Depth and number of leaves left for value being converted besides
+        # ones reserved for its smallest value, see min_leaves()
+        state = getattr(self._local, 'budget_state', None)
+        if state is not None:
+            return state
+
+        leaves = self.budget.max_leaves
+        if leaves is not None:
+            leaves = max([0, leaves - min_leaves(self._frames()[-1].type)])
+        return 0, leaves
+
+    def size_bounds(self, validators):
+        """Returns bounds for size of variadic collection with given validators
+        limited by registry budget."""
+        min_length, max_length = length_bounds(validators)
+        if self.budget is None:
+            return min_length, max_length
+
+        depth, leaves = self._budget_state()
+        if leaves is not None:
+            # Each item beyond required ones takes leaves reserved for it
+            item_types = collection_item_types(self._frames()[-1].type) or []
+            leaves = (min_length or 0) + leaves // max([
+                1, sum(min_leaves(item_type) for item_type in item_types),
+            ])
+        limit = self.budget.size_limit(depth, leaves)
+        if limit is None:
+            return min_length, max_length
+
+        if min_length is not None and min_length > limit:
+            raise SchemaError(
+                'Length validator requires at least %d items at %s, '
+                'but budget allows at most %d' % (
+                    min_length, self.current_path(), limit,
+                ),
+                'budget-conflict',
+            )
 
+        return min_length, limit if max_length is None \
+            else min([max_length, limit])
+
+    @contextmanager
+    def children(self, count):
+        """Converts children of a collection containing up to given number of
+        items, splitting remaining budget between them."""
+        if self.budget is None:
+            yield
+            return
+
+        state = self._budget_state()
+        depth, leaves = state
+        if leaves is not None and count:
+            type = self._frames()[-1].type
+            item_types = collection_item_types(type)
+            if item_types is not None:
+                # Items beyond required ones are paid from remaining leaves
+                extra = count - (length_bounds(type.validators)[0] or 0)
+                leaves -= max([0, extra]) * sum(
+                    min_leaves(item_type) for item_type in item_types
+                )
+            leaves = max([0, leaves]) // count
+        self._local.budget_state = (depth + 1, leaves)
+        try:
+            yield
+        finally:
+            self._local.budget_state = None if depth == 0 else state
+
+    def _conversion_path(self):
+        if not hasattr(self._local, 'path'):
+            self._local.path = []
+        return self._local.path
+
+    def current_path(self):
+        return ''.join(self._conversion_path())
+
+    def find_converter(self, type_class):
+        if type_class in self._dispatch_cache:
+            return self._dispatch_cache[type_class]
+
+        # The most recently registered class in type's MRO wins, which is
+        # the same as taking the first isinstance() match in the list of
+        # registered classes ordered from the newest
+        best_order, converter = 0, None
+        for klass in inspect.getmro(type_class):
+            candidates = [self._type_index.get(klass, (0, None))]
+            if self._plugin_index:
+                candidates.append(self._plugin_index.get(class_name(klass),
+                                                         (0, None)))
+            for order, klass_converter in candidates:
+                if order > best_order:
+                    best_order, converter = order, klass_converter
+
+        if converter is None and self._parent is not None:
+            converter = self._parent.find_converter(type_class)
+
+        self._dispatch_cache[type_class] = converter
+        return converter
+
+    def convert(self, type, context=None, name=None):
+        registry = self._active_registry()
+        if registry is not self:
+            return registry.convert(type, context=context, name=name)
+
+        # Name is a path segment of converted type inside its parent type,
+        # e.g. ".field" for object fields or "[]" for list items.
+        path = self._conversion_path()
+        if not path:
+            if self._parent is not None:
+                self._check_parent_versions()
+            path.append(type.name or type.__class__.__name__)
+        else:
+            path.append(name if name is not None
+                        else '<%s>' % type.__class__.__name__)
+
+        try:
+            return self._cached_convert(type, context=context)
+        finally:
+            path.pop()
+
+    def fingerprint(self, type, context=None):
+        """Returns digest of type structure which stays the same between runs
+        and changes whenever values generated for type can change: when any
+        nested type, its validators or converter change.
+        """
+        registry = self._active_registry()
+        if registry is not self:
+            return registry.fingerprint(type, context=context)
+
+        frames = self._frames()
+        root = ConversionFrame(None)
+        frames.append(root)
+        try:
+            self.convert(type, context=context)
+        finally:
+            frames.pop()
+
+        return digest(self.__class__, root.children, context, self.budget,
+                      self.max_recursion_depth, self.recursion_branching,
+                      self.object_records, self.profile)
+
+    def _cached_convert(self, type, context=None):
+        frames = self._frames()
+        previous = [idx for idx, frame in enumerate(frames) if frame.type is type]
+        # Type refers to itself, unless it is just a part of a cycle of
+        # another type that is already being expanded again
+        recursive = bool(previous) and \
+            not any(frame.recursive for frame in frames[previous[-1] + 1:])
+        if recursive:
+            # Recursive type is expanded again until recursion limit is
+            # reached and then generates no values
+            frames[-1].refs.add(type)
+            if len(previous) >= self.max_recursion_depth:
+                frames[-1].children.append('recursion-limit')
+                return self.nothing()
+
+        key = (self._shared_key(type), context)
+        if self._instrumentation is not None or self._coverage is not None \
+                or self.profile is not None:
+            # Instrumented and profiled strategies are bound to a particular
+            # tree node
+            key += (self.current_path(),)
+        if self.budget is not None:
+            # Strategies are bound to budget left at particular depth. At the
+            # top level the whole budget is left for any type.
+            key += getattr(self._local, 'budget_state', None) or (0,)
+
+        try:
+            refs = self._cache_refs.get(key)
+        except TypeError:
+            # Unhashable context, e.g. a dict: can not be cached
+            return self._expand(type, recursive, context=context)[0]
+
+        # Strategies of types referring to recursive types depend on how
+        # many times those types are already being expanded
+        if refs is not None:
+            cached = self._cache.get(key + (self._recursion_state(refs),))
+            if cached is not None:
+                self._cache_hits += 1
+                strategy, node_digest = cached
+                if frames:
+                    frames[-1].children.append(node_digest)
+                return strategy
+
+        self._cache_misses += 1
+        strategy, refs, node_digest = \
+            self._expand(type, recursive, context=context)
+        self._cache_refs[key] = refs
+        self._cache[key + (self._recursion_state(refs),)] = \
+            (strategy, node_digest)
+        return strategy
+
+    def _shared_key(self, type):
+        # Structurally equal types (e.g. repeated
+        # String(validate=Length(max=255)) fields) share one cache entry and
+        # thus one strategy instance. Types referring to other types by
+        # reference are cached by identity, since they may be recursive.
+        key = self._type_keys.get(type, False)
+        if key is False:
+            try:
+                key = self._structural_key(type, set())
+            except TypeError:
+                key = self._type_keys[type] = None
+        return type if key is None else key
+
+    def _structural_key(self, type, seen):
+        key = self._type_keys.get(type, False)
+        if key is not False:
+            if key is None:
+                raise TypeError('Type can not be shared')
+            return key
+
+        if isinstance(type, TypeRef) or id(type) in seen:
+            raise TypeError('Type can not be shared')
+        seen.add(id(type))
+        try:
+            # Instance converters apply to particular type instances only
+            shape = (type.__class__, self._instance_converter(type),
+                     structural_key(vars(type), lambda t:
+                                    self._structural_key(t, seen)))
+        finally:
+            seen.discard(id(type))
+
+        # Each distinct shape gets a small key, so keys of parent types
+        # are cheap to hash and compare
+        key = self._type_keys[type] = \
+            self._shapes.setdefault(shape, ('shape', len(self._shapes)))
+        return key
+
+    def _recursion_state(self, types):
+        frames = self._frames()
+        return tuple(len([frame for frame in frames if frame.type is type])
+                     for type in types)
+
+    def _expand(self, type, recursive, context=None):
+        frames = self._frames()
+        frame = ConversionFrame(type, recursive)
+        frames.append(frame)
+        try:
+            strategy = self._instrumented_convert(type, context=context)
+        except ValueError as e:
+            if self._analysis is None:
+                raise
+            # Collect all problems instead of stopping on the first one
+            self._analysis.record_error(self.current_path(), type, e)
+            strategy = self.nothing()
+        else:
+            if self._analysis is not None and self.is_empty(strategy):
+                self._analysis.record_empty(self.current_path(), type)
+        finally:
+            frames.pop()
+
+        # Digest covers everything generated values depend on: type
+        # attributes, converter and converted children
+        node_digest = digest(type.__class__, frame.converter, vars(type),
+                             frame.children)
+        if frames:
+            frames[-1].refs.update(frame.refs)
+            frames[-1].children.append(node_digest)
+        return strategy, tuple(frame.refs), node_digest
+
+    def _instrumented_convert(self, type, context=None):
+        if self._instrumentation is None:
+            return self._convert(type, context=context)
+
+        node = self._instrumentation.node(self.current_path(),
+                                          type.__class__.__name__)
+        previous_node = active_node()
+        set_active_node(node)
+        try:
+            strategy = self._convert(type, context=context)
+        finally:
+            set_active_node(previous_node)
+
+        return self.instrumented(strategy, node)
+
+    def sampled_from(self, values):
+        if len(values) == 1:
+            return hs.just(values[0])
+
+        return hs.sampled_from(values)
+
+    def sampled_choices(self, type, values, context=None):
+        if self._coverage is None:
+            return self.sampled_from(values)
+
+        return self.branches([(repr(value), self.sampled_from([value]))
+                              for value in values])
+
+    def branches(self, labeled):
+        """Returns strategy generating values of one of given strategies,
+        e.g. alternatives of OneOf type. Branches are tracked (and chosen
+        based on coverage) if coverage is enabled. Otherwise, if registry has
+        a profile, branches are chosen as often as in profiled data.
+
+        :param list labeled: List of (label, strategy) tuples.
+        """
+        labeled = [(six.text_type(label), strategy)
+                   for label, strategy in labeled
+                   if not self.is_empty(strategy)]
+        if self._coverage is None:
+            weights = None if self.profile is None else \
+                self.profile.branch_weights(self.current_path(),
+                                            [label for label, _ in labeled])
+            if weights is not None:
+                # Branches never seen in profiled data are not generated
+                weighted = [(strategy, weight)
+                            for (_, strategy), weight in zip(labeled, weights)
+                            if weight]
+                return self.weighted_one_of(
+                    [strategy for strategy, _ in weighted],
+                    [weight for _, weight in weighted],
+                )
+            return self.one_of([strategy for _, strategy in labeled])
+        if not labeled:
+            return self.nothing()
+
+        node = self._coverage.node(
+            self.current_path(), self._frames()[-1].type.__class__.__name__,
+            [label for label, _ in labeled],
+        )
+        return self.covered_one_of(node, labeled)
+
+    def one_of(self, strategies):
+        return hs.one_of(*strategies)
+
+    def weighted_one_of(self, strategies, weights):
+        """Returns strategy generating values of one of given strategies,
+        chosen with probabilities proportional to given integer weights."""
+        if len(strategies) == 1:
+            return strategies[0]
+
+        totals = cumulative_weights(weights)
+
+        @hs.composite
+        def choose(draw):
+            index = bisect.bisect_right(totals, draw(hs.integers(
+                min_value=0, max_value=totals[-1] - 1,
+            )))
+            return draw(strategies[index])
+
+        return choose()
+
+    def covered_one_of(self, node, labeled):
+        """Returns strategy generating values of one of given strategies and
+        counting values of each branch in given coverage node.
+
+        Hypothesis replays test cases from their buffers while shrinking, so
+        choices can not depend on coverage collected so far: branches are
+        only counted here, not guided.
+        """
+        def counted(label, strategy):
+            def record(value):
+                node.record(label)
+                return value
+            return strategy.map(record)
+
+        return self.one_of([counted(label, strategy)
+                            for label, strategy in labeled])
+
+    def corpus_unique(self, strategy, validator, type):
+        """Returns strategy generating values unique within a corpus, see
+        :class:`~lollipop_hypothesis.unique.CorpusUnique`.
+
+        Hypothesis generates independent test cases and replays them while
+        shrinking, so values are not tracked here; use a sampler registry to
+        generate corpora.
+        """
+        return strategy
+
+    def nothing(self):
+        return hs.nothing()
+
+    def is_empty(self, strategy):
+        return strategy.is_empty
+
+    def examples(self, strategy, count):
+        """Returns list of given number of values generated by strategy."""
+        examples = []
+
+        health_checks = hypothesis.HealthCheck
+
+        @hypothesis.settings(
+            max_examples=count, database=None,
+            suppress_health_check=[health_checks.too_slow,
+                                   health_checks.filter_too_much,
+                                   health_checks.data_too_large],
+        )
+        @hypothesis.given(strategy)
+        def collect(value):
+            examples.append(value)
+
+        collect()
+        return examples
+
+    def instrumented(self, strategy, node):
+        if strategy.is_empty:
+            # Keep empty strategies recognizable, e.g. to generate empty lists
+            return strategy
+        return instrumented_strategy(strategy, node)
+
+    def _convert(self, type, context=None):
+        strategy = self._convert_type(type, context=context)
+        for validator in find_validators(type.validators, CorpusUnique):
+            strategy = self.corpus_unique(strategy, validator, type)
+        return strategy
+
+    def _convert_type(self, type, context=None):
+        frame = self._frames()[-1]
+        converter = self._instance_converter(type)
+        if converter is not None:
+            frame.converter = converter
+            return converter(self, type, context=context)
+
+        if find_validators(type.validators, lv.AnyOf):
+            # Choices are checked against all other validators upfront,
+            # so there is nothing left to filter
+            allowed_values = allowed_choices(type, context=context)
             if not allowed_values:
-                raise ValueError('Type %s does not match any value' % type)
-
-            if len(allowed_values) == 1:
-                return hs.just(list(allowed_values)[0])
-
-            return hs.one_of(map(hs.just, allowed_values))
-
-        for type_class, converter in self._type_converters:
-            if isinstance(type, type_class):
-                strategy = converter(self, type, context=context)
-                return apply_validators(strategy, type.validators)
+                raise SchemaError('Type %s does not match any value' % type,
+                                  'no-choices')
+
+            frame.converter = 'choices'
+            return self.sampled_choices(type, allowed_values, context=context)
+
+        converter = frame.converter = self.find_converter(type.__class__)
+        if converter is None:
+            raise SchemaError('Unsupported type: %s' % type.__class__.__name__,
+                              'unsupported-type')
+
+        if getattr(converter, 'handles_validators', False):
+            if self.profile is not None:
+                strategy = self._profiled_convert(converter, type,
+                                                  context=context)
+                if strategy is not None:
+                    return strategy
+            return converter(self, type, context=context)
+
+        strategy = converter(self, type, context=context)
+
+        return apply_validators(strategy, type.validators, context=context)
+
+    def _profiled_convert(self, converter, type, context=None):
+        # Values are generated from bins of profiled histogram, each bin
+        # being converted as the type with an extra validator limiting
+        # values to the bin, so that all other validators are still handled
+        constraints = self.profile.constraints(self.current_path(), type)
+        strategies, weights = [], []
+        for validator, count in constraints:
+            try:
+                strategy = converter(
+                    self, with_validators(type, [validator]), context=context,
+                )
+            except ValueError:
+                # E.g. bins of lengths that budget does not allow
+                continue
+            if not self.is_empty(strategy):
+                strategies.append(strategy)
+                weights.append(count)
+
+        if not strategies:
+            return None
+        return self.weighted_one_of(strategies, weights)
+
+    def convert_validated(self, type, validators, context=None, name=None):
+        if not validators:
+            return self.convert(type, context=context, name=name)
+
+        if self._instance_converter(type) is not None:
+            return apply_validators(
+                self.convert(type, context=context, name=name),
+                validators, context=context,
+            )
 
-        raise ValueError('Unsupported type')
+        return self.convert(with_validators(type, validators),
+                            context=context, name=name)
 
 
 def any_strategy(registry, type, context=None):
     return hs.text()
 
 
+@handles_validators
 def string_strategy(registry, type, context=None):
-    if hypothesis_regex:
-        regex_validators = find_validators(type.validators, lv.Regexp)
-        if regex_validators:
-            validator = regex_validators[0]
-            return hypothesis_regex.regex(validator.regexp)
+    regex = regex_generator(type.validators)
+    if regex is not None:
+        generator, validators = regex
+        return apply_validators(regex_strategy(generator), validators,
+                                context=context)
 
-    length_validators = find_validators(type.validators, lv.Length)
-    min_length, max_length = None, None
-    for validator in length_validators:
-        if validator.exact is not None or validator.min is not None:
-            value = validator.exact or validator.min
-            min_length = value if min_length is None else max([min_length, value])
-        if validator.exact is not None or validator.max is not None:
-            value = validator.exact or validator.min
-            max_length = value if max_length is None else min([max_length, value])
+    min_length, max_length = length_bounds(type.validators)
+    return apply_validators(
+        hs.text(min_size=min_length, max_size=max_length),
+        remaining_validators(type.validators, lv.Length),
+        context=context,
+    )
 
-    if min_length is not None and max_length is not None:
-        if min_length > max_length:
-            raise ValueError('Invalid settings for length validators')
 
-    return hs.text(min_size=min_length, max_size=max_length)
+# Integer ranges up to this size are enumerated to exclude NoneOf values
+# without filtering
+MAX_ENUMERATED_RANGE = 1000
 
 
+@handles_validators
 def integer_strategy(registry, type, context=None):
-    range_validators = find_validators(type.validators, lv.Range)
-    min_value, max_value = None, None
-    for validator in range_validators:
-        if validator.min is not None:
-            min_value = validator.min \
-                if min_value is None else max([min_value, validator.min])
-        if validator.max is not None:
-            max_value = validator.max \
-                if max_value is None else min([max_value, validator.max])
+    min_value, max_value = range_bounds(type.validators)
+    excluded = excluded_values(type.validators)
+
+    if excluded and min_value is not None and max_value is not None \
+            and max_value - min_value < MAX_ENUMERATED_RANGE:
+        values = [x for x in six.moves.range(min_value, max_value + 1)
+                  if x not in excluded]
+        if not values:
+            raise SchemaError('Type %s does not match any value' % type,
+                              'no-choices')
+
+        return apply_validators(
+            hs.sampled_from(values),
+            remaining_validators(type.validators, (lv.Range, lv.NoneOf)),
+            context=context,
+        )
 
-    return hs.integers(min_value=min_value, max_value=max_value)
+    return apply_validators(
+        hs.integers(min_value=min_value, max_value=max_value),
+        remaining_validators(type.validators, lv.Range),
+        context=context,
+    )
 
 
+@handles_validators
 def float_strategy(registry, type, context=None):
-    range_validators = find_validators(type.validators, lv.Range)
-    min_value, max_value = None, None
-    for validator in range_validators:
-        if validator.min is not None:
-            min_value = validator.min \
-                if min_value is None else max([min_value, validator.min])
-        if validator.max is not None:
-            max_value = validator.max \
-                if max_value is None else min([max_value, validator.max])
-
-    return hs.floats(min_value=min_value, max_value=max_value)
+    min_value, max_value = range_bounds(type.validators)
+    return apply_validators(
+        hs.floats(min_value=min_value, max_value=max_value),
+        remaining_validators(type.validators, lv.Range),
+        context=context,
+    )
 
 
+@handles_validators
 def boolean_strategy(registry, type, context=None):
-    return hs.booleans()
+    excluded = excluded_values(type.validators)
+    values = [x for x in [False, True] if x not in excluded]
+    if not values:
+        raise SchemaError('Type %s does not match any value' % type,
+                          'no-choices')
+
+    return apply_validators(
+        hs.sampled_from(values) if excluded else hs.booleans(),
+        remaining_validators(type.validators, lv.NoneOf),
+        context=context,
+    )
 
 
+@handles_validators
 def datetime_strategy(registry, type, context=None):
-    return hsd.datetimes()
+    return apply_validators(
+        hs.datetimes(**range_kwargs(type.validators)),
+        remaining_validators(type.validators, lv.Range),
+        context=context,
+    )
 
 
+@handles_validators
 def date_strategy(registry, type, context=None):
-    return hsd.dates()
+    return apply_validators(
+        hs.dates(**range_kwargs(type.validators)),
+        remaining_validators(type.validators, lv.Range),
+        context=context,
+    )
 
 
+@handles_validators
 def time_strategy(registry, type, context=None):
-    return hsd.times()
+    return apply_validators(
+        hs.times(**range_kwargs(type.validators)),
+        remaining_validators(type.validators, lv.Range),
+        context=context,
+    )
 
 
+@handles_validators
 def list_strategy(registry, type, context=None):
-    min_length, max_length = None, None
-    for validator in find_validators(type.validators, lv.Length):
-        if validator.exact is not None or validator.min is not None:
-            value = validator.exact or validator.min
-            min_length = value if min_length is None else max([min_length, value])
-        if validator.exact is not None or validator.max is not None:
-            value = validator.exact or validator.min
-            max_length = value if max_length is None else min([max_length, value])
-
-    if min_length is not None and max_length is not None:
-        if min_length > max_length:
-            raise ValueError('Invalid settings for length validators')
-
-    unique_key = None
-    for validator in find_validators(type.validators, lv.Unique):
-        unique_key = validator.key
-
-    item_strategy = registry.convert(type.item_type, context=context)
-    for validator in find_validators(type.validators, lv.Each):
-        item_strategy = apply_validators(item_strategy, validator.validators)
+    min_length, max_length = registry.size_bounds(type.validators)
+
+    # Only one uniqueness key can be enforced by construction
+    unique_validators = find_validators(type.validators, lv.Unique)
+    unique_key = unique_validators[0].key if unique_validators else None
+
+    item_validators = [validator
+                       for each in find_validators(type.validators, lv.Each)
+                       for validator in each.validators]
+    with registry.children(max_length):
+        item_strategy = registry.convert_validated(
+            type.item_type, item_validators, context=context, name='[]',
+        )
+    min_length, max_length = registry.limit_branching(min_length, max_length)
 
-    return hs.lists(item_strategy,
-                    min_size=min_length, max_size=max_length, unique_by=unique_key)
+    return apply_validators(
+        hs.lists(item_strategy, min_size=min_length, max_size=max_length,
+                 unique_by=unique_key),
+        [validator for validator in type.validators
+         if not isinstance(validator, (lv.Length, lv.Each))
+         and validator not in unique_validators[:1]],
+        context=context,
+    )
 
 
 def tuple_strategy(registry, type, context=None):
-    return hs.tuples(*(registry.convert(item_type, context=context)
-                       for item_type in type.item_types))
+    with registry.children(len(type.item_types)):
+        return hs.tuples(*[registry.convert(item_type, context=context,
+                                            name='[%d]' % idx)
+                           for idx, item_type in enumerate(type.item_types)])
 
 
+@handles_validators
 def dict_strategy(registry, type, context=None):
     if getattr(type.value_types, 'default', None):
-        return hs.dictionaries(
-            keys=registry.convert(type.key_type, context=context),
-            values=registry.convert(type.value_types.default, context=context),
+        min_length, max_length = registry.size_bounds(type.validators)
+        with registry.children(max_length):
+            key_strategy = registry.convert(type.key_type, context=context,
+                                            name='{}')
+            value_strategy = registry.convert(type.value_types.default,
+                                              context=context, name='[]')
+        min_length, max_length = \
+            registry.limit_branching(min_length, max_length)
+
+        strategy = hs.dictionaries(
+            keys=key_strategy,
+            values=value_strategy,
+            min_size=min_length,
+            max_size=max_length,
         )
     else:
-        return hs.fixed_dictionaries({
-            k: registry.convert(v, context=context)
-            for k, v in six.iteritems(type.value_types)
-        })
+        min_length, max_length = length_bounds(type.validators)
+        size = len(type.value_types)
+        if (min_length is not None and size < min_length) or \
+                (max_length is not None and size > max_length):
+            raise SchemaError('Invalid settings for length validators',
+                              'length-conflict')
+
+        with registry.children(size):
+            strategy = hs.fixed_dictionaries({
+                k: registry.convert(v, context=context, name='[%r]' % (k,))
+                for k, v in six.iteritems(type.value_types)
+                if not isinstance(v, lt.DumpOnly)
+            })
+
+    return apply_validators(
+        strategy,
+        remaining_validators(type.validators, lv.Length),
+        context=context,
+    )
+
 
 def object_strategy(registry, type, context=None):
-    constructor = type.constructor or (lambda **kwargs: lu.OpenStruct(kwargs))
-    return hs.builds(constructor, **{
-        k: registry.convert(v.field_type, context=context)
-        for k, v in six.iteritems(type.fields)
-    })
+    constructor = registry.object_constructor(type)
+    # Dump-only fields are never loaded, so they are not passed to constructor
+    with registry.children(len(type.fields)):
+        return hs.builds(constructor, **{
+            k: registry.convert(v.field_type, context=context, name='.' + k)
+            for k, v in six.iteritems(type.fields)
+            if not isinstance(v.field_type, lt.DumpOnly)
+        })
 
 
 def constant_strategy(registry, type, context=None):
@@ -230,17 +1293,22 @@ def constant_strategy(registry, type, context=None):
 
 def one_of_strategy(registry, type, context=None):
     types = type.types
-    if hasattr(types, 'values'):
-        types = types.values()
+    if hasattr(types, 'items'):
+        types = list(types.items())
+    else:
+        types = list(enumerate(types))
 
-    return hs.one_of(*[registry.convert(t, context=context) for t in types])
+    return registry.branches([
+        (k, registry.convert(t, context=context, name='|%s' % k))
+        for k, t in types
+    ])
 
 
 def optional_strategy(registry, type, context=None):
-    inner_strategy = registry.convert(type.inner_type, context=context)
-    if type.load_default is not None:
+    inner_strategy = registry.convert(type.inner_type, context=context, name='?')
+    if not optional_allows_none(type, context):
         return inner_strategy
-    return hs.one_of(hs.none(), inner_strategy)
+    return registry.branches([('None', hs.none()), ('value', inner_strategy)])
 
 
 def dump_only_strategy(registry, type, context=None):
@@ -277,13 +1345,237 @@ def new_registry():
         (lt.DumpOnly, dump_only_strategy),
         (lt.LoadOnly, inner_type_strategy),
         (lt.Transform, transform_strategy),
+        (TypeRef, inner_type_strategy),
     ]:
         registry.register(k, v)
 
+    registry.load_plugins(CONVERTERS_GROUP)
     return registry
 
 
-DEFAULT_REGISTRY = new_registry()
+class LoadedValidator(lv.Validator):
+    """Checks dumped data with a validator of the loaded value."""
+    def __init__(self, type, validator):
+        super(LoadedValidator, self).__init__()
+        self.type = type
+        self.validator = validator
+
+    def __call__(self, data, context=None):
+        self.validator(self.type.load(data, context), context)
+
+    def __repr__(self):
+        return repr(self.validator)
+
+
+def apply_loaded_validators(strategy, type, validators, context=None):
+    return apply_validators(
+        strategy, [LoadedValidator(type, v) for v in validators],
+        context=context,
+    )
+
+
+class DumpedRegistry(Registry):
+    """Registry of strategies generating data in the form produced by
+    type's :meth:`dump`, e.g. dicts for objects and strings for dates."""
+    def sampled_choices(self, type, values, context=None):
+        return super(DumpedRegistry, self).sampled_choices(
+            type, [type.dump(value, context) for value in values],
+            context=context,
+        )
+
+
+def dumped_scalar(converter):
+    """Adapts converter of scalar values to produce dumped values.
+
+    Validators are applied before dumping, since they check loaded values.
+    """
+    @handles_validators
+    def dumped_converter(registry, type, context=None):
+        strategy = converter(registry, type, context=context)
+        if not getattr(converter, 'handles_validators', False):
+            strategy = apply_validators(strategy, type.validators,
+                                        context=context)
+        return strategy.map(lambda x: type.dump(x, context))
+
+    return dumped_converter
+
+
+@handles_validators
+def dumped_list_strategy(registry, type, context=None):
+    min_length, max_length = registry.size_bounds(type.validators)
+
+    item_validators = [validator
+                       for each in find_validators(type.validators, lv.Each)
+                       for validator in each.validators]
+    with registry.children(max_length):
+        item_strategy = registry.convert_validated(
+            type.item_type, item_validators, context=context, name='[]',
+        )
+    min_length, max_length = registry.limit_branching(min_length, max_length)
+
+    return apply_loaded_validators(
+        hs.lists(item_strategy, min_size=min_length, max_size=max_length),
+        type, remaining_validators(type.validators, (lv.Length, lv.Each)),
+        context=context,
+    )
+
+
+@handles_validators
+def dumped_tuple_strategy(registry, type, context=None):
+    return apply_loaded_validators(
+        tuple_strategy(registry, type, context=context).map(list),
+        type, type.validators, context=context,
+    )
+
+
+@handles_validators
+def dumped_dict_strategy(registry, type, context=None):
+    if getattr(type.value_types, 'default', None):
+        min_length, max_length = registry.size_bounds(type.validators)
+        with registry.children(max_length):
+            key_strategy = registry.convert(type.key_type, context=context,
+                                            name='{}')
+            value_strategy = registry.convert(type.value_types.default,
+                                              context=context, name='[]')
+        min_length, max_length = \
+            registry.limit_branching(min_length, max_length)
+
+        strategy = hs.dictionaries(
+            keys=key_strategy,
+            values=value_strategy,
+            min_size=min_length,
+            max_size=max_length,
+            dict_class=OrderedDict if type.ordered else dict,
+        )
+        validators = remaining_validators(type.validators, lv.Length)
+    else:
+        strategy = fields_strategy(registry, [
+            (k, v, '[%r]' % (k,)) for k, v in six.iteritems(type.value_types)
+        ], ordered=type.ordered, context=context)
+        validators = type.validators
+
+    return apply_loaded_validators(strategy, type, validators, context=context)
+
+
+def fields_strategy(registry, fields, ordered=False, context=None):
+    # Load-only fields are never dumped
+    fields = [(k, field_type, name) for k, field_type, name in fields
+              if not isinstance(field_type, lt.LoadOnly)]
+    with registry.children(len(fields)):
+        fields = [(k, registry.convert(field_type, context=context, name=name))
+                  for k, field_type, name in fields]
+    dict_class = OrderedDict if ordered else dict
+
+    return hs.tuples(*[strategy for _, strategy in fields]).map(
+        lambda values: dict_class(zip([k for k, _ in fields], values))
+    )
+
+
+@handles_validators
+def dumped_object_strategy(registry, type, context=None):
+    return apply_loaded_validators(
+        fields_strategy(registry, [
+            (k, v.field_type, '.' + k) for k, v in six.iteritems(type.fields)
+        ], ordered=type.ordered, context=context),
+        type, type.validators, context=context,
+    )
+
+
+@handles_validators
+def dumped_one_of_strategy(registry, type, context=None):
+    return apply_loaded_validators(
+        one_of_strategy(registry, type, context=context),
+        type, type.validators, context=context,
+    )
+
+
+def dumped_optional_strategy(registry, type, context=None):
+    inner_strategy = registry.convert(type.inner_type, context=context, name='?')
+    if not optional_allows_none(type, context):
+        return inner_strategy
+    return registry.branches([('None', hs.just(type.dump(None, context))),
+                              ('value', inner_strategy)])
+
+
+def dumped_transform_strategy(registry, type, context=None):
+    return registry.convert(type.inner_type, context=context)\
+        .map(lambda x: type.post_dump(x, context))
+
+
+def new_dumped_registry():
+    registry = DumpedRegistry()
+    for k, v in [
+        (lt.Any, dumped_scalar(any_strategy)),
+        (lt.String, dumped_scalar(string_strategy)),
+        (lt.Integer, dumped_scalar(integer_strategy)),
+        (lt.Float, dumped_scalar(float_strategy)),
+        (lt.Boolean, dumped_scalar(boolean_strategy)),
+        (lt.DateTime, dumped_scalar(datetime_strategy)),
+        (lt.Date, dumped_scalar(date_strategy)),
+        (lt.Time, dumped_scalar(time_strategy)),
+        (lt.List, dumped_list_strategy),
+        (lt.Tuple, dumped_tuple_strategy),
+        (lt.Dict, dumped_dict_strategy),
+        (lt.Object, dumped_object_strategy),
+        (lt.Constant, dumped_scalar(constant_strategy)),
+        (lt.OneOf, dumped_one_of_strategy),
+        (lt.Optional, dumped_optional_strategy),
+        (lt.DumpOnly, inner_type_strategy),
+        (lt.LoadOnly, dump_only_strategy),
+        (lt.Transform, dumped_transform_strategy),
+        (TypeRef, inner_type_strategy),
+    ]:
+        registry.register(k, v)
+
+    registry.load_plugins(DUMPED_CONVERTERS_GROUP)
+    return registry
+
+
+# Default registries are created on first use to keep import cheap
+DEFAULT_REGISTRY = LazyObject(new_registry)
+DEFAULT_DUMPED_REGISTRY = LazyObject(new_dumped_registry)
+
+
+def register(type_or_class, converter):
+    """Registers converter in default registry, see
+    :meth:`Registry.register`."""
+    DEFAULT_REGISTRY.register(type_or_class, converter)
+
+
+def register_dumped(type_or_class, converter):
+    """Registers converter in default registry of dumped form, see
+    :meth:`Registry.register`."""
+    DEFAULT_DUMPED_REGISTRY.register(type_or_class, converter)
+
+
+def type_strategy(type, context=None, form='loaded'):
+    """Returns strategy generating values of given type.
+
+    :param type: Schema type.
+    :param context: Context passed to validators and converters.
+    :param str form: "loaded" to generate values as returned by type's
+        :meth:`load` (default), "dumped" to generate data as returned by
+        type's :meth:`dump`.
+    """
+    if form == 'loaded':
+        return DEFAULT_REGISTRY.convert(type, context=context)
+    elif form == 'dumped':
+        return DEFAULT_DUMPED_REGISTRY.convert(type, context=context)
+
+    raise ValueError('Unknown form: %s' % form)
+
+
+def fingerprint(type, context=None, form='loaded'):
+    """Returns digest of type that is stable between runs and changes when
+    values generated for type can change.
+
+    :param type: Schema type.
+    :param context: Context passed to validators and converters.
+    :param str form: "loaded" or "dumped", see :func:`type_strategy`.
+    """
+    if form == 'loaded':
+        return DEFAULT_REGISTRY.fingerprint(type, context=context)
+    elif form == 'dumped':
+        return DEFAULT_DUMPED_REGISTRY.fingerprint(type, context=context)
 
-register = DEFAULT_REGISTRY.register
-type_strategy = DEFAULT_REGISTRY.convert
+    raise ValueError('Unknown form: %s' % form)
@@ -0,0 +1,320 @@
+import lollipop.validators as lv
+from lollipop.utils import identity
+from lollipop_hypothesis.fingerprint import digest
+import binascii
+import hashlib
+import math
+import os
+import random
+import six
+import struct
+import threading
+import weakref
+
+
+# Capacity of the first filter of a corpus; each next one is twice as big
+INITIAL_CAPACITY = 4096
+
+# Probability that a value never generated before is taken for a duplicate
+# by one filter. False positives only cost another draw, so it is cheaper
+# to allow them than to compute more hash functions for every value.
+DEFAULT_ERROR_RATE = 0.01
+
+# Validator -> corpus (or random generator) -> values generated in it
+_corpora = weakref.WeakKeyDictionary()
+_corpora_lock = threading.Lock()
+
+
+class BloomFilter(object):
+    """Set of hashable items which uses about 1.2 bytes per item for 1%
+    false positive rate. Membership checks may give false positives, but never
+    false negatives.
+
+    :param int capacity: Number of items filter is sized for.
+    :param float error_rate: False positive rate when filter is full.
+    """
+    def __init__(self, capacity, error_rate=DEFAULT_ERROR_RATE):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        )))
+        self.hash_count = max(1, int(round(
+            float(self.size) / capacity * math.log(2)
+        )))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def __contains__(self, item):
+        return self._contains(*_hashes(item))
+
+    def add(self, item):
+        """Adds item to filter. Returns False if item was (probably) added
+        before and True if it definitely was not."""
+        return self._add(*_hashes(item))
+
+    def _contains(self, h1, h2):
+        bits, size = self._bits, self.size
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def _add(self, h1, h2):
+        bits, size = self._bits, self.size
+        added = False
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % size
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+
+        if added:
+            self.count += 1
+        return added
+
+    def __len__(self):
+        return self.count
+
+
+_HASHES = struct.Struct('<QQ')
+
+
+def _encode(item):
+    # Unlike hash(), encoding does not change between processes, so that
+    # the same seed produces the same values
+    if isinstance(item, six.text_type):
+        return b's' + item.encode('utf-8')
+    if isinstance(item, six.binary_type):
+        return b'b' + item
+    if isinstance(item, float):
+        return b'n' + repr(item).encode('ascii')
+    if item is None or isinstance(item, (bool,) + six.integer_types):
+        return b'n' + str(item).encode('ascii')
+    return b'o' + digest(item).encode('ascii')
+
+
+def _hashes(item):
+    # Double hashing: k hash functions out of two hash values
+    h1, h2 = _HASHES.unpack(hashlib.md5(_encode(item)).digest())
+    return h1, h2 | 1
+
+
+class ScalableBloomFilter(object):
+    """Bloom filter which grows with number of added items: when a filter
+    is full, a twice bigger one is added, so memory usage is proportional to
+    number of items. False positive rate is at most ``error_rate`` times
+    number of filters, which grows logarithmically.
+    """
+    def __init__(self, initial_capacity=INITIAL_CAPACITY,
+                 error_rate=DEFAULT_ERROR_RATE):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.filters = []
+
+    def __contains__(self, item):
+        h1, h2 = _hashes(item)
+        return any(bloom_filter._contains(h1, h2)
+                   for bloom_filter in self.filters)
+
+    def add(self, item):
+        """Adds item to filter. Returns False if item was (probably) added
+        before and True if it definitely was not."""
+        h1, h2 = _hashes(item)
+        filters = self.filters
+        for bloom_filter in filters:
+            if bloom_filter._contains(h1, h2):
+                return False
+
+        if not filters or filters[-1].count >= filters[-1].capacity:
+            index = len(filters)
+            filters.append(BloomFilter(self.initial_capacity * 2 ** index,
+                                       self.error_rate))
+
+        filters[-1]._add(h1, h2)
+        return True
+
+    def __len__(self):
+        return sum(len(bloom_filter) for bloom_filter in self.filters)
+
+
+class Corpus(object):
+    """Corpus of values generated in parts, e.g. in chunks by several
+    processes. Values of integers and strings with :class:`CorpusUnique`
+    validators are derived from their indexes in the corpus rather than
+    tracked, so they are unique across all parts. Other values are tracked
+    with filters shared by all parts that use the same corpus instance.
+
+    :param seed: Seed of the whole corpus; all parts should use the same one.
+        Generated values are permuted differently for different seeds.
+    :param int size: Number of values in the corpus.
+    :param bool local: False if some parts are generated in other
+        processes. Values that have to be tracked can not be kept unique
+        then, so generating them raises ValueError.
+    """
+    def __init__(self, seed, size, local=True):
+        self.size = size
+        self.local = local
+        self.key = '%s' % (seed,) if seed is not None \
+            else binascii.hexlify(os.urandom(16)).decode('ascii')
+
+
+class CorpusRandom(random.Random):
+    """Random generator of a sampler run that knows index of the value being
+    generated in its :class:`Corpus`."""
+    corpus = None
+    record = None
+
+    def start_record(self, record):
+        self.record = record
+        # Validator -> number of values drawn for current record
+        self.draws = {}
+
+
+def unique_index(random, validator):
+    """Returns index of next value of validator unique within corpus of given
+    random generator, or None if generator is not a part of a corpus."""
+    corpus = getattr(random, 'corpus', None)
+    if corpus is None or random.record is None:
+        return None
+
+    draw = random.draws.get(validator, 0)
+    random.draws[validator] = draw + 1
+    # Records may hold several values of a validator (e.g. list items), so
+    # the n-th values of all records go after all (n - 1)-th ones
+    return draw * corpus.size + random.record
+
+
+# Round keys of permutations
+_ROUND_KEYS = struct.Struct('<QQQQ')
+
+# Odd 64-bit constant which spreads bits of round function inputs
+_ROUND_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+def permute(index, size, key):
+    """Maps index to a number in ``range(size)``, so that different indexes
+    map to different numbers, shuffled differently for different keys.
+
+    Uses a Feistel network over the smallest even number of bits that fits
+    size and walks the cycle until the number is in range, which takes less
+    than four rounds on average.
+    """
+    keys = _ROUND_KEYS.unpack(hashlib.sha256(key.encode('utf-8')).digest())
+    half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+    mask = (1 << half_bits) - 1
+
+    number = index
+    while True:
+        left, right = number >> half_bits, number & mask
+        for round_key in keys:
+            left, right = right, left ^ (
+                ((right ^ round_key) * _ROUND_MULTIPLIER >> half_bits) & mask
+            )
+        number = (left << half_bits) | right
+        if number < size:
+            return number
+
+
+def _exhausted(count):
+    return ValueError('Could not generate value unique in corpus: all %d '
+                      'values are generated' % count)
+
+
+def unique_integers(min_value, max_value):
+    """Returns function that takes index of value in corpus and key of
+    corpus and returns integer between min_value and max_value unique for
+    that index."""
+    size = max_value - min_value + 1
+
+    def encode(index, key):
+        if index >= size:
+            raise _exhausted(size)
+        return min_value + permute(index, size, key)
+
+    return encode
+
+
+def unique_strings(alphabet, min_length, max_length):
+    """Returns function that takes index of value in corpus and key of
+    corpus and returns string of alphabet characters unique for that
+    index. Indexes are mapped to the shortest strings first."""
+    base = len(alphabet)
+    # Do not waste the first index on an empty string
+    if min_length == 0 and max_length > 0:
+        min_length = 1
+
+    def encode(index, key):
+        for length in six.moves.range(min_length, max_length + 1):
+            size = base ** length
+            if index < size:
+                break
+            index -= size
+        else:
+            raise _exhausted(sum(base ** length for length in
+                                 six.moves.range(min_length, max_length + 1)))
+
+        number = permute(index, size, '%s:%d' % (key, length))
+        chars = []
+        for _ in six.moves.range(length):
+            number, digit = divmod(number, base)
+            chars.append(alphabet[digit])
+        return ''.join(chars)
+
+    return encode
+
+
+class CorpusUnique(lv.Validator):
+    """Marks values of a type as unique across all values generated by one
+    sampler run, e.g. ``sampler.examples(1000000, seed=1)``, not just within
+    one generated value.
+
+    Integers and strings with no validators other than ranges and lengths
+    are derived from indexes of generated values in the :class:`Corpus`,
+    so they stay unique when corpus is generated in parts. Values of other
+    types are drawn again until a new one is found. Already generated values
+    are tracked with a scalable Bloom filter, which takes about 1.2 bytes
+    per value, within one corpus in one process.
+
+    To make values of several fields unique together, use the same validator
+    instance for all of them. Validator accepts any value when data is
+    loaded.
+
+    :param callable key: Function to get hashable key of a value to compare
+        values by, e.g. ``lambda email: email.lower()``.
+    :param float error_rate: Probability of drawing a value again because
+        one of Bloom filters takes it for a duplicate.
+    """
+    # Strategies of types with different validator instances can not be
+    # shared, since each validator tracks its own values
+    compare_by_identity = True
+
+    def __init__(self, key=identity, error_rate=DEFAULT_ERROR_RATE, **kwargs):
+        super(CorpusUnique, self).__init__(**kwargs)
+        self.key = key
+        self.error_rate = error_rate
+        # Path of the first type converted with the validator, which keys
+        # permutation of values derived from indexes
+        self.path = None
+
+    def seen(self, corpus):
+        """Returns filter of values generated in given corpus: a
+        :class:`Corpus` or random generator of a sampler run."""
+        with _corpora_lock:
+            corpora = _corpora.get(self)
+            if corpora is None:
+                corpora = _corpora[self] = weakref.WeakKeyDictionary()
+
+            seen = corpora.get(corpus)
+            if seen is None:
+                seen = corpora[corpus] = \
+                    ScalableBloomFilter(error_rate=self.error_rate)
+        return seen
+
+    def __call__(self, value, context=None):
+        pass
+
+    def __repr__(self):
+        return '<%s>' % self.__class__.__name__
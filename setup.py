@@ -21,13 +21,18 @@ setup(
     keywords=('lollipop', 'hypothesis'),
     packages=['lollipop_hypothesis'],
     install_requires=[
-        'hypothesis>=3.8',
-        'hypothesis[datetime]',
+        'hypothesis>=3.11',
         'lollipop>=1.1.3',
         'six>=1.10',
     ],
+    entry_points={
+        'console_scripts': [
+            'lollipop-hypothesis = lollipop_hypothesis.cli:main',
+        ],
+    },
     extras_require={
-        'regex': ['hypothesis-regex'],
+        # Regex support is built in now, extra is kept for compatibility
+        'regex': [],
     },
     setup_requires=['pytest-runner'],
     tests_require=['pytest'],
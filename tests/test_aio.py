@@ -0,0 +1,87 @@
+import lollipop.types as lt
+import lollipop.validators as lv
+from lollipop_hypothesis import type_sampler, aiter_examples
+import asyncio
+import pytest
+
+
+USER = lt.Object({
+    'name': lt.String(validate=lv.Length(min=1)),
+    'age': lt.Integer(validate=lv.Range(min=18, max=99)),
+})
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    # Let cancelled tasks finish
+    loop.run_until_complete(asyncio.sleep(0.01))
+    loop.close()
+
+
+def collect(loop, iterator, limit=None):
+    async def consume():
+        values = []
+        async for value in iterator:
+            values.append(value)
+            if limit is not None and len(values) >= limit:
+                break
+        return values
+
+    return loop.run_until_complete(consume())
+
+
+class TestAiterExamples:
+    def test_generates_given_number_of_examples(self, loop):
+        values = collect(loop, aiter_examples(USER, count=250, seed=1,
+                                              prefetch=30))
+
+        assert len(values) == 250
+        assert all(18 <= value.age <= 99 for value in values)
+
+    def test_same_values_as_sampler(self, loop):
+        values = collect(loop, aiter_examples(USER, count=50, seed=1,
+                                              dump=True))
+
+        assert values == [USER.dump(value) for value in
+                          type_sampler(USER).examples(50, seed=1)]
+
+    def test_dumped_values(self, loop):
+        values = collect(loop, aiter_examples(USER, count=10, seed=1,
+                                              dump=True))
+
+        assert all(sorted(value.keys()) == ['age', 'name'] for value in values)
+
+    def test_prefetch_bounds_generated_values(self, loop):
+        generated = []
+        iterator = aiter_examples(USER, seed=1, prefetch=10,
+                                  dump=True)
+        iterator._transform = lambda value: generated.append(value) or value
+
+        collect(loop, iterator, limit=5)
+        loop.run_until_complete(asyncio.sleep(0.3))
+
+        assert len(generated) <= 5 + 10
+        iterator.close()
+
+    def test_close_stops_generation(self, loop):
+        iterator = aiter_examples(USER, seed=1, prefetch=10)
+        collect(loop, iterator, limit=5)
+
+        iterator.close()
+        iterator._thread.join(1)
+
+        assert not iterator._thread.is_alive()
+        assert collect(loop, iterator) == []
+
+    def test_propagates_errors(self, loop):
+        def fail(value):
+            raise ValueError('Test error')
+
+        iterator = aiter_examples(USER, count=10, seed=1)
+        iterator._transform = fail
+
+        with pytest.raises(ValueError):
+            collect(loop, iterator)
@@ -0,0 +1,109 @@
+import lollipop.types as lt
+import lollipop.validators as lv
+from lollipop_hypothesis import analyze, new_sampler_registry
+from lollipop_hypothesis.sampler import nothing
+import json
+
+
+def issues(result, code=None):
+    return [(issue['path'], issue['code'])
+            for issue in result['issues']
+            if code is None or issue['code'] == code]
+
+
+class TestAnalyze:
+    def test_valid_schema(self):
+        result = analyze(lt.Object({
+            'name': lt.String(validate=lv.Length(min=1)),
+            'age': lt.Integer(validate=lv.Range(min=0, max=150)),
+        }, name='User'))
+
+        assert result['ok']
+        assert result['issues'] == []
+
+    def test_length_conflict(self):
+        result = analyze(lt.Object({
+            'name': lt.String(validate=lv.Length(min=5, max=3)),
+        }, name='User'))
+
+        assert not result['ok']
+        assert issues(result) == [('User.name', 'length-conflict')]
+
+    def test_empty_any_of_intersection(self):
+        result = analyze(lt.String(
+            validate=[lv.AnyOf(['foo']), lv.AnyOf(['bar'])], name='Foo',
+        ))
+
+        assert issues(result) == [('Foo', 'no-choices')]
+
+    def test_unsupported_types(self):
+        class Custom(lt.Type):
+            pass
+
+        result = analyze(lt.List(Custom(), name='Foo'))
+
+        assert issues(result) == [('Foo[]', 'unsupported-type')]
+
+    def test_unsatisfiable_types_are_reported_at_innermost_node(self):
+        result = analyze(lt.Object({
+            'ids': lt.List(lt.DumpOnly(lt.Integer()),
+                           validate=lv.Length(min=1)),
+        }, name='Foo'))
+
+        assert issues(result) == [('Foo.ids[]', 'unsatisfiable')]
+
+    def test_unsatisfiable_types_with_common_path_prefix(self):
+        class Custom(lt.Type):
+            pass
+
+        registry = new_sampler_registry()
+        registry.register(Custom,
+                          lambda registry, type, context=None: nothing())
+
+        result = analyze(lt.Object({
+            'tag': Custom(),
+            'tags': Custom(),
+        }, name='Foo'), registry=registry)
+
+        assert sorted(issues(result)) == [
+            ('Foo.tag', 'unsatisfiable'), ('Foo.tags', 'unsatisfiable'),
+        ]
+
+    def test_reports_all_problems(self):
+        result = analyze(lt.Object({
+            'foo': lt.String(validate=lv.Length(min=5, max=3)),
+            'bar': lt.Integer(validate=lv.Range(min=5, max=3)),
+        }, name='Foo'))
+
+        assert sorted(issues(result)) == [
+            ('Foo.bar', 'range-conflict'), ('Foo.foo', 'length-conflict'),
+        ]
+
+    def test_filter_acceptance_rates(self):
+        result = analyze(lt.Object({
+            'even': lt.Integer(validate=lv.Predicate(lambda x: x % 2 == 0)),
+            'rare': lt.Integer(validate=lv.Predicate(lambda x: x % 100 == 0)),
+        }, name='Foo'), registry=new_sampler_registry(), samples=1000)
+
+        filters = {issue['path']: issue
+                   for issue in result['issues'] if issue['code'] == 'filter'}
+        assert result['ok']
+        assert 0.3 < filters['Foo.even']['acceptance'] < 0.7
+        assert filters['Foo.even']['severity'] == 'info'
+        assert filters['Foo.rare']['acceptance'] < 0.1
+        assert filters['Foo.rare']['severity'] == 'warning'
+
+    def test_does_not_change_given_registry(self):
+        registry = new_sampler_registry()
+        analyze(lt.String(validate=lv.Length(min=5, max=3)), registry=registry)
+
+        assert registry.instrumentation_report() == {}
+        assert registry.cache_info().size == 0
+
+    def test_result_is_json_serializable(self):
+        result = analyze(lt.Object({
+            'foo': lt.Integer(validate=lv.Predicate(lambda x: x > 0)),
+            'bar': lt.String(validate=lv.Length(min=5, max=3)),
+        }, name='Foo'))
+
+        assert json.loads(json.dumps(result)) == result
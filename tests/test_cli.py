@@ -0,0 +1,188 @@
+from lollipop_hypothesis.cli import main
+import json
+import os
+import pytest
+import sys
+import textwrap
+
+
+SCHEMA_MODULE = textwrap.dedent('''
+    import lollipop.types as lt
+    import lollipop.validators as lv
+    from lollipop_hypothesis import CorpusUnique
+
+    INVALID = lt.String(validate=lv.Length(min=5, max=3))
+
+    NAME = lt.String(validate=lv.Length(min=1))
+
+    USER = lt.Object({
+        'name': lt.String(validate=lv.Length(min=1)),
+        'age': lt.Optional(lt.Integer(validate=lv.Range(min=18, max=99))),
+        'created': lt.DateTime(),
+    })
+
+    ACCOUNT = lt.Object({
+        'id': lt.Integer(validate=[lv.Range(min=1, max=50), CorpusUnique()]),
+        'login': lt.String(validate=[lv.Length(min=1), CorpusUnique()]),
+    })
+
+    EMAIL = lt.String(validate=[lv.Regexp('^[a-z]{2}@x[.]com$'),
+                                CorpusUnique()])
+''')
+
+
+@pytest.fixture
+def schema_module(tmpdir, monkeypatch):
+    tmpdir.join('cli_test_schemas.py').write(SCHEMA_MODULE)
+    monkeypatch.syspath_prepend(str(tmpdir))
+    yield 'cli_test_schemas'
+    sys.modules.pop('cli_test_schemas', None)
+
+
+def generate(tmpdir, *args):
+    output = tmpdir.join('output.jsonl')
+    assert main(['generate', '-o', str(output)] + list(args)) == 0
+    return output.read()
+
+
+class TestGenerate:
+    def test_generates_given_number_of_dumped_examples(self, tmpdir, schema_module):
+        output = generate(tmpdir, schema_module + ':USER', '-n', '25', '-s', '1')
+
+        lines = output.splitlines()
+        assert len(lines) == 25
+        for line in lines:
+            data = json.loads(line)
+            assert sorted(data.keys()) == ['age', 'created', 'name']
+            assert data['age'] is None or 18 <= data['age'] <= 99
+
+    def test_same_seed_produces_same_output(self, tmpdir, schema_module):
+        assert generate(tmpdir, schema_module + ':USER', '-n', '10', '-s', '1') == \
+            generate(tmpdir, schema_module + ':USER', '-n', '10', '-s', '1')
+
+    def test_different_seeds_produce_different_output(self, tmpdir, schema_module):
+        assert generate(tmpdir, schema_module + ':USER', '-n', '10', '-s', '1') != \
+            generate(tmpdir, schema_module + ':USER', '-n', '10', '-s', '2')
+
+    def test_output_does_not_depend_on_number_of_jobs(self, tmpdir, schema_module,
+                                                      monkeypatch):
+        monkeypatch.setattr('lollipop_hypothesis.cli.CHUNK_SIZE', 7)
+
+        assert generate(tmpdir, schema_module + ':USER', '-n', '50', '-s', '1') == \
+            generate(tmpdir, schema_module + ':USER', '-n', '50', '-s', '1',
+                     '-j', '3')
+
+    def test_unique_values_are_unique_across_chunks(self, tmpdir, schema_module,
+                                                    monkeypatch):
+        monkeypatch.setattr('lollipop_hypothesis.cli.CHUNK_SIZE', 7)
+
+        output = generate(tmpdir, schema_module + ':ACCOUNT', '-n', '50',
+                          '-s', '1', '-j', '3')
+
+        accounts = [json.loads(line) for line in output.splitlines()]
+        assert sorted(account['id'] for account in accounts) == \
+            list(range(1, 51))
+        assert len(set(account['login'] for account in accounts)) == 50
+
+    def test_tracked_unique_values_are_unique_across_chunks(
+            self, tmpdir, schema_module, monkeypatch):
+        monkeypatch.setattr('lollipop_hypothesis.cli.CHUNK_SIZE', 7)
+
+        output = generate(tmpdir, schema_module + ':EMAIL', '-n', '300',
+                          '-s', '1')
+
+        assert len(set(output.splitlines())) == 300
+
+    def test_fails_to_track_unique_values_in_several_jobs(
+            self, tmpdir, schema_module, capsys):
+        output = tmpdir.join('output.jsonl')
+
+        assert main(['generate', '-o', str(output), schema_module + ':EMAIL',
+                     '-n', '10', '-s', '1', '-j', '2']) != 0
+        assert 'unique' in capsys.readouterr().err
+
+    def test_fails_when_unique_values_are_exhausted(
+            self, tmpdir, schema_module, monkeypatch, capsys):
+        monkeypatch.setattr('lollipop_hypothesis.cli.CHUNK_SIZE', 100)
+        output = tmpdir.join('output.jsonl')
+
+        assert main(['generate', '-o', str(output), schema_module + ':EMAIL',
+                     '-n', '700', '-s', '1']) != 0
+        assert 'unique' in capsys.readouterr().err
+
+    def test_invalid_schema_reference(self, tmpdir):
+        assert main(['generate', 'no_module_name']) == 1
+
+
+class TestAnalyze:
+    def test_reports_issues_as_json(self, schema_module, capsys):
+        assert main(['analyze', schema_module + ':USER', '-n', '10']) == 0
+
+        result = json.loads(capsys.readouterr()[0])
+        assert result['ok']
+
+    def test_fails_on_errors(self, schema_module, capsys):
+        assert main(['analyze', schema_module + ':INVALID']) == 1
+
+        result = json.loads(capsys.readouterr()[0])
+        assert [issue['code'] for issue in result['issues']] == \
+            ['length-conflict']
+
+
+class TestSelfcheck:
+    def test_reports_results_as_json(self, schema_module, capsys):
+        assert main(['selfcheck', schema_module + ':NAME', '-n', '10']) == 0
+
+        result = json.loads(capsys.readouterr()[0])
+        assert result['ok']
+        assert result['schemas']['NAME']['examples'] == 10
+
+    def test_fails_on_failures(self, schema_module, capsys):
+        assert main(['selfcheck', schema_module + ':NAME,INVALID',
+                     '-n', '10']) == 1
+
+        result = json.loads(capsys.readouterr()[0])
+        assert result['schemas']['NAME']['failures'] == 0
+        assert result['schemas']['INVALID']['stages'] == {'generate': 1}
+
+
+class TestProfile:
+    def test_learns_profile_as_json(self, tmpdir, schema_module):
+        sample = tmpdir.join('sample.jsonl')
+        sample.write('"ab"\n"abc"\n"ab"\n""\n')
+        output = tmpdir.join('profile.json')
+
+        assert main(['profile', schema_module + ':NAME', str(sample),
+                     '-o', str(output)]) == 0
+
+        result = json.loads(output.read())
+        assert result['examples'] == 3
+        assert result['rejected'] == 1
+        assert result['histograms']['String']['bins'] == [[2, 2, 2],
+                                                          [3, 3, 1]]
+
+    def test_generates_values_like_profiled_ones(self, tmpdir, schema_module):
+        sample = tmpdir.join('sample.jsonl')
+        sample.write('"ab"\n"abc"\n')
+        profile = tmpdir.join('profile.json')
+        main(['profile', schema_module + ':NAME', str(sample),
+              '-o', str(profile)])
+
+        output = generate(tmpdir, schema_module + ':NAME', '-n', '20',
+                          '-s', '1', '-p', str(profile))
+
+        lengths = set(len(json.loads(line)) for line in output.splitlines())
+        assert lengths == set([2, 3])
+
+
+class TestPool:
+    def test_generates_pool_and_prints_its_path(self, tmpdir, schema_module,
+                                                capsys):
+        directory = str(tmpdir.join('pools'))
+
+        assert main(['pool', schema_module + ':NAME', '-n', '10',
+                     '-d', directory, '-s', '1']) == 0
+
+        path = capsys.readouterr()[0].strip()
+        assert os.path.dirname(path) == directory
+        assert os.path.exists(path)
@@ -0,0 +1,169 @@
+import lollipop.types as lt
+import lollipop.validators as lv
+from lollipop_hypothesis import columns, column_batches, new_sampler_registry
+from lollipop_hypothesis.columnar import INTEGER_TYPECODE, FLOAT_TYPECODE, \
+    BOOLEAN_TYPECODE
+from lollipop_hypothesis.profiles import Histogram, Profile, RANGE, \
+    profiled_registry
+from lollipop_hypothesis.sampler import just
+from array import array
+import datetime
+import pytest
+
+
+ROW = lt.Object({
+    'id': lt.Integer(validate=lv.Range(min=1, max=1000)),
+    'score': lt.Float(validate=lv.Range(min=0.0, max=1.0)),
+    'active': lt.Boolean(),
+    'name': lt.String(validate=lv.Length(min=1, max=5)),
+    'kind': lt.String(validate=lv.AnyOf(['foo', 'bar'])),
+    'created': lt.DateTime(validate=lv.Range(
+        min=datetime.datetime(2000, 1, 1), max=datetime.datetime(2000, 1, 2),
+    )),
+    'birthday': lt.Date(validate=lv.Range(max=datetime.date(2000, 1, 1))),
+    'tags': lt.List(lt.String()),
+    'secret': lt.DumpOnly(lt.String()),
+})
+
+
+class TestColumns:
+    def test_generates_column_per_field(self):
+        result = columns(ROW, 100, seed=1)
+
+        assert list(result.keys()) == [
+            name for name in ROW.fields if name != 'secret'
+        ]
+        assert all(len(column) == 100 for column in result.values())
+
+    def test_primitive_columns_are_typed_arrays(self):
+        result = columns(ROW, 10, seed=1)
+
+        assert isinstance(result['id'], array)
+        assert result['id'].typecode == INTEGER_TYPECODE
+        assert result['score'].typecode == FLOAT_TYPECODE
+        assert result['active'].typecode == BOOLEAN_TYPECODE
+        assert isinstance(result['name'], list)
+        assert isinstance(result['tags'], list)
+
+    def test_applies_validators_to_columns(self):
+        result = columns(ROW, 1000, seed=1)
+
+        assert all(1 <= x <= 1000 for x in result['id'])
+        assert all(0.0 <= x <= 1.0 for x in result['score'])
+        assert set(result['active']) == set([0, 1])
+        assert all(1 <= len(x) <= 5 for x in result['name'])
+        assert set(result['kind']) == set(['foo', 'bar'])
+        assert all(datetime.datetime(2000, 1, 1) <= x <=
+                   datetime.datetime(2000, 1, 2) for x in result['created'])
+        assert all(x <= datetime.date(2000, 1, 1) for x in result['birthday'])
+        assert all(isinstance(x, list) for x in result['tags'])
+
+    def test_generated_values_pass_validators(self):
+        result = columns(ROW, 100, seed=1)
+
+        for name, column in result.items():
+            for validator in ROW.fields[name].field_type.validators:
+                for value in column:
+                    validator(value)
+
+    def test_choices_are_checked_against_other_validators(self):
+        result = columns(lt.Object({'x': lt.Integer(validate=[
+            lv.AnyOf([1, 2, 3, 4]), lv.Range(min=3),
+        ])}), 100, seed=1)
+
+        assert result['x'].typecode == INTEGER_TYPECODE
+        assert set(result['x']) == set([3, 4])
+
+    def test_other_validators_are_applied_by_sampler(self):
+        result = columns(lt.Object({'x': lt.Integer(validate=[
+            lv.Range(min=0, max=100), lv.Predicate(lambda x: x % 2 == 0),
+        ])}), 100, seed=1)
+
+        assert all(x % 2 == 0 for x in result['x'])
+
+    def test_uses_custom_samplers(self):
+        registry = new_sampler_registry()
+        registry.register(lt.Integer, lambda _, type, context=None: just(42))
+
+        result = columns(ROW, 10, registry=registry, seed=1)
+
+        assert list(result['id']) == [42] * 10
+
+    def test_applies_object_validators_to_rows(self):
+        result = columns(lt.Object({
+            'low': lt.Integer(validate=lv.Range(min=0, max=10)),
+            'high': lt.Integer(validate=lv.Range(min=0, max=10)),
+        }, validate=lv.Predicate(lambda row, context: row.low < row.high)),
+            100, seed=1)
+
+        assert result['low'].typecode == INTEGER_TYPECODE
+        assert all(low < high
+                   for low, high in zip(result['low'], result['high']))
+
+    def test_uses_object_constructors(self):
+        class Point(object):
+            def __init__(self, x, y):
+                self.x, self.y = x * 10, y * 10
+
+        result = columns(lt.Object({
+            'x': lt.Integer(validate=lv.Range(min=0, max=9)),
+            'y': lt.Integer(validate=lv.Range(min=0, max=9)),
+        }, constructor=Point), 20, seed=1)
+
+        assert all(x % 10 == 0 and y % 10 == 0
+                   for x, y in zip(result['x'], result['y']))
+
+    def test_uses_registry_profiles(self):
+        registry = profiled_registry(
+            Profile(histograms={'Row.id': Histogram(RANGE, [(5, 7, 1)])}),
+            new_sampler_registry(),
+        )
+
+        result = columns(lt.Object({
+            'id': lt.Integer(validate=lv.Range(min=1, max=1000)),
+        }, name='Row'), 50, registry=registry, seed=1)
+
+        assert set(result['id']) <= set([5, 6, 7])
+
+    def test_instruments_fields_by_paths_inside_objects(self):
+        registry = new_sampler_registry()
+        registry.enable_instrumentation()
+
+        columns(lt.Object({'id': lt.Integer()}, name='Row'), 10,
+                registry=registry, seed=1)
+
+        report = registry.instrumentation_report()
+        assert report['Row.id']['draws'] == 10
+
+    def test_same_seed_produces_same_columns(self):
+        assert columns(ROW, 50, seed=1) == columns(ROW, 50, seed=1)
+        assert columns(ROW, 50, seed=1) != columns(ROW, 50, seed=2)
+
+    def test_accepts_list_of_objects(self):
+        result = columns(lt.List(ROW), 10, seed=1)
+
+        assert len(result['id']) == 10
+
+    def test_no_rows(self):
+        result = columns(ROW, 0)
+
+        assert result['id'] == array(INTEGER_TYPECODE)
+        assert result['name'] == []
+
+    def test_rejects_non_object_schemas(self):
+        with pytest.raises(ValueError):
+            columns(lt.List(lt.String()), 10)
+
+
+class TestColumnBatches:
+    def test_generates_batches_of_given_size(self):
+        batches = list(column_batches(ROW, 25, batch_size=10, seed=1))
+
+        assert [len(batch['id']) for batch in batches] == [10, 10, 5]
+
+    def test_batches_make_up_columns(self):
+        batches = list(column_batches(ROW, 25, batch_size=10, seed=1))
+        result = columns(ROW, 25, batch_size=10, seed=1)
+
+        assert list(result['name']) == \
+            [name for batch in batches for name in batch['name']]
@@ -0,0 +1,120 @@
+import lollipop.types as lt
+import lollipop.validators as lv
+from lollipop_hypothesis import new_registry, new_sampler_registry, \
+    new_dumped_registry
+from hypothesis import given, settings
+import json
+import pytest
+
+
+EVENT = lt.OneOf([
+    lt.Object({
+        'kind': lt.Constant('event%d' % i),
+        'value': lt.Optional(lt.Integer()),
+    })
+    for i in range(40)
+], name='EVENT')
+
+REGISTRIES = [new_registry, new_sampler_registry, new_dumped_registry]
+
+
+def covered(registry, path):
+    return registry.coverage_report()['nodes'][path]['covered']
+
+
+@pytest.mark.parametrize('make_registry', REGISTRIES)
+class TestCoverage:
+    def test_report_is_empty_by_default(self, make_registry):
+        registry = make_registry()
+        registry.examples(registry.convert(EVENT), 10)
+
+        assert registry.coverage_report() == {}
+
+    def test_reports_one_of_branches(self, make_registry):
+        registry = make_registry()
+        registry.enable_coverage()
+        registry.examples(registry.convert(EVENT), 10)
+
+        node = registry.coverage_report()['nodes']['EVENT']
+        assert node['type'] == 'OneOf'
+        assert node['total'] == 40
+        assert sorted(node['branches']) == sorted(str(i) for i in range(40))
+        assert sum(node['branches'].values()) >= 10
+
+    def test_reports_optional_branches(self, make_registry):
+        registry = make_registry()
+        registry.enable_coverage()
+        registry.examples(registry.convert(EVENT), 10)
+
+        node = registry.coverage_report()['nodes']['EVENT|0.value']
+        assert sorted(node['branches']) == ['None', 'value']
+
+    def test_reports_any_of_choices(self, make_registry):
+        registry = make_registry()
+        registry.enable_coverage()
+        registry.examples(registry.convert(lt.String(
+            validate=lv.AnyOf(['foo', 'bar', 'baz']), name='CHOICE',
+        )), 50)
+
+        node = registry.coverage_report()['nodes']['CHOICE']
+        assert sorted(node['branches']) == ["'bar'", "'baz'", "'foo'"]
+        assert node['covered'] == 3
+
+    def test_values_are_valid(self, make_registry):
+        registry = make_registry()
+        registry.enable_coverage()
+        for value in registry.examples(registry.convert(EVENT), 50):
+            if isinstance(value, dict):
+                assert value['kind'].startswith('event')
+            else:
+                assert value.kind.startswith('event')
+
+    def test_report_is_json_serializable(self, make_registry):
+        registry = make_registry()
+        registry.enable_coverage()
+        registry.examples(registry.convert(EVENT), 10)
+
+        report = registry.coverage_report()
+        assert json.loads(json.dumps(report)) == report
+        assert report['total'] >= 40
+        assert 0 < report['ratio'] <= 1
+
+
+class TestGuidedCoverage:
+    def test_guided_generation_covers_a_branch_per_value(self):
+        registry = new_sampler_registry()
+        registry.enable_coverage()
+        registry.examples(registry.convert(EVENT), 40)
+
+        assert covered(registry, 'EVENT') == 40
+
+    def test_unguided_generation_covers_fewer_branches(self):
+        registry = new_sampler_registry()
+        registry.enable_coverage(guided=False)
+        registry.examples(registry.convert(EVENT), 60)
+
+        assert covered(registry, 'EVENT') < 40
+
+
+@pytest.mark.parametrize('make_registry', [new_registry, new_dumped_registry])
+class TestStrategyCoverage:
+    def test_failing_examples_are_replayed(self, make_registry):
+        registry = make_registry()
+        registry.enable_coverage()
+        strategy = registry.convert(lt.String(
+            validate=lv.AnyOf(['a1', 'a2', 'a3']),
+        ))
+        failures = []
+
+        @settings(database=None, max_examples=100)
+        @given(strategy)
+        def check(value):
+            if value == 'a3':
+                failures.append(value)
+            assert value != 'a3'
+
+        # Flaky error would be raised if replayed test case generated
+        # another value
+        with pytest.raises(AssertionError):
+            check()
+        assert set(failures) == set(['a3'])
@@ -0,0 +1,142 @@
+from lollipop_hypothesis import fingerprint, schema_database, new_registry
+from lollipop_hypothesis.database import SchemaExampleDatabase
+from lollipop.type_registry import TypeRegistry
+from hypothesis.database import InMemoryExampleDatabase
+import lollipop.types as lt
+import lollipop.validators as lv
+import hypothesis.strategies as hs
+import os
+import subprocess
+import sys
+import textwrap
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_user(name_length=1, extra_fields=None):
+    fields = {
+        'name': lt.String(validate=lv.Length(min=name_length)),
+        'age': lt.Optional(lt.Integer(validate=lv.Range(min=18, max=99))),
+    }
+    fields.update(extra_fields or {})
+    return lt.Object(fields)
+
+
+class TestFingerprint:
+    def test_same_for_structurally_equal_types(self):
+        assert fingerprint(make_user()) == fingerprint(make_user())
+
+    def test_changes_when_validator_changes(self):
+        assert fingerprint(make_user(1)) != fingerprint(make_user(2))
+
+    def test_changes_when_field_is_added(self):
+        assert fingerprint(make_user()) != \
+            fingerprint(make_user(extra_fields={'email': lt.String()}))
+
+    def test_changes_when_nested_type_changes(self):
+        assert fingerprint(lt.List(lt.String())) != \
+            fingerprint(lt.List(lt.Integer()))
+
+    def test_changes_when_converter_changes(self):
+        registry = new_registry()
+        before = registry.fingerprint(make_user())
+
+        registry.register(lt.Integer, lambda registry, type, context=None:
+                          hs.just(18))
+
+        assert registry.fingerprint(make_user()) != before
+
+    def test_depends_on_form(self):
+        assert fingerprint(make_user()) != \
+            fingerprint(make_user(), form='dumped')
+
+    def test_stable_between_processes(self):
+        script = textwrap.dedent('''
+            import lollipop.types as lt
+            import lollipop.validators as lv
+            from lollipop_hypothesis import fingerprint
+            print(fingerprint(lt.Object({
+                'name': lt.String(validate=lv.Length(min=1)),
+                'age': lt.Optional(lt.Integer(validate=lv.Range(min=18, max=99))),
+            })))
+        ''')
+        outputs = [
+            subprocess.check_output([sys.executable, '-c', script],
+                                    cwd=ROOT_DIR,
+                                    env=dict(os.environ,
+                                             PYTHONHASHSEED=str(seed)))
+            for seed in [1, 2]
+        ]
+
+        assert outputs[0] == outputs[1]
+        assert outputs[0].decode('ascii').strip() == fingerprint(make_user())
+
+    def test_recursive_schema(self):
+        def make_tree():
+            types = TypeRegistry()
+            types.add('Tree', lt.Object({
+                'value': lt.Integer(),
+                'children': lt.List(types['Tree']),
+            }))
+            return types['Tree']
+
+        assert fingerprint(make_tree()) == fingerprint(make_tree())
+
+
+class TestSchemaDatabase:
+    def test_shares_examples_between_tests_of_the_same_schema(self):
+        database = InMemoryExampleDatabase()
+        db1 = schema_database(make_user(), database=database)
+        db2 = schema_database(make_user(), database=database)
+
+        db1.save(b'test1', b'example')
+
+        assert list(db2.fetch(b'test2')) == [b'example']
+
+    def test_does_not_share_examples_between_different_schemas(self):
+        database = InMemoryExampleDatabase()
+        db1 = schema_database(make_user(1), database=database)
+        db2 = schema_database(make_user(2), database=database)
+
+        db1.save(b'test1', b'example')
+
+        assert list(db2.fetch(b'test2')) == []
+
+    def test_keeps_kinds_of_examples_apart(self):
+        db = SchemaExampleDatabase(InMemoryExampleDatabase(), 'abc')
+
+        db.save(b'test1.secondary', b'example')
+
+        assert list(db.fetch(b'test2')) == []
+        assert list(db.fetch(b'test2.secondary')) == [b'example']
+
+    def test_fetches_test_examples_first_without_duplicates(self):
+        db = SchemaExampleDatabase(InMemoryExampleDatabase(), 'abc')
+        db.save(b'test1', b'shared')
+        db.save(b'test2', b'own')
+        db.save(b'test2', b'shared')
+
+        assert sorted(db.fetch(b'test2')) == [b'own', b'shared']
+        assert list(db.fetch(b'test1')) == [b'shared', b'own']
+
+    def test_delete_removes_test_and_shared_examples(self):
+        database = InMemoryExampleDatabase()
+        db = SchemaExampleDatabase(database, 'abc')
+        db.save(b'test1', b'example')
+
+        db.delete(b'test1', b'example')
+
+        assert list(database.fetch(b'test1')) == []
+        assert list(database.fetch(db.shared_key(b'test1'))) == []
+        assert list(db.fetch(b'test2')) == []
+
+    def test_delete_removes_shared_examples_of_the_same_kind(self):
+        db = SchemaExampleDatabase(InMemoryExampleDatabase(), 'abc')
+        db.save(b'test1', b'example')
+        db.save(b'test1.secondary', b'example')
+
+        db.delete(b'test1.secondary', b'example')
+
+        assert list(db.fetch(b'test2')) == [b'example']
+        assert list(db.fetch(b'test2.secondary')) == []
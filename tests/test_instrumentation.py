@@ -0,0 +1,97 @@
+import lollipop.types as lt
+import lollipop.validators as lv
+from hypothesis import given, settings
+from lollipop_hypothesis import new_registry
+import json
+
+
+ADDRESS = lt.Object({
+    'street': lt.String(),
+    'zip': lt.String(validate=lv.Predicate(lambda x: len(x) % 2 == 0)),
+})
+
+USER = lt.Object({
+    'name': lt.String(),
+    'address': ADDRESS,
+    'tags': lt.List(lt.Integer()),
+}, name='USER')
+
+
+def draw_examples(strategy, count=50):
+    examples = []
+
+    @settings(max_examples=count, database=None)
+    @given(strategy)
+    def collect(value):
+        examples.append(value)
+
+    collect()
+    return examples
+
+
+class TestInstrumentation:
+    def test_report_is_empty_by_default(self):
+        registry = new_registry()
+        draw_examples(registry.convert(USER))
+
+        assert registry.instrumentation_report() == {}
+
+    def test_report_contains_tree_node_paths(self):
+        registry = new_registry()
+        registry.enable_instrumentation()
+        draw_examples(registry.convert(USER))
+
+        report = registry.instrumentation_report()
+        assert sorted(report.keys()) == sorted([
+            'USER', 'USER.name', 'USER.address', 'USER.address.street',
+            'USER.address.zip', 'USER.tags', 'USER.tags[]',
+        ])
+        assert report['USER.address.zip']['type'] == 'String'
+
+    def test_report_counts_draws_and_time(self):
+        registry = new_registry()
+        registry.enable_instrumentation()
+        examples = draw_examples(registry.convert(USER))
+
+        report = registry.instrumentation_report()
+        assert report['USER']['draws'] >= len(examples)
+        assert report['USER.address.zip']['draws'] >= len(examples)
+        assert report['USER']['time'] > 0
+
+    def test_report_counts_rejections_per_validator(self):
+        registry = new_registry()
+        registry.enable_instrumentation()
+        draw_examples(registry.convert(USER))
+
+        report = registry.instrumentation_report()
+        rejections = report['USER.address.zip']['rejections']
+        assert list(rejections.keys()) == \
+            [repr(ADDRESS.fields['zip'].field_type.validators[0])]
+        assert report['USER.name']['rejections'] == {}
+
+    def test_report_counts_checks_per_validator(self):
+        registry = new_registry()
+        registry.enable_instrumentation()
+        draw_examples(registry.convert(USER))
+
+        report = registry.instrumentation_report()
+        validator = repr(ADDRESS.fields['zip'].field_type.validators[0])
+        node = report['USER.address.zip']
+        assert node['checks'][validator] >= node['rejections'][validator]
+        assert node['checks'][validator] >= node['draws']
+
+    def test_report_is_json_serializable(self):
+        registry = new_registry()
+        registry.enable_instrumentation()
+        draw_examples(registry.convert(USER))
+
+        report = registry.instrumentation_report()
+        assert json.loads(json.dumps(report)) == report
+
+    def test_disabling_instrumentation(self):
+        registry = new_registry()
+        registry.enable_instrumentation()
+        registry.disable_instrumentation()
+        draw_examples(registry.convert(USER))
+
+        assert registry.instrumentation_report() == {}
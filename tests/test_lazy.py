@@ -0,0 +1,77 @@
+from lollipop_hypothesis.lazy import LazyModule, LazyObject, lazy_function
+from lollipop_hypothesis.strategy import Registry
+import copy
+import os
+import subprocess
+import sys
+import textwrap
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(script):
+    return subprocess.check_output(
+        [sys.executable, '-c', textwrap.dedent(script)], cwd=ROOT_DIR,
+    ).decode('utf-8').strip()
+
+
+class TestImport:
+    def test_does_not_import_hypothesis(self):
+        assert run_python('''
+            import sys
+            import lollipop_hypothesis
+            print(sorted(name for name in sys.modules
+                         if name.split('.')[0] in ('hypothesis', 'asyncio')))
+        ''') == '[]'
+
+    def test_does_not_create_default_registries(self):
+        assert run_python('''
+            from lollipop_hypothesis.strategy import DEFAULT_REGISTRY
+            from lollipop_hypothesis.sampler import DEFAULT_SAMPLER_REGISTRY
+            print(object.__getattribute__(DEFAULT_REGISTRY, '_wrapped'),
+                  object.__getattribute__(DEFAULT_SAMPLER_REGISTRY, '_wrapped'))
+        ''') == 'None None'
+
+
+class TestLazyModule:
+    def test_imports_module_on_attribute_access(self):
+        module = LazyModule('json')
+        assert module.dumps([1]) == '[1]'
+
+
+class TestLazyObject:
+    def test_creates_object_once_on_first_use(self):
+        created = []
+
+        def factory():
+            created.append(1)
+            return Registry()
+
+        registry = LazyObject(factory)
+        assert created == []
+
+        registry.set_budget(None)
+        registry.set_budget(None)
+
+        assert created == [1]
+
+    def test_looks_like_wrapped_object(self):
+        registry = LazyObject(Registry)
+
+        assert isinstance(registry, Registry)
+        assert isinstance(copy.copy(registry), Registry)
+
+    def test_sets_attributes_of_wrapped_object(self):
+        registry = LazyObject(Registry)
+        registry.max_recursion_depth = 5
+
+        assert object.__getattribute__(registry, '_wrapped')\
+            .max_recursion_depth == 5
+
+
+class TestLazyFunction:
+    def test_calls_function(self):
+        dumps = lazy_function('json', 'dumps')
+        assert dumps([1], indent=None) == '[1]'
+        assert dumps.__name__ == 'dumps'
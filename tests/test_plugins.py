@@ -0,0 +1,157 @@
+import lollipop.types as lt
+import lollipop_hypothesis.plugins as plugins
+from lollipop_hypothesis import new_registry, new_sampler_registry
+from lollipop_hypothesis.plugins import PluginConverter, class_name, \
+    CONVERTERS_GROUP, SAMPLERS_GROUP
+import copy
+import hypothesis.strategies as hs
+import pytest
+import sys
+import textwrap
+
+
+class Email(lt.String):
+    pass
+
+
+class CorporateEmail(Email):
+    pass
+
+
+PLUGIN_MODULE = '''
+import hypothesis.strategies as hs
+
+
+def email_strategy(registry, type, context=None):
+    return hs.just('john@example.com')
+
+
+def email_sampler(registry, type, context=None):
+    return registry.sampled_from(['john@example.com'])
+
+
+class Converters(object):
+    email = staticmethod(email_strategy)
+'''
+
+EMAIL = '%s.%s' % (__name__, 'Email')
+
+
+@pytest.fixture
+def plugin_module(tmpdir, monkeypatch):
+    name = 'lollipop_hypothesis_test_plugin'
+    tmpdir.join(name + '.py').write(textwrap.dedent(PLUGIN_MODULE))
+    monkeypatch.syspath_prepend(str(tmpdir))
+    yield name
+    sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def entry_points(monkeypatch):
+    declared = {}
+    monkeypatch.setattr(plugins, '_entry_points', declared)
+    return declared
+
+
+def example(registry, type):
+    return registry.examples(registry.convert(type), 1)[0]
+
+
+class TestClassName:
+    def test_returns_qualified_name(self):
+        assert class_name(Email) == EMAIL
+
+
+class TestPluginConverter:
+    def test_does_not_import_converter_until_loaded(self, plugin_module):
+        converter = PluginConverter(plugin_module + ':email_strategy')
+        assert plugin_module not in sys.modules
+
+        converter.load()
+        assert plugin_module in sys.modules
+
+    def test_loads_nested_attributes(self, plugin_module):
+        converter = PluginConverter(plugin_module + ':Converters.email')
+        assert converter.load() is sys.modules[plugin_module].email_strategy
+
+    def test_calls_loaded_converter(self, plugin_module):
+        converter = PluginConverter(plugin_module + ':email_strategy')
+        strategy = converter(new_registry(), Email())
+        assert strategy.example() == 'john@example.com'
+
+    def test_repr_contains_reference(self):
+        assert 'foo:bar' in repr(PluginConverter('foo:bar'))
+
+
+class TestRegisterPlugin:
+    def test_converts_type_with_plugin_converter(self, plugin_module):
+        registry = new_registry()
+        registry.register_plugin(EMAIL, plugin_module + ':email_strategy')
+        assert example(registry, Email()) == 'john@example.com'
+
+    def test_does_not_import_plugin_until_type_is_converted(self,
+                                                             plugin_module):
+        registry = new_registry()
+        registry.register_plugin(EMAIL, plugin_module + ':email_strategy')
+        registry.convert(lt.String())
+        assert plugin_module not in sys.modules
+
+        registry.convert(Email())
+        assert plugin_module in sys.modules
+
+    def test_does_not_match_short_class_name(self, plugin_module):
+        registry = new_registry()
+        registry.register_plugin('Email', plugin_module + ':email_strategy')
+        assert example(registry, Email()) != 'john@example.com'
+
+    def test_matches_subclasses(self, plugin_module):
+        registry = new_registry()
+        registry.register_plugin(EMAIL, plugin_module + ':email_strategy')
+        assert example(registry, CorporateEmail()) == 'john@example.com'
+
+    def test_later_registered_converter_wins(self, plugin_module):
+        registry = new_registry()
+        registry.register_plugin(EMAIL, plugin_module + ':email_strategy')
+        registry.register(Email, lambda registry, type, context=None:
+                          hs.just('jane@example.com'))
+        assert example(registry, Email()) == 'jane@example.com'
+
+        registry.register_plugin(EMAIL, plugin_module + ':email_strategy')
+        assert example(registry, Email()) == 'john@example.com'
+
+    def test_copy_keeps_plugins(self, plugin_module):
+        registry = new_registry()
+        registry.register_plugin(EMAIL, plugin_module + ':email_strategy')
+        assert example(copy.copy(registry), Email()) == 'john@example.com'
+
+    def test_child_registry_uses_parent_plugins(self, plugin_module):
+        registry = new_registry()
+        registry.register_plugin(EMAIL, plugin_module + ':email_strategy')
+        assert example(registry.child(), Email()) == 'john@example.com'
+
+
+class TestLoadPlugins:
+    def test_new_registry_loads_declared_converters(self, plugin_module,
+                                                    entry_points):
+        entry_points[CONVERTERS_GROUP] = [
+            (EMAIL, plugin_module + ':email_strategy'),
+        ]
+        registry = new_registry()
+        assert plugin_module not in sys.modules
+        assert example(registry, Email()) == 'john@example.com'
+
+    def test_new_sampler_registry_loads_declared_samplers(self, plugin_module,
+                                                          entry_points):
+        entry_points[SAMPLERS_GROUP] = [
+            (EMAIL, plugin_module + ':email_sampler'),
+        ]
+        registry = new_sampler_registry()
+        assert example(registry, Email()) == 'john@example.com'
+
+    def test_ignores_other_groups(self, plugin_module, entry_points):
+        entry_points[SAMPLERS_GROUP] = [
+            (EMAIL, plugin_module + ':email_sampler'),
+        ]
+        registry = new_registry()
+        registry.convert(Email())
+        assert plugin_module not in sys.modules
@@ -0,0 +1,182 @@
+import lollipop.types as lt
+import lollipop.validators as lv
+from lollipop_hypothesis import materialize_pool, pool_strategy, \
+    new_registry, new_sampler_registry
+from lollipop_hypothesis.pool import ExamplePool, write_pool, open_pool
+from lollipop.utils import OpenStruct
+from six.moves import copyreg
+import os
+import pytest
+import stat
+
+
+INTEGER = lt.Integer(validate=lv.Range(min=0, max=10 ** 9))
+
+USER = lt.Object({
+    'name': lt.String(validate=lv.Length(min=1, max=10)),
+    'tags': lt.List(lt.String()),
+})
+
+
+def examples(strategy, count=50):
+    return new_registry().examples(strategy, count)
+
+
+class TestExamplePool:
+    def test_reads_written_values_by_index(self, tmpdir):
+        path = str(tmpdir.join('values.pool'))
+        values = [1, 'foo', {'bar': [None, 1.5]}, []]
+
+        assert write_pool(path, iter(values)) == 4
+
+        pool = ExamplePool(path)
+        assert len(pool) == 4
+        assert [pool[i] for i in range(4)] == values
+        assert pool[-1] == []
+        with pytest.raises(IndexError):
+            pool[4]
+
+    def test_reads_values_sharing_objects(self, tmpdir):
+        path = str(tmpdir.join('values.pool'))
+        shared = ['foo']
+        write_pool(path, [shared, {'bar': shared}])
+
+        pool = ExamplePool(path)
+        assert pool[1] == {'bar': ['foo']}
+        assert pool[0] == ['foo']
+
+    def test_reads_open_structs(self, tmpdir):
+        path = str(tmpdir.join('values.pool'))
+        write_pool(path, [OpenStruct({'foo': 1})])
+
+        assert ExamplePool(path)[0].foo == 1
+        # Pickling is customized for pools only
+        assert OpenStruct not in copyreg.dispatch_table
+
+    def test_empty_pool(self, tmpdir):
+        path = str(tmpdir.join('values.pool'))
+        write_pool(path, [])
+
+        assert len(ExamplePool(path)) == 0
+
+    def test_rejects_other_files(self, tmpdir):
+        path = tmpdir.join('values.pool')
+        path.write('foo')
+
+        with pytest.raises(ValueError):
+            ExamplePool(str(path))
+
+    def test_does_not_leave_files_on_errors(self, tmpdir):
+        def values():
+            yield 1
+            raise RuntimeError('Boom')
+
+        with pytest.raises(RuntimeError):
+            write_pool(str(tmpdir.join('values.pool')), values())
+
+        assert tmpdir.listdir() == []
+
+    def test_replaces_existing_pool(self, tmpdir):
+        path = str(tmpdir.join('values.pool'))
+        write_pool(path, [1, 2])
+        write_pool(path, [3])
+
+        assert list(ExamplePool(path)) == [3]
+        assert tmpdir.listdir() == [tmpdir.join('values.pool')]
+
+    def test_replaces_existing_pool_without_os_replace(self, tmpdir,
+                                                      monkeypatch):
+        monkeypatch.delattr(os, 'replace', raising=False)
+        path = str(tmpdir.join('values.pool'))
+        write_pool(path, [1, 2])
+        write_pool(path, [3])
+
+        assert list(ExamplePool(path)) == [3]
+
+    @pytest.mark.skipif(os.name == 'nt', reason='POSIX permissions')
+    def test_creates_pool_with_default_permissions(self, tmpdir):
+        path = tmpdir.join('values.pool')
+        umask = os.umask(0o022)
+        try:
+            write_pool(str(path), [1])
+        finally:
+            os.umask(umask)
+
+        assert stat.S_IMODE(path.stat().mode) == 0o644
+
+
+class TestMaterializePool:
+    def test_stores_generated_values(self, tmpdir):
+        path = materialize_pool(USER, 20, str(tmpdir.join('pools')), seed=1)
+
+        pool = ExamplePool(path)
+        assert len(pool) == 20
+        assert all(1 <= len(pool[i].name) <= 10 for i in range(20))
+        assert os.path.basename(path) == \
+            new_sampler_registry().fingerprint(USER) + '.pool'
+
+    def test_keeps_pool_that_is_big_enough(self, tmpdir):
+        path = materialize_pool(INTEGER, 20, str(tmpdir), seed=1)
+        values = list(ExamplePool(path))
+
+        assert materialize_pool(INTEGER, 10, str(tmpdir), seed=2) == path
+        assert list(ExamplePool(path)) == values
+
+    def test_regenerates_pool_that_is_too_small(self, tmpdir):
+        materialize_pool(INTEGER, 10, str(tmpdir), seed=1)
+
+        path = materialize_pool(INTEGER, 20, str(tmpdir), seed=1)
+
+        assert len(ExamplePool(path)) == 20
+        assert len(open_pool(path)) == 20
+
+    def test_closes_pool_that_is_regenerated(self, tmpdir):
+        path = materialize_pool(INTEGER, 10, str(tmpdir), seed=1)
+        pool = open_pool(path)
+
+        materialize_pool(INTEGER, 20, str(tmpdir), seed=1)
+
+        assert pool.closed
+        assert len(open_pool(path)) == 20
+
+    def test_pools_of_different_schemas_are_separate(self, tmpdir):
+        assert materialize_pool(INTEGER, 10, str(tmpdir)) != \
+            materialize_pool(USER, 10, str(tmpdir))
+
+
+class TestPoolStrategy:
+    def test_draws_values_from_pool(self, tmpdir):
+        path = materialize_pool(INTEGER, 5, str(tmpdir), seed=1)
+        values = set(ExamplePool(path))
+
+        strategy = pool_strategy(INTEGER, str(tmpdir), live=0)
+
+        assert set(examples(strategy)) <= values
+
+    def test_mixes_in_live_values(self, tmpdir):
+        path = materialize_pool(INTEGER, 5, str(tmpdir), seed=1)
+        values = set(ExamplePool(path))
+
+        strategy = pool_strategy(INTEGER, str(tmpdir), live=0.5)
+
+        generated = set(examples(strategy, 100))
+        assert generated & values
+        assert generated - values
+
+    def test_draws_live_values_without_pool(self, tmpdir):
+        strategy = pool_strategy(INTEGER, str(tmpdir))
+
+        assert all(0 <= value <= 10 ** 9 for value in examples(strategy))
+
+    def test_draws_copies_of_values(self, tmpdir):
+        materialize_pool(USER, 1, str(tmpdir), seed=1)
+        strategy = pool_strategy(USER, str(tmpdir), live=0)
+
+        for user in examples(strategy, 5):
+            user.tags.append('foo')
+
+        assert 'foo' not in examples(strategy, 1)[0].tags
+
+    def test_rejects_invalid_live_share(self, tmpdir):
+        with pytest.raises(ValueError):
+            pool_strategy(INTEGER, str(tmpdir), live=2)
@@ -0,0 +1,188 @@
+import lollipop.types as lt
+import lollipop.validators as lv
+from lollipop_hypothesis import learn_profile, profiled_registry, Profile, \
+    new_registry, new_sampler_registry
+from lollipop_hypothesis.profiles import Histogram, LENGTH, RANGE
+from lollipop_hypothesis.strategy import Budget
+from collections import Counter
+import json
+import pytest
+
+
+def sample(*values):
+    return [json.dumps(value) for value in values]
+
+
+def examples(registry, type, count=200):
+    return registry.examples(registry.convert(type), count)
+
+
+@pytest.fixture(params=[new_sampler_registry, new_registry],
+                ids=['sampler', 'strategy'])
+def new_base_registry(request):
+    return request.param
+
+
+class TestHistogram:
+    def test_keeps_few_distinct_values_exactly(self):
+        histogram = Histogram.from_counts(LENGTH, {3: 2, 1: 5})
+
+        assert histogram.bins == [(1, 1, 5), (3, 3, 2)]
+
+    def test_splits_many_values_into_bins_of_similar_size(self):
+        histogram = Histogram.from_counts(
+            RANGE, dict((x, 1) for x in range(100)), max_bins=4,
+        )
+
+        assert histogram.bins == [(0, 24, 25), (25, 49, 25), (50, 74, 25),
+                                  (75, 99, 25)]
+
+    def test_constraints_are_limited_by_validators(self):
+        histogram = Histogram(RANGE, [(0, 9, 5), (10, 19, 3), (20, 29, 1)])
+
+        constraints = histogram.constraints(
+            lt.Integer(validate=lv.Range(min=15, max=100))
+        )
+
+        assert [(v.min, v.max, count) for v, count in constraints] == \
+            [(15, 19, 3), (20, 29, 1)]
+
+    def test_does_not_apply_to_other_types(self):
+        histogram = Histogram(LENGTH, [(1, 1, 1)])
+
+        assert histogram.constraints(lt.Integer()) == []
+
+
+class TestLearnProfile:
+    def test_learns_distributions_by_type_path(self):
+        profile = learn_profile(lt.Object({
+            'name': lt.String(),
+            'age': lt.Optional(lt.Integer()),
+            'tags': lt.List(lt.String()),
+        }, name='User'), sample(
+            {'name': 'foo', 'age': 10, 'tags': ['a', 'bc']},
+            {'name': 'foobar', 'age': None, 'tags': []},
+        ))
+
+        assert profile.examples == 2
+        assert profile.histograms['User.name'].bins == [(3, 3, 1), (6, 6, 1)]
+        assert profile.histograms['User.age?'].bins == [(10, 10, 1)]
+        assert profile.histograms['User.tags'].bins == [(0, 0, 1), (2, 2, 1)]
+        assert profile.histograms['User.tags[]'].bins == [(1, 1, 1),
+                                                          (2, 2, 1)]
+        assert profile.branches['User.age'] == {'None': 1, 'value': 1}
+
+    def test_learns_one_of_alternatives(self):
+        profile = learn_profile(
+            lt.OneOf([lt.Integer(), lt.String()]),
+            sample(1, 'a', 'b', 'c'),
+        )
+
+        assert profile.branches['OneOf'] == {'0': 1, '1': 3}
+        assert profile.histograms['OneOf|1'].bins == [(1, 1, 3)]
+
+    def test_learns_hinted_one_of_alternatives(self):
+        profile = learn_profile(lt.OneOf(
+            {'foo': lt.Object({'foo': lt.String()}),
+             'bar': lt.Object({'bar': lt.String()})},
+            load_hint=lambda data: 'foo' if 'foo' in data else 'bar',
+        ), sample({'foo': 'x'}, {'foo': 'x'}, {'bar': 'xy'}))
+
+        assert profile.branches['OneOf'] == {'foo': 2, 'bar': 1}
+        assert profile.histograms['OneOf|bar.bar'].bins == [(2, 2, 1)]
+
+    def test_skips_values_that_fail_to_load(self):
+        profile = learn_profile(
+            lt.String(validate=lv.Length(max=3)), sample('foo', 'foobar', 1),
+        )
+
+        assert profile.examples == 1
+        assert profile.rejected == 2
+        assert profile.histograms['String'].bins == [(3, 3, 1)]
+
+    def test_round_trips_through_dict(self):
+        profile = learn_profile(lt.Optional(lt.Float()), sample(1.5, None))
+
+        restored = Profile.from_dict(json.loads(json.dumps(profile.to_dict())))
+
+        assert restored.to_dict() == profile.to_dict()
+
+
+class TestProfiledRegistry:
+    def test_generates_lengths_like_profiled_ones(self, new_base_registry):
+        type1 = lt.String(name='Name')
+        profile = learn_profile(type1, sample(*(['abc'] * 9 + ['a'])))
+
+        values = examples(profiled_registry(profile, new_base_registry()),
+                          type1)
+
+        assert set(len(value) for value in values) == set([1, 3])
+
+    def test_generates_branches_like_profiled_ones(self, new_base_registry):
+        type1 = lt.Object({'x': lt.Optional(lt.Integer())}, name='Foo')
+        profile = learn_profile(type1, sample({'x': None}, {'x': None}))
+
+        values = examples(profiled_registry(profile, new_base_registry()),
+                          type1, 50)
+
+        assert all(value.x is None for value in values)
+
+    def test_honors_validators(self, new_base_registry):
+        profile = learn_profile(lt.Integer(name='Age'),
+                                sample(*range(0, 100)))
+
+        values = examples(
+            profiled_registry(profile, new_base_registry()),
+            lt.Integer(name='Age', validate=[lv.Range(min=50),
+                                             lv.NoneOf([60])]),
+        )
+
+        assert all(50 <= value < 100 and value != 60 for value in values)
+
+    def test_structurally_equal_types_get_their_own_distributions(self):
+        type1 = lt.Object({'foo': lt.String(), 'bar': lt.String()},
+                          name='Foo')
+        profile = learn_profile(type1, sample({'foo': 'a', 'bar': 'abc'}))
+
+        values = examples(profiled_registry(profile, new_sampler_registry()),
+                          type1, 20)
+
+        assert set(len(value.foo) for value in values) == set([1])
+        assert set(len(value.bar) for value in values) == set([3])
+
+    def test_unprofiled_types_are_generated_as_usual(self):
+        profile = learn_profile(lt.String(name='Name'), sample('abc'))
+        registry = profiled_registry(profile, new_sampler_registry())
+
+        values = examples(registry, lt.String(name='Other'))
+
+        assert len(set(len(value) for value in values)) > 1
+
+    def test_bins_not_allowed_by_budget_are_skipped(self):
+        type1 = lt.List(lt.Integer(), name='Items')
+        profile = learn_profile(type1, sample([1], [1] * 50))
+        registry = profiled_registry(profile, new_sampler_registry())
+        registry.set_budget(Budget(max_size=10))
+
+        values = examples(registry, type1, 20)
+
+        assert set(len(value) for value in values) == set([1])
+
+    def test_frequencies_follow_profile(self):
+        type1 = lt.OneOf([lt.Integer(), lt.String()])
+        profile = learn_profile(type1, sample(*([1] * 90 + ['a'] * 10)))
+        registry = profiled_registry(profile, new_sampler_registry())
+
+        counts = Counter(value.__class__ for value in
+                         registry.convert(type1).examples(1000, seed=1))
+
+        assert 850 <= counts[int] <= 950
+
+    def test_fingerprint_depends_on_profile(self):
+        type1 = lt.String(name='Name')
+        registry1 = profiled_registry(learn_profile(type1, sample('a')),
+                                      new_sampler_registry())
+        registry2 = profiled_registry(learn_profile(type1, sample('ab')),
+                                      new_sampler_registry())
+
+        assert registry1.fingerprint(type1) != registry2.fingerprint(type1)
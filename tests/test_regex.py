@@ -0,0 +1,67 @@
+from lollipop_hypothesis.regex import compile_regex, UnsupportedRegex
+import pytest
+import random
+import re
+
+
+def examples(pattern, count=200, **kwargs):
+    generator = compile_regex(pattern, **kwargs)
+    rnd = random.Random(1)
+    return [generator(rnd) for _ in range(count)]
+
+
+@pytest.mark.parametrize('pattern', [
+    r'^abc$',
+    r'^[a-z]{3,5}$',
+    r'^[^@]+@(\w{2,}\.)+\w{2,}$',
+    r'^(foo|barbaz)+\d?$',
+    r'^.*x$',
+    r'^\+?[0-9]{1,3}-[0-9]{3}$',
+])
+class TestRegex:
+    def test_matches_regex(self, pattern):
+        assert all(re.match(pattern, x) for x in examples(pattern))
+
+    def test_matches_regex_within_length_bounds(self, pattern):
+        values = examples(pattern, min_length=3, max_length=12)
+        assert all(re.match(pattern, x) and 3 <= len(x) <= 12 for x in values)
+
+
+class TestLengthBounds:
+    def test_generates_all_achievable_lengths(self):
+        values = examples(r'^(ab|cdef)*x$', min_length=5, max_length=9)
+        assert set(len(x) for x in values) == set([5, 7, 9])
+
+    def test_min_length_extends_unbounded_repeats(self):
+        values = examples(r'^[a-z]+$', min_length=50)
+        assert all(len(x) >= 50 for x in values)
+
+    def test_no_matching_length(self):
+        with pytest.raises(ValueError):
+            compile_regex(r'^(ab)+$', min_length=3, max_length=3)
+
+    def test_pads_regex_without_end_anchor(self):
+        values = examples(r'[A-Z]{2}', min_length=5, max_length=8)
+        assert all(re.match(r'[A-Z]{2}', x) and 5 <= len(x) <= 8
+                   for x in values)
+
+    def test_does_not_pad_regex_with_end_anchor(self):
+        with pytest.raises(ValueError):
+            compile_regex(r'^[A-Z]{2}\Z', min_length=5)
+
+
+class TestCompile:
+    def test_generators_are_cached(self):
+        assert compile_regex(r'^[a-z]+$', max_length=5) is \
+            compile_regex(re.compile(r'^[a-z]+$'), max_length=5)
+
+    def test_unsupported_regex(self):
+        with pytest.raises(UnsupportedRegex):
+            compile_regex(r'^(a)\1$')
+
+    @pytest.mark.parametrize('pattern', [
+        r'a\bb', r'a\Bb', r'foo$bar', r'(^a)', r'a|b$',
+    ])
+    def test_anchors_inside_regex_are_unsupported(self, pattern):
+        with pytest.raises(UnsupportedRegex):
+            compile_regex(pattern)
@@ -0,0 +1,221 @@
+import lollipop.types as lt
+import lollipop.validators as lv
+from lollipop.type_registry import TypeRegistry
+from lollipop_hypothesis import type_sampler, new_sampler_registry
+from lollipop_hypothesis.sampler import just
+from lollipop_hypothesis.strategy import Budget
+from collections import namedtuple
+import datetime
+import re
+import pytest
+import six
+
+
+def examples(type, count=200, registry=None):
+    if registry is None:
+        return list(type_sampler(type).examples(count, seed=1))
+    return list(registry.convert(type).examples(count, seed=1))
+
+
+def leaves(value):
+    if isinstance(value, dict):
+        return len(value) + sum(leaves(x) for x in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(leaves(x) for x in value)
+    return 1
+
+
+class TestSampler:
+    def test_same_seed_generates_same_values(self):
+        sampler = type_sampler(lt.List(lt.String()))
+        assert list(sampler.examples(10, seed=42)) == \
+            list(sampler.examples(10, seed=42))
+
+    def test_different_seeds_generate_different_values(self):
+        sampler = type_sampler(lt.List(lt.String()))
+        assert list(sampler.examples(10, seed=1)) != \
+            list(sampler.examples(10, seed=2))
+
+    def test_string(self):
+        assert all(isinstance(x, six.string_types)
+                   for x in examples(lt.String()))
+
+    def test_string_length_validators(self):
+        assert all(3 <= len(x) <= 5
+                   for x in examples(lt.String(validate=lv.Length(min=3, max=5))))
+
+    EMAIL_REGEX = r'^[^@]+@(\w{2,}\.)+\w{2,}$'
+
+    def test_string_regex(self):
+        assert all(re.match(self.EMAIL_REGEX, x)
+                   for x in examples(lt.String(validate=lv.Regexp(self.EMAIL_REGEX))))
+
+    def test_string_regex_and_length(self):
+        values = examples(lt.String(validate=[lv.Regexp(self.EMAIL_REGEX),
+                                              lv.Length(min=8, max=12)]))
+        assert all(re.match(self.EMAIL_REGEX, x) and 8 <= len(x) <= 12
+                   for x in values)
+
+    def test_string_regex_matches_prefix(self):
+        values = examples(lt.String(validate=[lv.Regexp('[A-Z]{2}'),
+                                              lv.Length(min=5)]))
+        assert all(re.match('[A-Z]{2}', x) and len(x) >= 5 for x in values)
+
+    def test_integer_range_validators(self):
+        assert all(5 <= x <= 10
+                   for x in examples(lt.Integer(validate=lv.Range(min=5, max=10))))
+
+    def test_integer_custom_validators(self):
+        assert all(x % 2 == 0
+                   for x in examples(lt.Integer(validate=lv.Predicate(
+                       lambda x: x % 2 == 0
+                   ))))
+
+    def test_impossible_custom_validators(self):
+        sampler = type_sampler(lt.Integer(validate=lv.Predicate(lambda x: False)))
+        with pytest.raises(ValueError):
+            sampler.example()
+
+    def test_float_range_validators(self):
+        assert all(5 <= x <= 10
+                   for x in examples(lt.Float(validate=lv.Range(min=5, max=10))))
+
+    def test_boolean(self):
+        assert set(examples(lt.Boolean())) == set([True, False])
+
+    def test_datetime_range_validators(self):
+        start = datetime.datetime(2017, 5, 1, 12, 0, 0)
+        end = datetime.datetime(2017, 5, 1, 12, 0, 5)
+        assert all(start <= x <= end
+                   for x in examples(lt.DateTime(validate=lv.Range(start, end))))
+
+    def test_date_range_validators(self):
+        start, end = datetime.date(2017, 5, 1), datetime.date(2017, 5, 3)
+        assert all(start <= x <= end
+                   for x in examples(lt.Date(validate=lv.Range(start, end))))
+
+    def test_time_range_validators(self):
+        start, end = datetime.time(12, 0, 0), datetime.time(12, 0, 5)
+        assert all(start <= x <= end
+                   for x in examples(lt.Time(validate=lv.Range(start, end))))
+
+    def test_time_range_within_one_second(self):
+        start = datetime.time(12, 0, 0, 250000)
+        end = datetime.time(12, 0, 0, 750000)
+        assert all(start <= x <= end
+                   for x in examples(lt.Time(validate=lv.Range(start, end))))
+
+    def test_list_length_and_each_validators(self):
+        values = examples(lt.List(lt.Integer(), validate=[
+            lv.Length(min=1, max=3), lv.Each(lv.Range(min=0, max=5)),
+        ]))
+        assert all(1 <= len(x) <= 3 for x in values)
+        assert all(0 <= item <= 5 for x in values for item in x)
+
+    def test_list_unique_validator(self):
+        values = examples(lt.List(lt.Integer(validate=lv.Range(min=0, max=10)),
+                                  validate=lv.Unique()))
+        assert all(len(set(x)) == len(x) for x in values)
+
+    def test_tuple(self):
+        values = examples(lt.Tuple([lt.String(), lt.Integer()]))
+        assert all(isinstance(x[0], six.string_types) and
+                   isinstance(x[1], six.integer_types)
+                   for x in values)
+
+    def test_dictionary(self):
+        values = examples(lt.Dict({'foo': lt.String(), 'bar': lt.Integer()}))
+        assert all(sorted(x.keys()) == ['bar', 'foo'] for x in values)
+
+    def test_variadic_dictionary_length_validator(self):
+        values = examples(lt.Dict(lt.Integer(), validate=lv.Length(min=2, max=4)))
+        assert all(2 <= len(x) <= 4 for x in values)
+
+    def test_object(self):
+        Test = namedtuple('Test', ['foo', 'bar'])
+        values = examples(lt.Object({'foo': lt.String(), 'bar': lt.Integer()},
+                                    constructor=Test))
+        assert all(isinstance(x, Test) for x in values)
+
+    def test_object_without_constructor(self):
+        values = examples(lt.Object({'foo': lt.String()}))
+        assert all(isinstance(x.foo, six.string_types) for x in values)
+
+    def test_object_records(self):
+        registry = new_sampler_registry()
+        registry.set_object_records('slots')
+        values = examples(lt.Object({'foo': lt.String()}), registry=registry)
+        assert all(isinstance(x.foo, six.string_types) for x in values)
+        assert len(set(x.__class__ for x in values)) == 1
+        assert not hasattr(values[0], '__dict__')
+
+    def test_one_of(self):
+        values = examples(lt.OneOf([lt.String(), lt.Integer()]))
+        assert set(type(x) for x in values) == set([str, int])
+
+    def test_any_of_validator(self):
+        assert set(examples(lt.String(validate=lv.AnyOf(['foo', 'bar'])))) == \
+            set(['foo', 'bar'])
+
+    def test_optional(self):
+        values = examples(lt.Optional(lt.String()))
+        assert None in values
+        assert any(isinstance(x, six.string_types) for x in values)
+
+    def test_optional_with_load_default(self):
+        assert None not in examples(lt.Optional(lt.String(), load_default='foo'))
+
+    def test_transform_applies_post_load(self):
+        values = examples(lt.Transform(lt.Integer(validate=lv.Range(0, 100)),
+                                       post_load=lambda x: x + 100))
+        assert all(100 <= x <= 200 for x in values)
+
+    def test_budget_limits_collection_size(self):
+        registry = new_sampler_registry()
+        registry.set_budget(Budget(max_size=3, max_depth=1))
+
+        values = examples(lt.List(lt.List(lt.Integer())), registry=registry)
+        assert all(len(x) <= 3 for x in values)
+        assert all(x == [] for value in values for x in value)
+
+    def test_budget_limits_total_leaves(self):
+        registry = new_sampler_registry()
+        registry.set_object_records('tuple')
+        registry.set_budget(Budget(max_leaves=50))
+
+        values = examples(lt.Object({
+            'tags': lt.List(lt.String()),
+            'meta': lt.Dict(lt.Integer()),
+            'items': lt.List(lt.Object({
+                'foo': lt.Integer(),
+                'bar': lt.Optional(lt.String()),
+                'points': lt.List(lt.Tuple([lt.Integer(), lt.Integer()])),
+            })),
+        }), registry=registry)
+        assert all(leaves(value) <= 50 for value in values)
+        assert any(leaves(value) > 25 for value in values)
+
+    def test_recursive_types(self):
+        TYPES = TypeRegistry()
+        COMMENT = TYPES.add('Comment', lt.Object({
+            'text': lt.String(),
+            'replies': lt.List(TYPES['Comment']),
+        }))
+
+        def depth(comment):
+            return 1 + max([0] + [depth(reply) for reply in comment.replies])
+
+        registry = new_sampler_registry()
+        registry.set_recursion_limit(3, branching=2)
+
+        values = examples(COMMENT, registry=registry)
+        assert all(depth(x) <= 3 for x in values)
+        assert any(depth(x) == 3 for x in values)
+
+    def test_custom_sampler_converters(self):
+        Email = lt.validated_type(lt.String, 'Email')
+
+        registry = new_sampler_registry()
+        registry.register(Email, lambda _, type, context=None: just('foo@bar.com'))
+
+        assert set(examples(Email(), registry=registry)) == set(['foo@bar.com'])
@@ -0,0 +1,140 @@
+import lollipop.types as lt
+import lollipop.validators as lv
+from lollipop_hypothesis import check_schema, check_module, \
+    new_sampler_registry
+from lollipop_hypothesis.selfcheck import schemas_in_module
+import pytest
+import sys
+import textwrap
+import types
+
+
+SCHEMA_MODULE = textwrap.dedent('''
+    import lollipop.types as lt
+    import lollipop.validators as lv
+
+    USER = lt.Object({
+        'name': lt.String(validate=lv.Length(min=1)),
+        'age': lt.Optional(lt.Integer(validate=lv.Range(min=18, max=99))),
+    })
+
+    UPPER = lt.Transform(lt.String(validate=lv.Regexp('^[a-z]+$')),
+                         post_load=lambda value: value.upper())
+
+    _PRIVATE = lt.String()
+''')
+
+
+@pytest.fixture
+def schema_module(tmpdir, monkeypatch):
+    tmpdir.join('selfcheck_test_schemas.py').write(SCHEMA_MODULE)
+    monkeypatch.syspath_prepend(str(tmpdir))
+    yield 'selfcheck_test_schemas'
+    sys.modules.pop('selfcheck_test_schemas', None)
+
+
+def upper_transform():
+    return lt.Transform(lt.String(validate=lv.Regexp('^[a-z]+$')),
+                        post_load=lambda value: value.upper())
+
+
+class TestSchemasInModule:
+    def test_returns_public_schemas_sorted_by_name(self):
+        module = types.ModuleType('schemas')
+        module.USER = user = lt.Object({})
+        module.EMAIL = email = lt.String()
+        module._PRIVATE = lt.String()
+        module.NOT_A_SCHEMA = 'foo'
+
+        assert schemas_in_module(module) == [('EMAIL', email), ('USER', user)]
+
+
+class TestCheckSchema:
+    def test_valid_examples(self):
+        result = check_schema(lt.Object({
+            'name': lt.String(validate=lv.Length(min=1, max=5)),
+            'tags': lt.List(lt.Integer(validate=lv.Range(min=0))),
+        }, name='User'), count=20)
+
+        assert result['examples'] == 20
+        assert result['failures'] == 0
+        assert result['fields'] == {}
+        assert result['examples_per_second'] > 0
+
+    def test_counts_failures_by_field(self):
+        result = check_schema(lt.Object({
+            'name': lt.String(),
+            'code': upper_transform(),
+        }, name='Item'), registry=new_sampler_registry(), count=20)
+
+        assert result['failures'] == 20
+        assert result['stages'] == {'load': 20}
+        assert result['fields'] == {'Item.code': 20}
+
+    def test_counts_list_item_failures_once_per_example(self):
+        result = check_schema(
+            lt.List(upper_transform(), validate=lv.Length(min=2), name='Codes'),
+            registry=new_sampler_registry(), count=10,
+        )
+
+        assert result['fields'] == {'Codes[]': 10}
+
+    def test_keeps_failed_samples(self, monkeypatch):
+        monkeypatch.setattr('lollipop_hypothesis.selfcheck.MAX_SAMPLES', 2)
+        result = check_schema(upper_transform(),
+                              registry=new_sampler_registry(), count=10)
+
+        assert len(result['samples']) == 2
+        for sample in result['samples']:
+            assert sample['stage'] == 'load'
+            assert sample['data'] == sample['data'].upper()
+            assert sample['errors'] == 'String does not match expected pattern'
+
+    def test_reports_dump_failures(self):
+        class Broken(lt.String):
+            def dump(self, value, context=None, *args, **kwargs):
+                raise RuntimeError('Boom')
+
+        result = check_schema(Broken(), registry=new_sampler_registry(),
+                              count=5)
+
+        assert result['stages'] == {'dump': 5}
+
+    def test_same_seed_produces_same_failures(self):
+        def check(seed):
+            return check_schema(upper_transform(), seed=seed, count=10,
+                                registry=new_sampler_registry())['samples']
+
+        assert check(1) == check(1)
+        assert check(1) != check(2)
+
+
+class TestCheckModule:
+    def test_checks_all_public_schemas(self, schema_module):
+        result = check_module(schema_module, count=10)
+
+        assert not result['ok']
+        assert sorted(result['schemas']) == ['UPPER', 'USER']
+        assert result['examples'] == 20
+        assert result['failures'] == 10
+        assert result['schemas']['USER']['failures'] == 0
+        assert result['schemas']['UPPER']['fields'] == {'UPPER': 10}
+
+    def test_checks_given_schemas(self, schema_module):
+        result = check_module(schema_module, names=['USER'], count=10)
+
+        assert result['ok']
+        assert list(result['schemas']) == ['USER']
+
+    def test_results_do_not_depend_on_number_of_jobs(self, schema_module,
+                                                     monkeypatch):
+        monkeypatch.setattr('lollipop_hypothesis.selfcheck.CHUNK_SIZE', 7)
+        registry = 'lollipop_hypothesis.sampler:DEFAULT_SAMPLER_REGISTRY'
+
+        def check(jobs):
+            result = check_module(schema_module, count=30, seed=1, jobs=jobs,
+                                  registry=registry)
+            return dict((name, (schema['examples'], schema['fields']))
+                        for name, schema in result['schemas'].items())
+
+        assert check(1) == check(2)
@@ -1,8 +1,14 @@
 import lollipop.types as lt
 import lollipop.validators as lv
-from hypothesis import given
+import lollipop.utils as lu
+from lollipop.type_registry import TypeRegistry
+from hypothesis import given, settings
 import hypothesis.strategies as hs
 from lollipop_hypothesis import type_strategy, new_registry
+from lollipop_hypothesis.strategy import Budget, SchemaError
+from lollipop_hypothesis.records import record_class
+import copy
+import threading
 import re
 import six
 import six.moves
@@ -37,6 +43,23 @@ class TestRegistry:
     def test_string_regex(self, value):
         assert re.match(self.EMAIL_REGEX, value)
 
+    @given(type_strategy(lt.String(validate=[lv.Regexp(EMAIL_REGEX),
+                                             lv.Length(min=8, max=12)])))
+    def test_string_regex_and_length(self, value):
+        assert re.match(self.EMAIL_REGEX, value)
+        assert 8 <= len(value) <= 12
+
+    @given(type_strategy(lt.String(validate=[lv.Regexp(r'^(?!z)'),
+                                             lv.Length(max=2)])))
+    def test_string_unsupported_regex_is_filtered(self, value):
+        assert len(value) <= 2
+        assert not value.startswith('z')
+
+    def test_string_regex_length_conflict(self):
+        with pytest.raises(SchemaError):
+            type_strategy(lt.String(validate=[lv.Regexp(r'^(ab)+$'),
+                                              lv.Length(exact=3)]))
+
     @given(type_strategy(lt.Integer()))
     def test_integer(self, value):
         assert isinstance(value, six.integer_types)
@@ -93,6 +116,26 @@ class TestRegistry:
     def test_time(self, value):
         assert isinstance(value, datetime.time)
 
+    @given(type_strategy(lt.DateTime(validate=lv.Range(
+        min=datetime.datetime(2017, 5, 1, 12, 0, 0),
+        max=datetime.datetime(2017, 5, 1, 12, 0, 5),
+    ))))
+    def test_datetime_range_validator(self, value):
+        assert datetime.datetime(2017, 5, 1, 12, 0, 0) <= value <= \
+            datetime.datetime(2017, 5, 1, 12, 0, 5)
+
+    @given(type_strategy(lt.Date(validate=lv.Range(
+        min=datetime.date(2017, 5, 1), max=datetime.date(2017, 5, 3),
+    ))))
+    def test_date_range_validator(self, value):
+        assert datetime.date(2017, 5, 1) <= value <= datetime.date(2017, 5, 3)
+
+    @given(type_strategy(lt.Time(validate=lv.Range(
+        min=datetime.time(12, 0, 0), max=datetime.time(12, 0, 1),
+    ))))
+    def test_time_range_validator(self, value):
+        assert datetime.time(12, 0, 0) <= value <= datetime.time(12, 0, 1)
+
     @given(type_strategy(lt.List(lt.String())))
     def test_list(self, items):
         assert isinstance(items, list)
@@ -125,6 +168,20 @@ class TestRegistry:
     def test_list_unique_key_validator(self, value):
         assert sorted({x[0] for x in value}) == sorted(map(lambda x: x[0], value))
 
+    @given(type_strategy(lt.List(lt.Integer(), validate=lv.Length(exact=0))))
+    def test_list_exact_zero_length_validator(self, value):
+        assert value == []
+
+    @given(type_strategy(lt.List(lt.Integer(),
+                                 validate=lv.Each(lv.Range(min=5, max=10)))))
+    def test_list_each_validator(self, value):
+        assert all(5 <= item <= 10 for item in value)
+
+    @given(type_strategy(lt.List(lt.String(),
+                                 validate=lv.Each([lv.Length(min=2, max=3)]))))
+    def test_list_each_validator_applies_to_item_constraints(self, value):
+        assert all(2 <= len(item) <= 3 for item in value)
+
     @given(type_strategy(lt.Tuple([lt.String(), lt.Integer(), lt.Boolean()])))
     def test_tuple(self, value):
         assert isinstance(value, tuple)
@@ -159,6 +216,20 @@ class TestRegistry:
         assert isinstance(value.foo, six.string_types)
         assert isinstance(value.bar, six.integer_types)
 
+    @given(type_strategy(lt.Object({'foo': lt.String(), 'bar': lt.Integer()})))
+    def test_object_without_constructor(self, value):
+        assert isinstance(value, lu.OpenStruct)
+        assert isinstance(value.foo, six.string_types)
+        assert isinstance(value.bar, six.integer_types)
+
+    @given(type_strategy(lt.Dict(lt.Integer(), validate=lv.Length(min=2, max=4))))
+    def test_variadic_dictionary_length_validator(self, value):
+        assert 2 <= len(value) <= 4
+
+    def test_fixed_dictionary_conflicting_length_validator(self):
+        with pytest.raises(ValueError):
+            type_strategy(lt.Dict({'foo': lt.String()}, validate=lv.Length(min=2)))
+
     @given(type_strategy(lt.Constant(123)))
     def test_constant(self, value):
         assert value == 123
@@ -183,6 +254,33 @@ class TestRegistry:
     def test_multiple_any_of_validators_resulting_in_single_value(self, value):
         assert value == 'bar'
 
+    @given(type_strategy(lt.Integer(validate=[lv.AnyOf([1, 5, 10, 20]),
+                                              lv.Range(min=5, max=15)])))
+    def test_any_of_with_range_validators(self, value):
+        assert value in [5, 10]
+
+    def test_any_of_with_conflicting_range_validators(self):
+        with pytest.raises(ValueError):
+            type_strategy(lt.Integer(validate=[lv.AnyOf([1, 2]), lv.Range(min=5)]))
+
+    @given(type_strategy(lt.Integer(validate=[lv.Range(min=1, max=3),
+                                              lv.NoneOf([2])])))
+    def test_none_of_with_range_validators(self, value):
+        assert value in [1, 3]
+
+    @given(type_strategy(lt.Integer(validate=lv.NoneOf([0, 1]))))
+    def test_none_of_validator(self, value):
+        assert value not in [0, 1]
+
+    @given(type_strategy(lt.Boolean(validate=lv.NoneOf([False]))))
+    def test_boolean_none_of_validator(self, value):
+        assert value is True
+
+    @given(type_strategy(lt.String(validate=[lv.Predicate(lambda x: len(x) > 1),
+                                             lv.Predicate(lambda x: len(x) < 5)])))
+    def test_multiple_predicate_validators(self, value):
+        assert 1 < len(value) < 5
+
     def test_multiple_any_of_validators_resulting_in_no_values(self):
         with pytest.raises(ValueError):
             type_strategy(lt.String(validate=[lv.AnyOf(['foo']), lv.AnyOf(['bar'])]))
@@ -203,6 +301,13 @@ class TestRegistry:
     def test_load_only(self, value):
         assert isinstance(value, six.string_types)
 
+    @given(type_strategy(lt.Object({
+        'foo': lt.String(), 'bar': lt.DumpOnly(lt.Integer()),
+    })))
+    def test_object_dump_only_fields_are_not_loaded(self, value):
+        assert isinstance(value.foo, six.string_types)
+        assert not hasattr(value, 'bar')
+
     @given(type_strategy(
         lt.Transform(lt.Integer(validate=lv.Range(min=0, max=100)),
                      post_load=lambda x: x + 100)
@@ -265,3 +370,565 @@ class TestRegistry:
         strategy = registry.convert(type1)
         for _ in six.moves.range(100):
             assert isinstance(strategy.example(), bool)
+
+    def test_converting_same_type_reuses_strategy(self):
+        type1 = lt.Object({'foo': lt.String(), 'bar': lt.List(lt.Integer())})
+
+        registry = new_registry()
+        strategy = registry.convert(type1)
+
+        assert registry.convert(type1) is strategy
+        assert registry.cache_info().hits == 1
+
+    def test_converting_with_different_context_does_not_reuse_strategy(self):
+        type1 = lt.String()
+
+        registry = new_registry()
+        registry.convert(type1, context='foo')
+        registry.convert(type1, context='bar')
+
+        assert registry.cache_info().hits == 0
+        assert registry.cache_info().misses == 2
+
+    def test_converting_with_unhashable_context(self):
+        type1 = lt.String()
+
+        registry = new_registry()
+        registry.convert(type1, context={'foo': 'bar'})
+        registry.convert(type1, context={'foo': 'bar'})
+
+        assert registry.cache_info().size == 0
+
+    def test_registering_converter_invalidates_cache(self):
+        type1 = lt.String()
+
+        registry = new_registry()
+        registry.convert(type1)
+        registry.register(lt.String, lambda _, type, context=None: hs.integers())
+
+        assert registry.cache_info().size == 0
+        strategy = registry.convert(type1)
+        for _ in six.moves.range(100):
+            assert isinstance(strategy.example(), six.integer_types)
+
+    def test_subclass_converters_take_precedence_over_earlier_base_converters(self):
+        Email = lt.validated_type(lt.String, 'Email')
+
+        registry = new_registry()
+        registry.register(Email, lambda _, type, context=None: hs.integers())
+
+        assert isinstance(registry.convert(Email()).example(), six.integer_types)
+        assert isinstance(registry.convert(lt.String()).example(),
+                          six.string_types)
+
+    def test_later_base_converters_take_precedence_over_subclass_converters(self):
+        Email = lt.validated_type(lt.String, 'Email')
+
+        registry = new_registry()
+        registry.register(Email, lambda _, type, context=None: hs.integers())
+        registry.convert(Email())
+        registry.register(lt.String, lambda _, type, context=None: hs.booleans())
+
+        assert isinstance(registry.convert(Email()).example(), bool)
+
+    def test_copied_registry_preserves_converter_precedence(self):
+        registry = new_registry()
+        registry.register(lt.String, lambda _, type, context=None: hs.integers())
+
+        strategy = copy.copy(registry).convert(lt.String())
+        for _ in six.moves.range(100):
+            assert isinstance(strategy.example(), six.integer_types)
+
+    def test_child_registry_falls_through_to_parent(self):
+        registry = new_registry()
+        registry.register(lt.String, lambda _, type, context=None: hs.just(1))
+        child = registry.child()
+
+        assert child.convert(lt.String()).example() == 1
+        assert isinstance(child.convert(lt.Integer()).example(),
+                          six.integer_types)
+
+    def test_child_registry_converters_do_not_affect_parent(self):
+        registry = new_registry()
+        child = registry.child()
+        child.register(lt.String, lambda _, type, context=None: hs.just(1))
+        child.register(USER, lambda _, type, context=None: hs.just(2))
+
+        assert all(x == 1 for x in child.convert(lt.List(lt.String())).example())
+        assert child.convert(USER).example() == 2
+        assert isinstance(registry.convert(lt.String()).example(),
+                          six.string_types)
+        assert registry.convert(USER).example() != 2
+
+    def test_child_registry_sees_later_parent_changes(self):
+        registry = new_registry()
+        child = registry.child()
+        child.convert(lt.String())
+
+        registry.register(lt.String, lambda _, type, context=None: hs.just(1))
+
+        assert child.convert(lt.String()).example() == 1
+
+    def test_override_is_scoped(self):
+        registry = new_registry()
+        with registry.override(lt.String,
+                               lambda _, type, context=None: hs.just(1)):
+            assert registry.convert(lt.String()).example() == 1
+
+        assert isinstance(registry.convert(lt.String()).example(),
+                          six.string_types)
+
+    def test_nested_overrides(self):
+        registry = new_registry()
+        with registry.override(lt.String,
+                               lambda _, type, context=None: hs.just(1)):
+            with registry.override(lt.Integer,
+                                   lambda _, type, context=None: hs.just(2)):
+                assert registry.convert(lt.Tuple([lt.String(), lt.Integer()]))\
+                    .example() == (1, 2)
+
+    def test_override_is_thread_local(self):
+        registry = new_registry()
+        results = []
+        started, converted = threading.Event(), threading.Event()
+
+        def convert_in_other_thread():
+            started.wait()
+            results.append(registry.convert(lt.String()).example())
+            converted.set()
+
+        thread = threading.Thread(target=convert_in_other_thread)
+        thread.start()
+        with registry.override(lt.String,
+                               lambda _, type, context=None: hs.just(1)):
+            started.set()
+            converted.wait()
+            assert registry.convert(lt.String()).example() == 1
+        thread.join()
+
+        assert isinstance(results[0], six.string_types)
+
+    def test_override_does_not_invalidate_parent_cache(self):
+        registry = new_registry()
+        registry.convert(lt.String())
+        with registry.override(lt.Integer,
+                               lambda _, type, context=None: hs.just(1)):
+            pass
+
+        assert len(registry._cache) == 1
+
+    def test_override_reports_instrumentation_and_coverage(self):
+        registry = new_registry()
+        registry.enable_instrumentation()
+        registry.enable_coverage()
+        with registry.override(lt.Integer,
+                               lambda _, type, context=None: hs.just(1)):
+            registry.examples(registry.convert(
+                lt.Optional(lt.Integer(), name='Value'),
+            ), 10)
+
+        assert registry.instrumentation_report()['Value']['draws'] > 0
+        assert registry.coverage_report()['nodes']['Value']['total'] == 2
+
+    def test_budget_limits_collection_size(self):
+        registry = new_registry()
+        registry.set_budget(Budget(max_size=3))
+
+        @given(registry.convert(lt.List(lt.Dict(lt.Integer()))))
+        def test(value):
+            assert len(value) <= 3
+            assert all(len(x) <= 3 for x in value)
+        test()
+
+    def test_budget_limits_collection_size_per_depth(self):
+        registry = new_registry()
+        registry.set_budget(Budget(max_size=[5, 2]))
+
+        @given(registry.convert(lt.List(lt.List(lt.List(lt.Integer())))))
+        def test(value):
+            assert len(value) <= 5
+            assert all(len(y) <= 2 for x in value for y in [x] + x)
+        test()
+
+    def test_budget_limits_nesting_depth(self):
+        registry = new_registry()
+        registry.set_budget(Budget(max_depth=1))
+
+        @given(registry.convert(lt.List(lt.Object({
+            'children': lt.List(lt.Integer()),
+        }))))
+        def test(value):
+            assert all(x.children == [] for x in value)
+        test()
+
+    def test_budget_limits_total_leaves(self):
+        registry = new_registry()
+        registry.set_budget(Budget(max_leaves=100))
+
+        @given(registry.convert(lt.List(lt.List(lt.Integer()))))
+        def test(value):
+            assert sum(len(x) for x in value) <= 100
+        test()
+
+    def test_budget_reserves_leaves_for_fixed_size_items(self):
+        registry = new_registry()
+        registry.set_object_records('tuple')
+        registry.set_budget(Budget(max_leaves=30))
+
+        @given(registry.convert(lt.Object({
+            'tags': lt.List(lt.String()),
+            'items': lt.List(lt.Object({
+                'foo': lt.Integer(),
+                'bar': lt.Integer(),
+                'points': lt.List(lt.Tuple([lt.Integer(), lt.Integer()])),
+            })),
+        })))
+        def test(value):
+            assert len(value.tags) + sum(
+                2 + 2 * len(item.points) for item in value.items
+            ) <= 30
+        test()
+
+    def test_budget_honors_length_validators(self):
+        registry = new_registry()
+        registry.set_budget(Budget(max_size=5))
+
+        @given(registry.convert(lt.List(lt.Integer(),
+                                        validate=lv.Length(min=2, max=3))))
+        def test(value):
+            assert 2 <= len(value) <= 3
+        test()
+
+    def test_budget_conflicting_with_length_validator(self):
+        registry = new_registry()
+        registry.set_budget(Budget(max_size=5))
+
+        with pytest.raises(ValueError) as exc_info:
+            registry.convert(lt.Object({
+                'items': lt.List(lt.Integer(), validate=lv.Length(min=10)),
+            }, name='Foo'))
+        assert 'Foo.items' in str(exc_info.value)
+
+    def test_budget_does_not_limit_fixed_size_collections(self):
+        registry = new_registry()
+        registry.set_budget(Budget(max_size=1, max_depth=0))
+
+        @given(registry.convert(lt.Object({'foo': lt.Integer(),
+                                           'bar': lt.Integer()})))
+        def test(value):
+            assert isinstance(value.foo, int) and isinstance(value.bar, int)
+        test()
+
+
+    def test_recursive_types(self):
+        TYPES = TypeRegistry()
+        COMMENT = TYPES.add('Comment', lt.Object({
+            'text': lt.String(),
+            'replies': lt.List(TYPES['Comment']),
+        }))
+
+        def depth(comment):
+            return 1 + max([0] + [depth(reply) for reply in comment.replies])
+
+        registry = new_registry()
+        registry.set_recursion_limit(3)
+
+        @given(registry.convert(COMMENT))
+        def test(value):
+            assert depth(value) <= 3
+        test()
+
+    def test_recursive_types_branching(self):
+        TYPES = TypeRegistry()
+        NODE = TYPES.add('Node', lt.Object({
+            'children': lt.List(TYPES['Node']),
+            'tags': lt.List(lt.Integer(), validate=lv.Length(min=3, max=5)),
+        }))
+
+        def nodes(node):
+            return [node] + [x for child in node.children for x in nodes(child)]
+
+        registry = new_registry()
+        registry.set_recursion_limit(4, branching=2)
+
+        @given(registry.convert(NODE))
+        def test(value):
+            assert all(len(node.children) <= 2 for node in nodes(value))
+            assert all(3 <= len(node.tags) <= 5 for node in nodes(value))
+        test()
+
+    def test_mutually_recursive_types(self):
+        TYPES = TypeRegistry()
+        PERSON = TYPES.add('Person', lt.Object({
+            'name': lt.String(),
+            'books': lt.List(TYPES['Book']),
+        }))
+        TYPES.add('Book', lt.Object({
+            'title': lt.String(),
+            'author': lt.Optional(TYPES['Person']),
+        }))
+
+        @given(new_registry().convert(PERSON))
+        def test(value):
+            assert isinstance(value.name, six.string_types)
+        test()
+
+    def test_recursive_type_without_optional_references(self):
+        TYPES = TypeRegistry()
+        NODE = TYPES.add('Node', lt.Object({'next': TYPES['Node']}))
+
+        assert new_registry().convert(NODE).is_empty
+
+    def test_recursive_type_conversion_is_bounded(self):
+        TYPES = TypeRegistry()
+        NODE = TYPES.add('Node', lt.Object({
+            'left': lt.Optional(TYPES['Node']),
+            'right': lt.Optional(TYPES['Node']),
+            'data': lt.List(lt.Integer()),
+        }))
+
+        registry = new_registry()
+        registry.set_recursion_limit(10)
+        registry.convert(NODE)
+
+        # Each level converts node, its two optional fields and references,
+        # everything else is reused
+        assert registry.cache_info().misses <= 5 * 10 + 2
+
+    def test_each_type_is_converted_once(self):
+        ADDRESS = lt.Object({'street': lt.String()})
+        conversions = []
+
+        def object_converter(registry, type, context=None):
+            conversions.append(type)
+            return hs.just(None)
+
+        registry = new_registry()
+        registry.register(ADDRESS, object_converter)
+        registry.convert(lt.Object({
+            'home': ADDRESS, 'work': lt.Optional(ADDRESS),
+            'previous': lt.List(ADDRESS),
+        }))
+
+        assert conversions == [ADDRESS]
+
+    def test_structurally_equal_types_share_strategy(self):
+        def make_type():
+            return lt.Optional(lt.String(validate=lv.Length(max=255)))
+
+        registry = new_registry()
+        strategy = registry.convert(make_type())
+
+        assert registry.convert(make_type()) is strategy
+
+    def test_types_with_different_validators_do_not_share_strategy(self):
+        registry = new_registry()
+        strategy = registry.convert(lt.String(validate=lv.Length(max=255)))
+
+        assert registry.convert(lt.String(validate=lv.Length(max=10))) \
+            is not strategy
+        assert registry.convert(lt.Integer()) is not strategy
+
+    def test_types_with_different_nested_types_do_not_share_strategy(self):
+        registry = new_registry()
+        strategy = registry.convert(lt.List(lt.String()))
+
+        assert registry.convert(lt.List(lt.Integer())) is not strategy
+
+    def test_predicates_share_strategy_only_with_same_function(self):
+        def is_even(value):
+            return value % 2 == 0
+
+        def is_odd(value):
+            return value % 2 == 1
+
+        registry = new_registry()
+        strategy = registry.convert(lt.Integer(validate=lv.Predicate(is_even)))
+
+        assert registry.convert(lt.Integer(validate=lv.Predicate(is_even))) \
+            is strategy
+        assert registry.convert(lt.Integer(validate=lv.Predicate(is_odd))) \
+            is not strategy
+
+    def test_type_with_instance_converter_does_not_share_strategy(self):
+        type1, type2 = lt.String(), lt.String()
+
+        registry = new_registry()
+        registry.register(type2, lambda _, type, context=None: hs.just('foo'))
+
+        assert registry.convert(type1) is not registry.convert(type2)
+        assert registry.convert(type2).example() == 'foo'
+
+    def test_repeated_fields_are_converted_once(self):
+        registry = new_registry()
+        registry.convert(lt.Object(dict(
+            ('field%d' % i, lt.Optional(lt.String(validate=lv.Length(max=10))))
+            for i in six.moves.range(100)
+        )))
+
+        # Object, optional and string
+        assert registry.cache_info().misses == 3
+        assert registry.cache_info().hits == 99
+
+    def test_types_with_unhashable_attributes_are_converted(self):
+        class Custom(lt.String):
+            def __init__(self, *args, **kwargs):
+                super(Custom, self).__init__(*args, **kwargs)
+                self.buffer = bytearray(b'foo')
+
+        registry = new_registry()
+        type1 = Custom()
+        strategy = registry.convert(type1)
+
+        assert registry.convert(type1) is strategy
+
+        # Identical, but can not be compared
+        registry.convert(Custom())
+        assert registry.cache_info().misses == 2
+
+
+USER = lt.Object({
+    'name': lt.String(validate=lv.Length(min=1)),
+    'birthday': lt.Date(validate=lv.Range(datetime.date(1950, 1, 1),
+                                          datetime.date(2000, 1, 1))),
+    'tags': lt.List(lt.String(), validate=lv.Length(max=3)),
+    'password': lt.LoadOnly(lt.String()),
+    'id': lt.DumpOnly(lt.Integer()),
+}, constructor=namedtuple('User', ['name', 'birthday', 'tags', 'password']))
+
+
+class TestObjectRecords:
+    @pytest.mark.parametrize('kind', ['slots', 'tuple'])
+    def test_generates_records_with_field_attributes(self, kind):
+        registry = new_registry()
+        registry.set_object_records(kind)
+
+        @given(registry.convert(USER_RECORD))
+        def test(value):
+            assert not hasattr(value, '__dict__')
+            assert isinstance(value.name, six.string_types)
+            assert isinstance(value.tags, list)
+            assert not hasattr(value, 'id')
+
+        test()
+
+    @pytest.mark.parametrize('kind', ['slots', 'tuple'])
+    def test_record_class_is_created_once_per_type(self, kind):
+        registry = new_registry()
+        registry.set_object_records(kind)
+        values = []
+
+        @given(registry.convert(lt.List(USER_RECORD, validate=lv.Length(min=2))))
+        @settings(max_examples=10)
+        def test(value):
+            values.extend(value)
+
+        test()
+
+        assert len(set(value.__class__ for value in values)) == 1
+        assert values[0].__class__ is registry.object_constructor(USER_RECORD)
+
+    def test_explicit_constructor_takes_precedence(self):
+        registry = new_registry()
+        registry.set_object_records('slots')
+
+        assert registry.object_constructor(USER) is USER.constructor
+
+    def test_falls_back_to_open_struct_for_invalid_field_names(self):
+        registry = new_registry()
+        registry.set_object_records('slots')
+
+        @given(registry.convert(lt.Object({'first-name': lt.String()})))
+        def test(value):
+            assert isinstance(value, lu.OpenStruct)
+
+        test()
+
+    def test_slotted_records_equality_and_repr(self):
+        Record = record_class(lt.Object({'foo': lt.Integer()}))
+
+        assert Record(foo=1) == Record(foo=1)
+        assert Record(foo=1) != Record(foo=2)
+        assert repr(Record(foo=1)) == 'Record(foo=1)'
+
+    def test_unknown_record_kind(self):
+        with pytest.raises(ValueError):
+            new_registry().set_object_records('unknown')
+
+    def test_dumps_records(self):
+        registry = new_registry()
+        registry.set_object_records('slots')
+
+        @given(registry.convert(USER_RECORD))
+        def test(value):
+            data = USER_RECORD.dump(value)
+            assert data['name'] == value.name
+            assert data['tags'] == value.tags
+
+        test()
+
+
+USER_RECORD = lt.Object({
+    'name': lt.String(),
+    'tags': lt.List(lt.String()),
+    'id': lt.DumpOnly(lt.Optional(lt.Integer())),
+}, name='User')
+
+
+class TestDumpedForm:
+    @given(type_strategy(USER, form='dumped'))
+    def test_object_generates_dicts(self, value):
+        assert isinstance(value, dict)
+        assert sorted(value.keys()) == ['birthday', 'id', 'name', 'tags']
+
+    @given(type_strategy(USER, form='dumped'))
+    def test_generated_data_can_be_loaded(self, value):
+        assert USER.validate(dict(value, password='secret')) is None
+
+    @given(type_strategy(lt.DateTime(format='%Y/%m/%d %H:%M'), form='dumped'))
+    def test_datetime_generates_formatted_strings(self, value):
+        assert re.match(r'^\d{1,4}/\d{2}/\d{2} \d{2}:\d{2}$', value)
+
+    @given(type_strategy(lt.Date(validate=lv.AnyOf([datetime.date(2017, 5, 1)])),
+                         form='dumped'))
+    def test_any_of_choices_are_dumped(self, value):
+        assert value == '2017-05-01'
+
+    @given(type_strategy(lt.Float(validate=lv.Range(min=0, max=10)), form='dumped'))
+    def test_float_generates_floats(self, value):
+        assert isinstance(value, float)
+        assert 0 <= value <= 10
+
+    @given(type_strategy(lt.Tuple([lt.Integer(), lt.String()]), form='dumped'))
+    def test_tuple_generates_lists(self, value):
+        assert isinstance(value, list)
+
+    @given(type_strategy(lt.Optional(lt.Date(), dump_default='n/a'), form='dumped'))
+    def test_optional_generates_dump_default(self, value):
+        assert value == 'n/a' or isinstance(value, six.string_types)
+
+    @given(type_strategy(lt.Transform(lt.Integer(validate=lv.Range(min=0, max=5)),
+                                      post_load=lambda x: x * 100,
+                                      pre_dump=lambda x: x // 100),
+                         form='dumped'))
+    def test_transform_does_not_apply_post_load(self, value):
+        assert 0 <= value <= 5
+
+    @given(type_strategy(lt.List(lt.Date(), validate=lv.Predicate(
+        lambda dates: dates == sorted(dates)
+    )), form='dumped'))
+    def test_container_validators_check_loaded_values(self, value):
+        dates = [datetime.datetime.strptime(x, '%Y-%m-%d').date() for x in value]
+        assert dates == sorted(dates)
+
+    @given(type_strategy(lt.DumpOnly(lt.Integer()), form='dumped'))
+    def test_dump_only(self, value):
+        assert isinstance(value, int)
+
+    def test_load_only(self):
+        with pytest.raises(Exception):
+            type_strategy(lt.LoadOnly(lt.Integer()), form='dumped').example()
+
+    def test_unknown_form(self):
+        with pytest.raises(ValueError):
+            type_strategy(lt.String(), form='foo')
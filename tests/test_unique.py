@@ -0,0 +1,214 @@
+import lollipop.types as lt
+import lollipop.validators as lv
+from lollipop_hypothesis import CorpusUnique, Corpus, new_registry, \
+    new_sampler_registry
+from lollipop_hypothesis.unique import BloomFilter, ScalableBloomFilter, \
+    permute
+import os
+import pytest
+import six
+import subprocess
+import sys
+import textwrap
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestBloomFilter:
+    def test_contains_added_items(self):
+        bloom_filter = BloomFilter(100)
+        for i in six.moves.range(100):
+            bloom_filter.add(i)
+
+        assert all(i in bloom_filter for i in six.moves.range(100))
+        # Items taken for already added ones are not counted
+        assert 90 <= len(bloom_filter) <= 100
+
+    def test_add_returns_whether_item_is_new(self):
+        bloom_filter = BloomFilter(100)
+
+        assert bloom_filter.add('foo')
+        assert not bloom_filter.add('foo')
+
+    def test_false_positive_rate(self):
+        bloom_filter = BloomFilter(1000, error_rate=0.01)
+        for i in six.moves.range(1000):
+            bloom_filter.add(i)
+
+        false_positives = sum(1 for i in six.moves.range(1000, 11000)
+                              if i in bloom_filter)
+        assert false_positives < 300
+
+
+class TestScalableBloomFilter:
+    def test_grows_with_number_of_items(self):
+        bloom_filter = ScalableBloomFilter(initial_capacity=100)
+        for i in six.moves.range(1000):
+            bloom_filter.add(i)
+
+        assert [f.capacity for f in bloom_filter.filters] == \
+            [100, 200, 400, 800]
+        assert all(i in bloom_filter for i in six.moves.range(1000))
+
+    def test_does_not_add_items_twice(self):
+        bloom_filter = ScalableBloomFilter(initial_capacity=10)
+        for i in six.moves.range(100):
+            bloom_filter.add(i)
+
+        assert not any(bloom_filter.add(i) for i in six.moves.range(100))
+        assert len(bloom_filter) <= 100
+
+
+class TestPermute:
+    @pytest.mark.parametrize('size', [1, 2, 7, 100, 95 ** 3])
+    def test_maps_indexes_to_different_numbers_in_range(self, size):
+        assert sorted(permute(index, size, 'foo')
+                      for index in six.moves.range(size)) == \
+            list(six.moves.range(size))
+
+    def test_different_keys_shuffle_differently(self):
+        assert [permute(index, 100, 'foo') for index in range(100)] != \
+            [permute(index, 100, 'bar') for index in range(100)]
+
+
+class TestCorpusUnique:
+    def test_generates_unique_values_across_examples(self):
+        sampler = new_sampler_registry().convert(lt.Object({
+            'id': lt.Integer(validate=[lv.Range(min=0, max=3000),
+                                       CorpusUnique()]),
+            'name': lt.String(),
+        }))
+
+        ids = [user.id for user in sampler.examples(2000, seed=1)]
+        assert len(set(ids)) == 2000
+
+    def test_each_run_is_a_separate_corpus(self):
+        sampler = new_sampler_registry().convert(
+            lt.Integer(validate=[lv.Range(min=0, max=10), CorpusUnique()])
+        )
+
+        assert sorted(sampler.examples(11, seed=1)) == list(range(11))
+        assert list(sampler.examples(11, seed=1)) == \
+            list(sampler.examples(11, seed=1))
+
+    def test_fails_when_values_are_exhausted(self):
+        sampler = new_sampler_registry().convert(
+            lt.Integer(validate=[lv.Range(min=0, max=10), CorpusUnique()])
+        )
+
+        with pytest.raises(ValueError):
+            list(sampler.examples(12, seed=1))
+
+    def test_parts_of_corpus_are_unique_together(self):
+        sampler = new_sampler_registry().convert(lt.Object({
+            'id': lt.Integer(validate=[lv.Range(min=0, max=99),
+                                       CorpusUnique()]),
+            'name': lt.String(validate=[lv.Length(exact=2), CorpusUnique()]),
+        }))
+
+        corpus = Corpus(1, 100, local=False)
+        values = [value
+                  for part in range(4)
+                  for value in sampler.examples(25, seed=part, corpus=corpus,
+                                                start=part * 25)]
+        assert sorted(value.id for value in values) == list(range(100))
+        assert len(set(value.name for value in values)) == 100
+
+    def test_parts_of_corpus_share_filters(self):
+        sampler = new_sampler_registry().convert(lt.String(validate=[
+            lv.Regexp('^[a-j]$'), CorpusUnique(),
+        ]))
+
+        corpus = Corpus(1, 10)
+        values = [value
+                  for part in range(5)
+                  for value in sampler.examples(2, seed=part, corpus=corpus,
+                                                start=part * 2)]
+        assert sorted(values) == list('abcdefghij')
+
+    def test_tracked_values_of_corpus_generated_in_several_processes(self):
+        sampler = new_sampler_registry().convert(lt.String(validate=[
+            lv.Regexp('^[a-j]$'), CorpusUnique(),
+        ]))
+
+        with pytest.raises(ValueError):
+            list(sampler.examples(2, seed=1, corpus=Corpus(1, 10,
+                                                           local=False)))
+
+    def test_compares_values_by_key(self):
+        sampler = new_sampler_registry().convert(lt.String(validate=[
+            lv.Length(exact=1), lv.Regexp('^[a-zA-Z]$'),
+            CorpusUnique(key=lambda value: value.lower()),
+        ]))
+
+        values = list(sampler.examples(26, seed=1))
+        assert len(set(value.lower() for value in values)) == 26
+
+    def test_fields_with_different_validators_are_independent(self):
+        sampler = new_sampler_registry().convert(lt.Object({
+            'foo': lt.Integer(validate=[lv.Range(min=0, max=9),
+                                        CorpusUnique()]),
+            'bar': lt.Integer(validate=[lv.Range(min=0, max=9),
+                                        CorpusUnique()]),
+        }))
+
+        values = list(sampler.examples(10, seed=1))
+        assert sorted(value.foo for value in values) == list(range(10))
+        assert sorted(value.bar for value in values) == list(range(10))
+
+    def test_fields_with_the_same_validator_are_unique_together(self):
+        unique = CorpusUnique()
+        sampler = new_sampler_registry().convert(lt.Object({
+            'foo': lt.Integer(validate=[lv.Range(min=0, max=9), unique]),
+            'bar': lt.Integer(validate=[lv.Range(min=0, max=9), unique]),
+        }))
+
+        values = list(sampler.examples(5, seed=1))
+        assert sorted([value.foo for value in values] +
+                      [value.bar for value in values]) == list(range(10))
+
+    def test_list_items(self):
+        sampler = new_sampler_registry().convert(lt.List(
+            lt.Integer(validate=lv.Range(min=0, max=99)),
+            validate=[lv.Length(exact=10), lv.Each([CorpusUnique()])],
+        ))
+
+        items = [item for value in sampler.examples(10, seed=1)
+                 for item in value]
+        assert sorted(items) == list(range(100))
+
+    def test_accepts_any_value_on_load(self):
+        type1 = lt.Integer(validate=CorpusUnique())
+
+        assert type1.load(1) == 1
+        assert type1.load(1) == 1
+
+    def test_strategies_generate_values(self):
+        registry = new_registry()
+        strategy = registry.convert(
+            lt.Integer(validate=[lv.Range(min=0, max=10), CorpusUnique()])
+        )
+
+        assert all(0 <= value <= 10
+                   for value in registry.examples(strategy, 10))
+
+    def test_same_seed_produces_same_values_in_all_processes(self):
+        script = textwrap.dedent('''
+            import lollipop.types as lt
+            import lollipop.validators as lv
+            from lollipop_hypothesis import CorpusUnique, new_sampler_registry
+            sampler = new_sampler_registry().convert(lt.String(validate=[
+                lv.Length(exact=2), CorpusUnique(error_rate=0.5),
+            ]))
+            print(' '.join(sampler.examples(500, seed=1)))
+        ''')
+        outputs = [
+            subprocess.check_output([sys.executable, '-c', script],
+                                    cwd=ROOT_DIR,
+                                    env=dict(os.environ,
+                                             PYTHONHASHSEED=str(seed)))
+            for seed in [1, 2]
+        ]
+
+        assert outputs[0] == outputs[1]